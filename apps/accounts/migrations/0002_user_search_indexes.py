@@ -0,0 +1,31 @@
+# Generated by Django 3.2.7 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+# istartswith compiles to UPPER(column::text) LIKE UPPER(%s), so the search indexes are built on that expression
+# with text_pattern_ops, which serves prefix LIKE whatever the database collation is
+SEARCH_COLUMNS = ("email", "first_name", "last_name")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["first_name", "id"], name="joompa_user_first_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["last_name", "id"], name="joompa_user_last_name_idx"),
+        ),
+    ] + [
+        migrations.RunSQL(
+            sql=f"CREATE INDEX joompa_user_{column}_search_idx ON joompa_user (UPPER({column}::text) text_pattern_ops)",
+            reverse_sql=f"DROP INDEX IF EXISTS joompa_user_{column}_search_idx",
+        )
+        for column in SEARCH_COLUMNS
+    ]
@@ -103,6 +103,11 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:  # noqa: D106, # pylint: disable=missing-class-docstring
         db_table = "joompa_user"
+        # sort keys of the admin users listing, email is covered by its unique index
+        indexes = [
+            models.Index(fields=["first_name", "id"], name="joompa_user_first_name_idx"),
+            models.Index(fields=["last_name", "id"], name="joompa_user_last_name_idx"),
+        ]
 
     def __str__(self):
         """Str representation of user model.
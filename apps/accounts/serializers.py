@@ -1,7 +1,6 @@
 from rest_framework import serializers
 
 from apps.accounts.models import User
-from apps.mobile_api.v1.models import UserProfile
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -10,16 +9,29 @@ class UserSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class UsersSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = UserProfile
-        fields = ["id"]
+class UsersSerializer(serializers.Serializer):
+    """Serializer class for the admin users listing
+
+    Reads the UserProfile.objects.values(*UsersSerializer.VALUES) rows, so listing users never loads
+    UserProfile or User instances.
+    """
+
+    VALUES = (
+        "id",
+        "user_id__email",
+        "user_id__first_name",
+        "user_id__last_name",
+        "user_id__phone_number",
+        "created_at",
+    )
+
+    id = serializers.IntegerField()
+    email = serializers.EmailField(source="user_id__email")
+    first_name = serializers.CharField(source="user_id__first_name")
+    last_name = serializers.CharField(source="user_id__last_name")
+    phone_number = serializers.CharField(source="user_id__phone_number", allow_null=True)
+    created_at = serializers.DateTimeField()
 
     def to_representation(self, instance):
-        response = super().to_representation(instance)
-        response["email"] = instance.user_id.email
-        response["first_name"] = instance.user_id.first_name
-        response["last_name"] = instance.user_id.last_name
-        response["phone_number"] = instance.user_id.phone_number
-        response["created_at"] = instance.created_at
-        return response
+        # a plain rename of the values() row, cheap enough to run for every row of a streamed listing
+        return {field.field_name: instance[field.source] for field in self._readable_fields}
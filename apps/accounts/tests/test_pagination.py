@@ -0,0 +1,65 @@
+import datetime
+
+from rest_framework.test import APITestCase
+
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.mobile_api.v1.models import UserProfile
+from apps.testing import create_user_profile
+
+
+class KeysetPaginationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin@joompa.local", "Admin", "Joompa", "password")
+        created_at = timezone.now().replace(microsecond=0)
+        # pairs of profiles share a created_at, so pages have to break ties on id
+        for index in range(7):
+            user_profile = create_user_profile(f"athlete-{index}@joompa.local")
+            UserProfile.objects.filter(pk=user_profile.pk).update(
+                created_at=created_at - datetime.timedelta(minutes=index // 2)
+            )
+        cls.expected = list(UserProfile.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def get_page(self, url="/api/users/", **query_params):
+        response = self.client.get(url, query_params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_pages_forward_then_back_over_every_row_once(self):
+        pages = [self.get_page(cursor="", page_size=3)]
+        self.assertIsNone(pages[0]["previous"])
+        while pages[-1]["next"]:
+            pages.append(self.get_page(pages[-1]["next"]))
+        forward = [[row["id"] for row in page["data"]] for page in pages]
+        self.assertEqual(forward, [self.expected[:3], self.expected[3:6], self.expected[6:]])
+
+        backward = [forward[-1]]
+        page = pages[-1]
+        while page["previous"]:
+            page = self.get_page(page["previous"])
+            backward.insert(0, [row["id"] for row in page["data"]])
+        self.assertEqual(backward, forward)
+
+    def test_cursor_mode_ignores_the_sort_parameter(self):
+        page = self.get_page(cursor="", page_size=10, sort="email")
+        self.assertEqual([row["id"] for row in page["data"]], self.expected)
+
+    def test_count_modes(self):
+        self.assertEqual(self.get_page(cursor="", count="exact")["count"], len(self.expected))
+        self.assertIsNone(self.get_page(cursor="", count="none")["count"])
+        self.assertIsInstance(self.get_page(cursor="")["count"], int)
+
+    def test_without_cursor_pages_by_number(self):
+        page = self.get_page(page=2, page_size=3)
+        self.assertEqual([row["id"] for row in page["data"]], self.expected[3:6])
+        self.assertEqual(page["count"], len(self.expected))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/users/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["status"])
@@ -0,0 +1,122 @@
+import json
+from functools import partial
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from django.db import DatabaseError
+
+from apps.accounts.models import User
+from apps.accounts.serializers import UsersSerializer
+from apps.mobile_api.v1.models import UserProfile
+from apps.testing import create_user_profile
+from apps.utils import stream_response_json
+
+
+class UsersAPIViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin@joompa.local", "Admin", "Joompa", "password")
+        for email, first_name, last_name in (
+            ("anna@joompa.local", "Anna", "Zimmer"),
+            ("bruno@joompa.local", "Bruno", "Young"),
+            ("carla@example.com", "Carla", "Annan"),
+            ("dmitri@example.com", "Dmitri", "Xu"),
+        ):
+            user_profile = create_user_profile(email)
+            User.objects.filter(pk=user_profile.user_id_id).update(
+                first_name=first_name, last_name=last_name, phone_number="+100"
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def get_rows(self, **query_params):
+        response = self.client.get("/api/users/", {"page_size": 50, **query_params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]["data"]
+
+    def test_rows_are_flat_user_columns(self):
+        user_profile = UserProfile.objects.get(user_id__email="anna@joompa.local")
+        row = next(row for row in self.get_rows() if row["id"] == user_profile.id)
+        self.assertEqual(
+            row,
+            {
+                "id": user_profile.id,
+                "email": "anna@joompa.local",
+                "first_name": "Anna",
+                "last_name": "Zimmer",
+                "phone_number": "+100",
+                "created_at": row["created_at"],
+            },
+        )
+
+    def test_search_matches_email_and_name_prefixes_case_insensitively(self):
+        self.assertEqual(
+            sorted(row["email"] for row in self.get_rows(search="an")),
+            ["anna@joompa.local", "carla@example.com"],
+        )
+        self.assertEqual([row["email"] for row in self.get_rows(search="BRU")], ["bruno@joompa.local"])
+        self.assertEqual(self.get_rows(search="joompa"), [])
+
+    def test_sorts_on_the_given_column(self):
+        self.assertEqual(
+            [row["last_name"] for row in self.get_rows(sort="-last_name")], ["Zimmer", "Young", "Xu", "Annan"]
+        )
+        self.assertEqual(
+            [row["email"] for row in self.get_rows(sort="email")],
+            ["anna@joompa.local", "bruno@joompa.local", "carla@example.com", "dmitri@example.com"],
+        )
+
+    def test_defaults_to_newest_first(self):
+        self.assertEqual(
+            [row["id"] for row in self.get_rows()],
+            list(UserProfile.objects.order_by("-created_at", "-id").values_list("id", flat=True)),
+        )
+
+    def test_unknown_sort_is_rejected(self):
+        response = self.client.get("/api/users/", {"sort": "password"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["status"])
+
+    def test_page_query_count_is_independent_of_page_size(self):
+        for index in range(10):
+            create_user_profile(f"extra-{index}@joompa.local")
+        # count and page
+        with self.assertNumQueries(2):
+            self.get_rows(page_size=2)
+        with self.assertNumQueries(2):
+            self.get_rows(page_size=14)
+
+    def test_stream_returns_every_matching_row_in_the_envelope(self):
+        response = self.client.get("/api/users/", {"stream": "true", "search": "an", "sort": "email"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(body["status"], True)
+        self.assertEqual([row["email"] for row in body["data"]], ["anna@joompa.local", "carla@example.com"])
+        self.assertEqual(body["data"], self.get_rows(search="an", sort="email"))
+
+    def test_stream_matches_the_pages_across_row_batches(self):
+        for index in range(5):
+            create_user_profile(f"stream-{index}@joompa.local")
+        with mock.patch("apps.accounts.views.stream_response_json", partial(stream_response_json, batch_size=2)):
+            response = self.client.get("/api/users/", {"stream": "true"})
+            chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 3)
+        body = json.loads(b"".join(chunks))
+        self.assertEqual(body["data"], self.get_rows())
+        self.assertEqual(len(body["data"]), UserProfile.objects.count())
+
+    def test_stream_errors_before_the_first_rows_get_the_error_envelope(self):
+        with mock.patch.object(UsersSerializer, "to_representation", side_effect=DatabaseError("canceled")):
+            with mock.patch("apps.accounts.views.logger") as logger:
+                response = self.client.get("/api/users/", {"stream": "true"})
+        logger.exception.assert_called_once()
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.json()["status"], False)
+
+    def test_stream_of_no_rows(self):
+        response = self.client.get("/api/users/", {"stream": "true", "search": "nobody"})
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["data"], [])
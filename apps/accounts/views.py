@@ -1,18 +1,23 @@
 """Account views file."""
+import itertools
 import logging
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+
 from apps.accounts.serializers import UsersSerializer
 from apps.mobile_api.v1.models import UserProfile
 from apps.pagination import CustomPagination
-from apps.utils import response_json
+from apps.utils import response_json, stream_response_json
 
 logger = logging.getLogger(__name__)
 
@@ -85,16 +90,58 @@ class UsersAPIView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    # sort query parameter to the UserProfile lookup it orders by, prefix with - for descending
+    SORT_FIELDS = {
+        "email": "user_id__email",
+        "first_name": "user_id__first_name",
+        "last_name": "user_id__last_name",
+        "created_at": "created_at",
+    }
+    STREAM_CHUNK_SIZE = 2000
+
+    def __get_users(self, search, sort):
+        users = UserProfile.objects.values(*UsersSerializer.VALUES)
+        if search:
+            # prefix matches are served by the UPPER(column) text_pattern_ops indexes on joompa_user
+            users = users.filter(
+                Q(user_id__email__istartswith=search)
+                | Q(user_id__first_name__istartswith=search)
+                | Q(user_id__last_name__istartswith=search)
+            )
+        descending = sort.startswith("-")
+        field = self.SORT_FIELDS[sort.lstrip("-")]
+        if descending:
+            return users.order_by(f"-{field}", "-id")
+        return users.order_by(field, "id")
+
     @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("search", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="email or name prefix"),
+            openapi.Parameter(
+                "sort",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="email, first_name, last_name or created_at, prefixed with - for descending",
+            ),
+            openapi.Parameter(
+                "stream", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description="stream every user unpaginated"
+            ),
+        ],
         responses={
             200: "OK",
+            400: "Bad Request",
             500: "Internal Server Error",
         },
     )
     def get(self, request):
         """HTTP GET request.
 
-        A HTTP api endpoint that returns all users with basic information
+        A HTTP api endpoint that returns all users with basic information, filtered by the search prefix and
+        ordered by the sort parameter. With stream=true every matching user is streamed in one response
+        instead of a page. The streamed rows are encoded by apps.utils.stream_response_json, not the configured
+        renderer, ORJSONRenderer writes the same document. The query and the first batch of rows are read before
+        the response starts, so their errors answer 500, while an error in a later batch can only cut the body
+        short once the 200 has been sent. Keyset pages (cursor parameter) are always ordered newest first.
 
         Parameters
         ----------
@@ -105,14 +152,34 @@ class UsersAPIView(APIView):
         rest_framework.response.Response
             returns success message if user returned succesfully, error message otherwise
         """
+        sort = request.query_params.get("sort", "-created_at")
+        if sort.lstrip("-") not in self.SORT_FIELDS:
+            return Response(
+                response_json(status=False, data=None, message=f"sort must be one of {', '.join(self.SORT_FIELDS)}"),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         try:
-            all_users = UserProfile.objects.all()
+            all_users = self.__get_users(request.query_params.get("search", "").strip(), sort)
+            if request.query_params.get("stream", "").lower() == "true":
+                serializer = UsersSerializer()
+                rows = map(serializer.to_representation, all_users.iterator(chunk_size=self.STREAM_CHUNK_SIZE))
+                chunks = stream_response_json(rows)
+                # the query runs when the first batch of rows is encoded, read it before the 200 is sent so its
+                # errors still get the 500 envelope
+                head = next(chunks) + next(chunks, "")
+                return StreamingHttpResponse(itertools.chain([head], chunks), content_type="application/json")
+
             paginator = CustomPagination()
             result_page = paginator.paginate_queryset(all_users, request)
             serializer = UsersSerializer(result_page, many=True)
             response_object = paginator.get_paginated_response(data=serializer.data)
             return Response(response_json(status=True, data=response_object, message=None), status=status.HTTP_200_OK)
 
+        except NotFound as e:
+            logger.exception(f"{str(e)}")
+            return Response(
+                response_json(status=False, data=None, message=e.args[0]), status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as err:
             message = "Error occurred while fetching data"
             logger.exception(message, str(err))
@@ -12,3 +12,6 @@ class BaselineAssessmentConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.baseline_assessment"
+
+    def ready(self):
+        import apps.baseline_assessment.signals  # noqa: F401
@@ -0,0 +1,5 @@
+"""BaselineAssessment signals file."""
+from apps.etag import track_table_versions
+from apps.baseline_assessment.models import BaselineAssessment
+
+track_table_versions(BaselineAssessment)
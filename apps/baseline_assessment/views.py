@@ -8,6 +8,7 @@ from rest_framework.views import APIView
 
 from apps.baseline_assessment.models import BaselineAssessment
 from apps.baseline_assessment.serializers import BaselineAssessmentSerializer
+from apps.etag import ConditionalGetMixin
 from apps.mobile_api.v1.models import UserProfile
 from apps.utils import response_json, user_profile_data_exists
 
@@ -198,7 +199,7 @@ class BaselineAssessmentView(APIView):
             return None
 
 
-class BaselineAssessmentsView(APIView):
+class BaselineAssessmentsView(ConditionalGetMixin, APIView):
     """BaselineAssessmentsView class
 
     This view performs POST and FETCHALL operations for BaselineAssessment
@@ -210,6 +211,7 @@ class BaselineAssessmentsView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (BaselineAssessment,)
 
     @swagger_auto_schema(
         responses={
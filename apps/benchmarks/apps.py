@@ -0,0 +1,14 @@
+"""Benchmarks config file."""
+from django.apps import AppConfig
+
+
+class BenchmarksConfig(AppConfig):
+    """Benchmarks configuration class
+
+    Parameters
+    ----------
+    AppConfig : django.apps
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.benchmarks"
@@ -0,0 +1,87 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+
+from apps.database.pool import pool_stats
+
+# name: (engine, settings overrides)
+MODES = {
+    "connect per request": ("django.db.backends.postgresql", {"CONN_MAX_AGE": 0}),
+    "persistent": ("apps.database", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": False}),
+    "persistent + health check": ("apps.database", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True}),
+    "pool + health check": ("apps.database", {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "POOL": {}}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the cost of opening a PostgreSQL connection per request with persistent connections and the "
+        "apps.database pool, simulating request cycles the way Django's request_started/request_finished handlers "
+        "run them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per thread")
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--queries", type=int, default=3, help="Queries per request")
+        parser.add_argument("--pool-size", type=int, default=2, help="POOL MAX_SIZE, below --threads to show waits")
+
+    def __request(self, wrapper, queries):
+        # request_started and request_finished both call close_if_unusable_or_obsolete
+        wrapper.close_if_unusable_or_obsolete()
+        for _ in range(queries):
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        wrapper.close_if_unusable_or_obsolete()
+
+    def __run(self, alias, engine, settings_dict, options):
+        timings = []
+        lock = threading.Lock()
+
+        def worker():
+            wrapper = load_backend(engine).DatabaseWrapper(settings_dict, alias)
+            local = []
+            for _ in range(options["requests"]):
+                started = time.perf_counter()
+                self.__request(wrapper, options["queries"])
+                local.append((time.perf_counter() - started) * 1000)
+            wrapper.close()
+            with lock:
+                timings.extend(local)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        timings.sort()
+        return {
+            "rps": len(timings) / wall,
+            "p50": statistics.median(timings),
+            "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        }
+
+    def handle(self, *args, **options):
+        base_settings = connections["default"].settings_dict
+        self.stdout.write(
+            f"{options['threads']} threads x {options['requests']} requests, {options['queries']} queries each\n"
+        )
+        self.stdout.write(f"{'':<28}{'req/s':>10}{'p50':>10}{'p95':>10}")
+        for index, (name, (engine, overrides)) in enumerate(MODES.items()):
+            settings_dict = {**base_settings, **overrides, "ENGINE": engine}
+            if "POOL" in overrides:
+                settings_dict["POOL"] = {"MAX_SIZE": options["pool_size"], "IDLE_TIMEOUT": 60, "TIMEOUT": 30}
+            else:
+                settings_dict["POOL"] = None
+            alias = f"benchmark_{index}"
+            result = self.__run(alias, engine, settings_dict, options)
+            self.stdout.write(f"{name:<28}{result['rps']:>10.0f}{result['p50']:>8.2f}ms{result['p95']:>8.2f}ms")
+            if alias in pool_stats():
+                self.stdout.write(f"{'':<28}pool {pool_stats()[alias]}")
@@ -0,0 +1,137 @@
+import datetime
+import gc
+import io
+import statistics
+import time
+import tracemalloc
+from decimal import Decimal
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.mobile_api.v1.models import UserProgramDesign
+from apps.mobile_api.v1.serializers import UserProgramDesignSerializer
+from apps.parsers import ORJSONParser
+from apps.renderers import ORJSONRenderer, orjson
+from apps.utils import response_json
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare render and parse time and peak allocations of DRF's JSONRenderer/JSONParser and the orjson pair on a "
+        "user-programs-designs payload"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--programs", type=int, default=60, help="UserProgramDesign rows in the payload")
+        parser.add_argument("--exercises", type=int, default=6, help="Exercises per program, 3 sets each")
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def __exercise_set(self, index, exercise, workout_date):
+        return {
+            "id": index + 1,
+            "name": f"A{exercise % 6 + 1}",
+            "value": f"A{exercise % 6 + 1}",
+            "set": str(index % 3),
+            "goal": "Strength",
+            "reps": Decimal("10.000"),
+            "weight": Decimal("22.500"),
+            "pd_id": str(800 + exercise),
+            "videos": [{"url": f"https://videos.joompa.local/{exercise}.mp4"}],
+            "checked": True,
+            "session_id": 9,
+            "exercise": f"Exercise {exercise}",
+            "rest_time": Decimal("5.00"),
+            "equipments": [{"id": 1, "name": "Dumbbell"}, {"id": 2, "name": "Bench"}],
+            "total_sets": 18,
+            "workout_id": 800 + exercise,
+            "created_at": workout_date,
+            "updated_at": workout_date,
+            "is_two_sided": exercise % 2 == 0,
+            "warm_up_time": Decimal("5.00"),
+            "workout_time": Decimal("20.00"),
+            "equipment_types": ["kg", "lbs"],
+            "equipment_option": 2,
+            "session_per_week": "3",
+            "total_session_length": Decimal("30.00"),
+            "user_calculated_reps": "8",
+            "user_calculated_weight": "20.0",
+            "system_calculated_reps": 8,
+            "system_calculated_weight": 20.0,
+            "user_rir": None,
+            "body_part": "Legs",
+            "classification": None,
+        }
+
+    def __payload(self, programs, exercises):
+        start = timezone.now().replace(microsecond=0)
+        user_programs = []
+        for index in range(programs):
+            workout_date = start + datetime.timedelta(days=index)
+            user_programs.append(
+                UserProgramDesign(
+                    id=index + 1,
+                    user_id=1,
+                    week=index // 6 + 1,
+                    day=index % 6 + 1,
+                    program_design=[
+                        self.__exercise_set(position, position // 3, workout_date) for position in range(exercises * 3)
+                    ],
+                    created_at=start,
+                    updated_at=start,
+                    workout_date=workout_date,
+                    is_personalized=True,
+                    system_rir=2,
+                    start_date=start,
+                    end_date=start + datetime.timedelta(weeks=10),
+                )
+            )
+        serializer = UserProgramDesignSerializer(user_programs, many=True)
+        return response_json(status=True, data=serializer.data, message="", optional_data={})
+
+    def __measure(self, function, repeat):
+        function()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - started) * 1000)
+        gc.collect()
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings.sort()
+        return {
+            "p50": statistics.median(timings),
+            "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            "peak": peak / 1024,
+        }
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson isn't installed, ORJSONRenderer would fall back to JSONRenderer")
+
+        payload = self.__payload(options["programs"], options["exercises"])
+        stdlib_body = JSONRenderer().render(payload)
+        orjson_body = ORJSONRenderer().render(payload)
+        if stdlib_body != orjson_body:
+            raise CommandError("ORJSONRenderer output differs from JSONRenderer output")
+        self.stdout.write(
+            f"payload: {options['programs']} programs, {len(stdlib_body) / 1024:.0f} KiB, outputs identical"
+        )
+
+        results = {
+            "render JSONRenderer": self.__measure(lambda: JSONRenderer().render(payload), options["repeat"]),
+            "render ORJSONRenderer": self.__measure(lambda: ORJSONRenderer().render(payload), options["repeat"]),
+            "parse JSONParser": self.__measure(lambda: JSONParser().parse(io.BytesIO(stdlib_body)), options["repeat"]),
+            "parse ORJSONParser": self.__measure(
+                lambda: ORJSONParser().parse(io.BytesIO(stdlib_body)), options["repeat"]
+            ),
+        }
+        self.stdout.write(f"\n{'':<24}{'p50':>10}{'p95':>10}{'peak KiB':>10}")
+        for name, result in results.items():
+            self.stdout.write(f"{name:<24}{result['p50']:>8.2f}ms{result['p95']:>8.2f}ms{result['peak']:>10.0f}")
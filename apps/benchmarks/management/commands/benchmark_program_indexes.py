@@ -0,0 +1,166 @@
+import datetime
+import logging
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.benchmarks.seed import (
+    BENCHMARK_EMAIL_DOMAIN,
+    BENCHMARK_PREFIX,
+    GOALS,
+    SESSION_LENGTHS,
+    seed_catalog,
+    seed_users,
+)
+from apps.const import TOTAL_PROGRAM_DESIGN_WEEKS
+from apps.mobile_api.v1.models import UserProfile, UserProgramDesign
+from apps.mobile_api.v1.views import get_missed_sessions
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark users with seed_users inside a rolled back transaction and compare query plans and latency "
+        "of the mobile read queries with and without the UserProgramDesign indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100000)
+        parser.add_argument("--weeks", type=int, default=TOTAL_PROGRAM_DESIGN_WEEKS, help="Program weeks per user")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Users written per savepoint")
+        parser.add_argument("--samples", type=int, default=20, help="User profiles each query is run for")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs of each query per sampled user profile")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--plans", action="store_true", help="Print the full EXPLAIN ANALYZE output")
+
+    def __queries(self, user_profile):
+        current_date = timezone.now()
+        user_programs = UserProgramDesign.objects.filter(
+            user=user_profile.id, is_personalized=user_profile.is_personalized
+        )
+        start_date = user_programs.values_list("start_date", flat=True).first()
+        return {
+            "next_workout": user_programs.filter(workout_date__gt=current_date, is_complete=False).order_by(
+                "workout_date"
+            )[:1],
+            "todays_workouts": user_programs.filter(workout_date__date=current_date, is_complete=False),
+            "week_range": user_programs.filter(
+                workout_date__date__range=[current_date, current_date + datetime.timedelta(days=7)]
+            ),
+            "program": user_programs.filter(start_date=start_date),
+            "program_design": user_programs.filter(
+                program_design__contains=[
+                    {"goal": f"{BENCHMARK_PREFIX} {GOALS[0]}", "total_session_length": SESSION_LENGTHS[0]}
+                ],
+                workout_date__date__range=[current_date, current_date + datetime.timedelta(days=7)],
+            ),
+            "past_incomplete": user_programs.filter(workout_date__date__lt=current_date, is_complete=False).order_by(
+                "workout_date"
+            ),
+            "next_exercise": UserProgramDesign.objects.filter(user=user_profile.id, week=2, day=3),
+        }
+
+    def __plan_summary(self, plan):
+        nodes = []
+        for line in plan.splitlines():
+            line = line.strip().lstrip("->").strip()
+            if line.startswith(("Index", "Seq Scan", "Bitmap")):
+                nodes.append(line.split("  (")[0])
+        return "; ".join(nodes) or plan.splitlines()[0]
+
+    def __plan_buffers(self, plan):
+        for line in plan.splitlines():
+            if "Buffers:" in line:
+                return line.strip()
+        return ""
+
+    def __measure(self, user_profiles, repeat, show_plans):
+        timings = {}
+        plans = {}
+        for user_profile in user_profiles:
+            for name, queryset in self.__queries(user_profile).items():
+                if name not in plans:
+                    plans[name] = queryset.explain(analyze=True, buffers=True)
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    list(queryset.all())
+                    timings.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                get_missed_sessions(user_profile.id)
+                timings.setdefault("missed_sessions", []).append((time.perf_counter() - started) * 1000)
+
+        results = {}
+        for name, values in timings.items():
+            values.sort()
+            results[name] = {
+                "p50": statistics.median(values),
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "plan": self.__plan_summary(plans[name]) if name in plans else "CTE, see get_missed_sessions",
+                "buffers": self.__plan_buffers(plans[name]) if name in plans else "",
+            }
+            if show_plans and name in plans:
+                self.stdout.write(f"\n{name}\n{plans[name]}")
+        return results
+
+    def __analyze(self):
+        # the planner needs statistics of the freshly seeded rows, or both runs are planned for empty tables
+        with connection.cursor() as cursor:
+            for model in (UserProgramDesign, UserProfile):
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    def __drop_indexes(self):
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for index in UserProgramDesign._meta.indexes:
+                schema_editor.remove_index(UserProgramDesign, index)
+        self.__analyze()
+
+    def handle(self, *args, **options):
+        if User.objects.filter(
+            email__startswith=f"user-{options['seed']}-", email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}"
+        ).exists():
+            raise CommandError(f"Benchmark users of seed {options['seed']} already exist, use another --seed")
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            seed_catalog(options["seed"])
+            user_profile_ids = seed_users(options["users"], options["seed"], options["weeks"], options["batch_size"])
+            programs = UserProgramDesign.objects.filter(user__in=user_profile_ids).count()
+            self.stdout.write(
+                f"Seeded {len(user_profile_ids)} users and {programs} UserProgramDesign rows in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+            sample_ids = random.Random(options["seed"]).sample(
+                user_profile_ids, min(options["samples"], len(user_profile_ids))
+            )
+            user_profiles = list(UserProfile.objects.filter(id__in=sample_ids))
+            self.__analyze()
+
+            after = self.__measure(user_profiles, options["repeat"], options["plans"])
+
+            sid = transaction.savepoint()
+            self.__drop_indexes()
+            before = self.__measure(user_profiles, options["repeat"], options["plans"])
+            transaction.savepoint_rollback(sid)
+
+            self.stdout.write(f"\n{'query':<18}{'before p50':>12}{'after p50':>12}{'before p95':>12}{'after p95':>12}")
+            for name in after:
+                self.stdout.write(
+                    f"{name:<18}{before[name]['p50']:>10.2f}ms{after[name]['p50']:>10.2f}ms"
+                    f"{before[name]['p95']:>10.2f}ms{after[name]['p95']:>10.2f}ms"
+                )
+            self.stdout.write("\nplans (before -> after)")
+            for name in after:
+                self.stdout.write(
+                    f"{name}:\n  {before[name]['plan']} {before[name]['buffers']}\n"
+                    f"  {after[name]['plan']} {after[name]['buffers']}"
+                )
+
+            # the benchmark never leaves seeded rows behind
+            transaction.set_rollback(True)
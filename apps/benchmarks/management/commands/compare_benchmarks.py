@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.benchmarks.suite import compare_results, load_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare a run_benchmarks results file with a stored baseline and fail when a scenario's wall time, query "
+        "count or peak memory regressed, or when either run had calls that didn't answer 2xx"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline", help="Baseline results file, a run_benchmarks output kept from a known commit")
+        parser.add_argument("current", help="Results file to check")
+        parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative growth, 0.1 for 10%%")
+        parser.add_argument(
+            "--min-wall-ms", type=float, default=1.0, help="Wall time growth below this is never a regression"
+        )
+
+    def handle(self, *args, **options):
+        baseline = load_results(options["baseline"])
+        current = load_results(options["current"])
+        comparisons = compare_results(baseline, current, options["threshold"], options["min_wall_ms"])
+        if not comparisons:
+            raise CommandError("The results files have no scenario in common")
+
+        self.stdout.write(f"{'scenario':<20}{'metric':<22}{'baseline':>12}{'current':>12}{'change':>10}")
+        for comparison in comparisons:
+            line = (
+                f"{comparison['scenario']:<20}{comparison['metric']:<22}{comparison['baseline']:>12.2f}"
+                f"{comparison['current']:>12.2f}{comparison['change']:>10.1%}"
+            )
+            self.stdout.write(self.style.ERROR(f"{line}  REGRESSION") if comparison["regression"] else line)
+
+        regressions = [comparison for comparison in comparisons if comparison["regression"]]
+        if regressions:
+            raise CommandError(f"{len(regressions)} metrics regressed beyond the baseline")
+        self.stdout.write(self.style.SUCCESS("No regressions"))
@@ -0,0 +1,67 @@
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.benchmarks.suite import SCENARIOS, run_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the workout generation and program read and update paths against the seed_benchmark_data dataset "
+        "and write wall time, query count, peak allocated memory and p50/p95/p99 of each scenario as JSON. Fails "
+        "when a scenario had a call that didn't answer 2xx"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+        parser.add_argument(
+            "--users", type=int, default=20, help="Benchmark user profiles the iterations cycle through"
+        )
+        parser.add_argument("--iterations", type=int, default=50, help="Measured calls per scenario")
+        parser.add_argument("--warmup", type=int, default=3, help="Calls per scenario before measuring")
+        parser.add_argument("--memory-iterations", type=int, default=10, help="Calls per scenario traced for memory")
+        parser.add_argument("--seed", type=int, default=42, help="Picks the benchmark user profiles")
+        parser.add_argument("--output", default="benchmark_results.json", help="Path of the results file")
+        parser.add_argument(
+            "--with-logs",
+            action="store_true",
+            help="Keep the INFO logs of the measured code, muted by default since writing them dominates the timings",
+        )
+
+    def handle(self, *args, **options):
+        if not options["with_logs"]:
+            logging.disable(logging.INFO)
+        try:
+            results = run_suite(
+                options["scenarios"],
+                users=options["users"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                memory_iterations=options["memory_iterations"],
+                seed=options["seed"],
+            )
+        except ValueError as e:
+            raise CommandError(e.args[0])
+        finally:
+            logging.disable(logging.NOTSET)
+
+        with open(options["output"], "w") as file:
+            json.dump(results, file, indent=2)
+
+        self.stdout.write(
+            f"{'scenario':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>10}{'peak KB':>10}  statuses"
+        )
+        for scenario, result in results["scenarios"].items():
+            self.stdout.write(
+                f"{scenario:<20}{result['wall_ms']['p50']:>10.2f}{result['wall_ms']['p95']:>10.2f}"
+                f"{result['wall_ms']['p99']:>10.2f}{result['queries']['mean']:>10.1f}"
+                f"{result['memory_peak_kb'].get('mean', 0):>10.0f}  {result['statuses']}"
+            )
+        self.stdout.write(f"Results written to {options['output']}")
+
+        invalid = [scenario for scenario, result in results["scenarios"].items() if not result["valid"]]
+        if invalid:
+            raise CommandError(
+                f"Scenarios {', '.join(invalid)} had calls that didn't answer 2xx, their timings measure the error path"
+            )
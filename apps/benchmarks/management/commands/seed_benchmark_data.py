@@ -0,0 +1,75 @@
+import time
+
+from rest_framework.test import APIRequestFactory
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.benchmarks.seed import (
+    BENCHMARK_EMAIL_DOMAIN,
+    flush_benchmark_data,
+    seed_catalog,
+    seed_users,
+)
+from apps.benchmarks.suite import read_programs, sample_user_profiles
+from apps.const import TOTAL_PROGRAM_DESIGN_WEEKS
+from apps.mobile_api.v1.models import UserProgramDesign
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a benchmark catalog and --users user profiles with equipment, injuries, standard variables, baseline "
+        "answers and a --weeks UserProgramDesign history each. The same --seed produces the same dataset, about "
+        "35 program rows are created per user"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--weeks", type=int, default=TOTAL_PROGRAM_DESIGN_WEEKS, help="Program weeks per user")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--exercises", type=int, default=216, help="Exercises of the benchmark catalog")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Users written per transaction")
+        parser.add_argument("--flush", action="store_true", help="Delete the benchmark users and catalog first")
+        parser.add_argument(
+            "--check-users", type=int, default=5, help="Seeded users whose program reads are checked afterwards"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["flush"]:
+            deleted = flush_benchmark_data()
+            self.stdout.write(f"Deleted {deleted} benchmark user profiles and the benchmark catalog")
+        elif User.objects.filter(
+            email__startswith=f"user-{options['seed']}-", email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}"
+        ).exists():
+            raise CommandError(
+                f"Benchmark users of seed {options['seed']} already exist, use --flush or another --seed"
+            )
+
+        if seed_catalog(options["seed"], options["exercises"]):
+            self.stdout.write(f"Seeded the benchmark catalog in {time.perf_counter() - started:.1f}s")
+        else:
+            self.stdout.write("Reusing the existing benchmark catalog")
+
+        users_started = time.perf_counter()
+        user_profile_ids = seed_users(options["users"], options["seed"], options["weeks"], options["batch_size"])
+        programs = UserProgramDesign.objects.filter(user__in=user_profile_ids).count()
+        self.stdout.write(
+            f"Seeded {len(user_profile_ids)} users and {programs} UserProgramDesign rows in "
+            f"{time.perf_counter() - users_started:.1f}s, {time.perf_counter() - started:.1f}s in total"
+        )
+        self.__check_program_reads(options["check_users"], options["seed"])
+
+    def __check_program_reads(self, users, seed):
+        # the benchmark scenarios are only meaningful when the dataset serves the program reads successfully
+        if not users:
+            return
+        factory = APIRequestFactory()
+        failures = []
+        for user_profile in sample_user_profiles(users, seed):
+            status_code = read_programs(factory, user_profile)()
+            if not 200 <= status_code < 300:
+                failures.append(f"{user_profile.id}: {status_code}")
+        if failures:
+            raise CommandError(f"Program reads failed on the seeded data, user profile: status {', '.join(failures)}")
+        self.stdout.write(f"Checked the program reads of {users} seeded users")
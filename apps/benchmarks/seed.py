@@ -0,0 +1,836 @@
+"""Benchmarks seed data file."""
+import datetime
+import json
+import logging
+import random
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.baseline_assessment.models import BaselineAssessment
+from apps.body_part.models import BodyPart
+from apps.config.models import Config
+from apps.const import TOTAL_PROGRAM_DESIGN_WEEKS
+from apps.controlled.catalog import bump_catalog_version, get_catalog
+from apps.controlled.models import (
+    ControlProgram,
+    ControlProgramInjury,
+    EquipmentCombination,
+    EquipmentGroup,
+    EquipmentRelation,
+    Exercise,
+    FirstEverCalc,
+    ProgramDesign,
+    SessionLength,
+    Video,
+    WorkoutFlow,
+)
+from apps.equipment.models import Equipment, EquipmentOption
+from apps.etag import bump_table_versions
+from apps.fitness_level.models import FitnessLevel
+from apps.goal.models import Goal
+from apps.injury.models import Injury, InjuryType
+from apps.mobile_api.v1.models import (
+    UserEquipment,
+    UserFeedback,
+    UserInjury,
+    UserProfile,
+    UserProgramDesign,
+    UserStandardVariable,
+)
+from apps.mobile_api.v1.views import get_pd_day_offsets
+from apps.reps_in_reserve.models import RepsInReserve, RepsRange, RepsRating
+from apps.session.models import Session
+from apps.standard_variable.models import StandardVariable
+from apps.variance.models import Variance
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_EMAIL_DOMAIN = "benchmark.joompa.local"
+GOALS = ("Strength", "Hypertrophy", "Endurance")
+SESSION_LENGTHS = ("30.00", "45.00", "60.00")
+
+# catalog rows created by seed_catalog are named with this prefix, except the shared lookup rows the generator
+# finds by name: the EquipmentOption names, Session values and the Weight standard variable
+BENCHMARK_PREFIX = "Benchmark"
+EQUIPMENT_OPTIONS = ("None", "1 weight", "2 weights")
+# control program equipment options a user with the given option can be given, as in UserWorkoutProgramsView
+EQUIPMENT_OPTION_TIERS = {
+    "None": ("None",),
+    "1 weight": ("1 weight", "None"),
+    "2 weights": ("2 weights", "1 weight", "None"),
+}
+FITNESS_LEVELS = (("Beginner", 20), ("Intermediate", 40), ("Advanced", 60))
+BODY_PARTS = {
+    "Chest": ("Upper chest", "Lower chest"),
+    "Back": ("Lats", "Traps"),
+    "Legs": ("Quads", "Hamstrings"),
+    "Shoulders": ("Front delts", "Rear delts"),
+    "Arms": ("Biceps", "Triceps"),
+    "Core": ("Abs", "Obliques"),
+}
+VARIANCES = ("Push", "Pull", "Static")
+INJURIES = (("strain", "Acute"), ("tendinopathy", "Chronic"))
+# Equipment name: weights a user can own, None for equipment without weights
+EQUIPMENTS = {
+    "Dumbbell": (2, 4, 6, 8, 10, 12, 16, 20, 24),
+    "Kettlebell": (4, 8, 12, 16, 20, 24),
+    "Barbell": (20, 30, 40, 50, 60, 80, 100),
+    "Bench": None,
+    "Pull up bar": None,
+    "Resistance band": None,
+}
+# equipment combinations a control program of the given equipment option can require
+EQUIPMENT_COMBINATIONS = {
+    "1 weight": (("Dumbbell",), ("Kettlebell",)),
+    "2 weights": (("Dumbbell",), ("Barbell",), ("Dumbbell", "Bench"), ("Barbell", "Bench")),
+}
+BASELINE_QUESTIONS = ("Benchmark push ups in one minute?", "Benchmark squats in one minute?")
+STANDARD_VARIABLES = (
+    ("Weight", 55, 110),
+    (f"{BENCHMARK_PREFIX} Age", 18, 65),
+    (f"{BENCHMARK_PREFIX} Height", 150, 200),
+)
+WORKOUT_FLOWS = ("A1", "A2", "B1", "B2", "C1", "C2")
+REPS_RANGES = (("L", range(1, 6)), ("M", range(6, 11)), ("H", range(11, 16)))
+# defaults of the Config keys the non personalized generation and program reads look up
+CONFIG_GOAL = GOALS[0]
+CONFIG_SESSION_PER_WEEK = 3
+CONFIG_TOTAL_SESSION_LENGTH = SESSION_LENGTHS[0]
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _get_or_create_by_name(model, field, names, defaults=None):
+    """Return the rows of the given names, creating the missing ones, keyed by name."""
+    rows = {getattr(row, field): row for row in model.objects.filter(**{f"{field}__in": names})}
+    missing = [model(**{field: name}, **(defaults(name) if defaults else {})) for name in names if name not in rows]
+    for row in model.objects.bulk_create(missing):
+        rows[getattr(row, field)] = row
+    return rows
+
+
+def seed_catalog(seed=42, exercises=216):
+    """Public Method
+
+    The method creates a benchmark catalog: Goals with SessionLength, WorkoutFlow and ProgramDesign trees for
+    every equipment option and session length, exercises with ControlPrograms, FirstEverCalc formulas, videos,
+    injuries and equipment combinations, the RepsRange, RepsRating and RepsInReserve rows of each goal, and the
+    missing Config defaults, see seed_config. Everything but the Config rows is written with bulk_create, so no
+    signals are sent and the catalog and table versions are bumped once at the end. The shape of the catalog
+    only depends on seed.
+
+    Parameters
+    ----------
+    seed : integer
+    exercises : integer
+        number of exercises, each gets one control program, cycling through every body part, classification,
+        variance and equipment option
+
+    Returns
+    -------
+    boolean
+        returns False when a benchmark catalog already exists and only the missing Config rows were created
+    """
+    if Goal.objects.filter(name__startswith=f"{BENCHMARK_PREFIX} ").exists():
+        logger.info("Benchmark catalog already exists")
+        seed_config()
+        return False
+
+    rng = random.Random(seed)
+    with transaction.atomic():
+        equipment_options = _get_or_create_by_name(EquipmentOption, "name", EQUIPMENT_OPTIONS)
+        sessions = _get_or_create_by_name(
+            Session, "value", list(range(1, 7)), lambda value: {"description": f"{value} days a week"}
+        )
+        goals = _get_or_create_by_name(Goal, "name", [f"{BENCHMARK_PREFIX} {goal}" for goal in GOALS])
+        # fitness_number is unique, number the benchmark levels after the existing ones
+        last_fitness_number = (
+            FitnessLevel.objects.order_by("-fitness_number").values_list("fitness_number", flat=True).first()
+        )
+        fitness_levels = FitnessLevel.objects.bulk_create(
+            FitnessLevel(
+                fitness_name=f"{BENCHMARK_PREFIX} {name}",
+                fitness_number=(last_fitness_number or 0) + index + 1,
+                fitness_level=Decimal(level),
+            )
+            for index, (name, level) in enumerate(FITNESS_LEVELS)
+        )
+        variances = Variance.objects.bulk_create(Variance(name=f"{BENCHMARK_PREFIX} {name}") for name in VARIANCES)
+
+        body_parts = dict(
+            zip(
+                BODY_PARTS,
+                BodyPart.objects.bulk_create(BodyPart(name=f"{BENCHMARK_PREFIX} {name}") for name in BODY_PARTS),
+            )
+        )
+        classifications = BodyPart.objects.bulk_create(
+            BodyPart(name=f"{BENCHMARK_PREFIX} {child}", classification=body_parts[name])
+            for name, children in BODY_PARTS.items()
+            for child in children
+        )
+        injury_type_names = list(dict.fromkeys(name for _, name in INJURIES))
+        injury_types = dict(
+            zip(
+                injury_type_names,
+                InjuryType.objects.bulk_create(
+                    InjuryType(name=f"{BENCHMARK_PREFIX} {name}") for name in injury_type_names
+                ),
+            )
+        )
+        injuries = Injury.objects.bulk_create(
+            Injury(
+                name=f"{BENCHMARK_PREFIX} {name} {suffix}",
+                injury_type=injury_types[injury_type],
+                body_part=body_parts[name],
+            )
+            for name in BODY_PARTS
+            for suffix, injury_type in INJURIES
+        )
+
+        _get_or_create_by_name(
+            StandardVariable, "name", [name for name, _, _ in STANDARD_VARIABLES], lambda name: {"data_type": "int"}
+        )
+        _get_or_create_by_name(
+            BaselineAssessment,
+            "question",
+            list(BASELINE_QUESTIONS),
+            lambda question: {"control_type": "input", "options": []},
+        )
+
+        equipments = dict(
+            zip(
+                EQUIPMENTS,
+                Equipment.objects.bulk_create(
+                    Equipment(
+                        name=f"{BENCHMARK_PREFIX} {name}",
+                        weight={str(weight): 1 for weight in weights} if weights else None,
+                    )
+                    for name, weights in EQUIPMENTS.items()
+                ),
+            )
+        )
+        combination_names = sorted({names for option in EQUIPMENT_COMBINATIONS.values() for names in option})
+        combinations = dict(
+            zip(
+                combination_names,
+                EquipmentCombination.objects.bulk_create(
+                    EquipmentCombination(name=" + ".join(f"{BENCHMARK_PREFIX} {name}" for name in names))
+                    for names in combination_names
+                ),
+            )
+        )
+        EquipmentGroup.objects.bulk_create(
+            EquipmentGroup(equipment_combination=combination, equipment=equipments[name])
+            for names, combination in combinations.items()
+            for name in names
+        )
+
+        # SessionLength, WorkoutFlow and ProgramDesign trees
+        session_lengths = SessionLength.objects.bulk_create(
+            SessionLength(
+                goal=goal,
+                equipment_option=equipment_options[option],
+                total_session_length=Decimal(length),
+                total_sets=3 if length != "60.00" else 4,
+                workout_time=Decimal("0.75"),
+                rest_time=Decimal(rng.choice(("0.75", "1.00", "1.50"))),
+                warm_up_time=Decimal("5.00"),
+            )
+            for goal in goals.values()
+            for option in EQUIPMENT_OPTIONS
+            for length in SESSION_LENGTHS
+        )
+        workout_flows = []
+        for session_length in session_lengths:
+            count = {"30.00": 4, "45.00": 5, "60.00": 6}[str(session_length.total_session_length)]
+            workout_flows.append(WorkoutFlow(name="Warm up", value="", session_length=session_length))
+            workout_flows.extend(
+                WorkoutFlow(name=value, value=value, session_length=session_length) for value in WORKOUT_FLOWS[:count]
+            )
+            workout_flows.append(WorkoutFlow(name="Cool", value="", session_length=session_length))
+        workout_flows = WorkoutFlow.objects.bulk_create(workout_flows)
+        program_designs = []
+        for workout_flow in workout_flows:
+            if not workout_flow.value:
+                continue
+            for session in sessions.values():
+                for day in range(1, session.value + 1):
+                    classification = rng.choice(classifications)
+                    program_designs.append(
+                        ProgramDesign(
+                            session_per_week=session,
+                            sequence_flow=workout_flow,
+                            day=day,
+                            body_part_id=classification.classification_id,
+                            body_part_classification=classification,
+                            variance=rng.choice(variances),
+                        )
+                    )
+        ProgramDesign.objects.bulk_create(program_designs, batch_size=1000)
+
+        # exercises, one control program each
+        combos = [(variance, classification) for variance in variances for classification in classifications]
+        exercise_rows = Exercise.objects.bulk_create(
+            Exercise(name=f"{BENCHMARK_PREFIX} exercise {index + 1:04d}") for index in range(exercises)
+        )
+        control_programs = []
+        for index, exercise in enumerate(exercise_rows):
+            variance, classification = combos[index % len(combos)]
+            option = EQUIPMENT_OPTIONS[(index // len(combos)) % len(EQUIPMENT_OPTIONS)]
+            control_programs.append(
+                ControlProgram(
+                    equipment_option=equipment_options[option],
+                    body_part_id=classification.classification_id,
+                    body_part_classification=classification,
+                    variance=variance,
+                    exercise=exercise,
+                    is_two_sided=rng.random() < 0.3,
+                    reps=Decimal(rng.randint(8, 15)),
+                    weight=Decimal(rng.choice(("2.5", "5", "7.5", "10", "15", "20"))),
+                )
+            )
+        control_programs = ControlProgram.objects.bulk_create(control_programs)
+        option_names = {equipment_option.id: name for name, equipment_option in equipment_options.items()}
+
+        first_ever_calcs = []
+        videos = []
+        equipment_relations = []
+        control_program_injuries = []
+        for control_program in control_programs:
+            option = option_names[control_program.equipment_option_id]
+            reps_formula = rng.choice(("{Weight}//10+2", str(rng.randint(8, 12))))
+            first_ever_calcs.append(
+                FirstEverCalc(
+                    control_program=control_program,
+                    type="FSC",
+                    weight_formula_string=f"{{Weight}}*{rng.choice(('0.1', '0.15', '0.2'))}*{{fitness_level}}/40",
+                    weight_formula_structure={},
+                    reps_formula_string=reps_formula,
+                    reps_formula_structure={},
+                )
+            )
+            # bodyweight exercises of personalized programs only get reps from the Baseline formula
+            if option == "None" or rng.random() < 0.7:
+                question = rng.choice(BASELINE_QUESTIONS)
+                first_ever_calcs.append(
+                    FirstEverCalc(
+                        control_program=control_program,
+                        type="Baseline",
+                        weight_formula_string=f"{{{question}}}*0.3+{{Weight}}*0.1",
+                        weight_formula_structure={},
+                        reps_formula_string=f"{{{question}}}//4+6",
+                        reps_formula_structure={},
+                    )
+                )
+            videos.extend(
+                Video(
+                    control_program=control_program,
+                    url=f"https://videos.{BENCHMARK_EMAIL_DOMAIN}/{control_program.exercise_id}/{number}.mp4",
+                )
+                for number in range(1, rng.randint(1, 2) + 1)
+            )
+            if option != "None":
+                available = EQUIPMENT_COMBINATIONS[option]
+                equipment_relations.extend(
+                    EquipmentRelation(exercise_program=control_program, equipment_combination=combinations[names])
+                    for names in rng.sample(available, rng.randint(1, 2))
+                )
+            if rng.random() < 0.1:
+                injury = rng.choice(
+                    [injury for injury in injuries if injury.body_part_id == control_program.body_part_id]
+                )
+                control_program_injuries.append(
+                    ControlProgramInjury(
+                        control_program=control_program, injury=injury, injury_type_id=injury.injury_type_id
+                    )
+                )
+        FirstEverCalc.objects.bulk_create(first_ever_calcs, batch_size=1000)
+        Video.objects.bulk_create(videos, batch_size=1000)
+        EquipmentRelation.objects.bulk_create(equipment_relations, batch_size=1000)
+        ControlProgramInjury.objects.bulk_create(control_program_injuries)
+
+        # reps ranges, ratings and reps in reserve of every goal
+        reps_ranges = RepsRange.objects.bulk_create(
+            RepsRange(goal=goal, value=value, range_name=range_name)
+            for goal in goals.values()
+            for range_name, values in REPS_RANGES
+            for value in values
+        )
+        RepsRating.objects.bulk_create(
+            (
+                RepsRating(reps_range=reps_range, rating=rating, weight=rating, reps=rating)
+                for reps_range in reps_ranges
+                for rating in range(-3, 4)
+            ),
+            batch_size=1000,
+        )
+        RepsInReserve.objects.bulk_create(
+            RepsInReserve(
+                goal=goal,
+                fitness_level=fitness_level,
+                weeks=[
+                    {"week": week, "rir": max(0, 3 - index - (week - 1) // 4)}
+                    for week in range(1, TOTAL_PROGRAM_DESIGN_WEEKS + 1)
+                ],
+            )
+            for goal in goals.values()
+            for index, fitness_level in enumerate(fitness_levels)
+        )
+        seed_config()
+
+        transaction.on_commit(bump_catalog_version)
+        bump_table_versions(
+            Goal,
+            SessionLength,
+            RepsRange,
+            Equipment,
+            Injury,
+            InjuryType,
+            BodyPart,
+            StandardVariable,
+            BaselineAssessment,
+        )
+    logger.info(f"Seeded benchmark catalog with {len(control_programs)} control programs")
+    return True
+
+
+def seed_config():
+    """Public Method
+
+    The method creates the goal, session_per_week and total_session_length Config rows the program views read
+    for non personalized users, pointing at the benchmark catalog. Keys that already have a row are kept, so an
+    existing configuration isn't overridden.
+
+    Returns
+    -------
+    list
+        returns the keys of the created Config rows
+    """
+    defaults = {
+        "goal": lambda: Goal.objects.get(name=f"{BENCHMARK_PREFIX} {CONFIG_GOAL}").id,
+        "session_per_week": lambda: Session.objects.get(value=CONFIG_SESSION_PER_WEEK).id,
+        "total_session_length": lambda: CONFIG_TOTAL_SESSION_LENGTH,
+    }
+    existing = set(Config.objects.filter(key__in=defaults).values_list("key", flat=True))
+    created = [key for key in defaults if key not in existing]
+    for key in created:
+        # saved one by one so the config signals invalidate the registry
+        Config.objects.create(key=key, value=str(defaults[key]()))
+    if created:
+        logger.info(f"Seeded the benchmark Config keys {', '.join(created)}")
+    return created
+
+
+def _exercise_sets(record, total_sets):
+    """Return the warm-up set and the working sets of one exercise, as UserWorkoutProgramsView repeats them."""
+    warm_up = dict(record, set="0")
+    if warm_up["system_calculated_weight"]:
+        warm_up["system_calculated_weight"] = round(warm_up["system_calculated_weight"] * 0.7 / 2) * 2
+    else:
+        warm_up["system_calculated_reps"] = round(warm_up["system_calculated_reps"] * 0.7)
+    return [warm_up] + [dict(record, set=str(number)) for number in range(1, total_sets + 1)]
+
+
+def _program_template(catalog, goal_id, equipment_option, total_session_length, session_id):
+    """Return the program design of each workout day for one combination of the generator's inputs.
+
+    The catalog is walked the way UserWorkoutProgramsView does, taking the first control program of every
+    program design, without the per user formula, equipment and injury checks.
+    """
+    equipment_option_ids = [catalog.equipment_options[name] for name in EQUIPMENT_OPTION_TIERS[equipment_option]]
+    session_value = catalog.sessions[session_id]
+    days = {day: [] for day in range(1, session_value + 1)}
+    exercises = set()
+    for session_length in catalog.session_lengths(
+        catalog.equipment_options[equipment_option], goal_id, total_session_length
+    ):
+        for workout in catalog.workout_flows(session_length["id"]):
+            for program_design in catalog.program_designs(workout["id"], session_id):
+                for control_program in catalog.control_programs(
+                    program_design["variance_id"],
+                    program_design["body_part_id"],
+                    program_design["body_part_classification_id"],
+                    equipment_option_ids,
+                ):
+                    if control_program["exercise__name"] in exercises:
+                        continue
+                    exercises.add(control_program["exercise__name"])
+                    combinations = catalog.equipment_combinations(control_program["id"])
+                    equipments = catalog.combination_equipments(combinations[0]) if combinations else ()
+                    weighted = control_program["equipment_option_id"] != catalog.equipment_options["None"]
+                    reps = int(control_program["reps"])
+                    weight = float(control_program["weight"]) * 2 if weighted else 0
+                    record = {
+                        "pd_id": str(program_design["id"]),
+                        "workout_id": workout["id"],
+                        "session_id": session_length["id"],
+                        "checked": True,
+                        "goal": catalog.goals[goal_id],
+                        "total_sets": session_length["total_sets"],
+                        "workout_time": str(session_length["workout_time"]),
+                        "rest_time": str(session_length["rest_time"]),
+                        "warm_up_time": str(session_length["warm_up_time"]),
+                        "name": str(workout["name"]),
+                        "value": str(workout["value"]),
+                        "equipment_types": ["kg"],
+                        "session_per_week": str(session_value),
+                        "equipment_option": equipment_option if equipments else None,
+                        "exercise": control_program["exercise__name"],
+                        "is_two_sided": control_program["is_two_sided"],
+                        "reps": str(control_program["reps"]),
+                        "weight": str(control_program["weight"]),
+                        "equipments": [equipments[0]["name"]] if equipments else [],
+                        "total_session_length": str(session_length["total_session_length"]),
+                        "user_calculated_reps": str(reps),
+                        "user_calculated_weight": str(weight),
+                        "system_calculated_reps": reps,
+                        "system_calculated_weight": weight,
+                        "created_at": str(control_program["created_at"]),
+                        "updated_at": str(control_program["updated_at"]),
+                        "videos": [{"url": url} for url in catalog.videos(control_program["id"])],
+                    }
+                    days[program_design["day"]].extend(_exercise_sets(record, session_length["total_sets"]))
+                    break
+
+    # save_user_program_designs keeps as many days as get_pd_dates returns dates
+    program_designs = []
+    for day in range(1, len(get_pd_day_offsets(session_value)) + 1):
+        program_design = sorted(days[day], key=lambda exercise: exercise["value"])
+        for counter, exercise in enumerate(program_design):
+            exercise["id"] = counter + 1
+        program_designs.append(program_design)
+    return program_designs
+
+
+class _BenchmarkUsers:
+    """Draws benchmark users from the benchmark catalog, one random.Random stream for the whole dataset."""
+
+    def __init__(self, seed, weeks, now):
+        self.seed = seed
+        self.weeks = weeks
+        self.rng = random.Random(seed)
+        self.now = now
+        self.goals = list(Goal.objects.filter(name__startswith=f"{BENCHMARK_PREFIX} ").order_by("name"))
+        if not self.goals:
+            raise ValueError("Benchmark catalog doesn't exist, seed it with seed_catalog first")
+        self.sessions = list(Session.objects.filter(value__in=range(1, 7)).order_by("value"))
+        self.fitness_levels = list(
+            FitnessLevel.objects.filter(fitness_name__startswith=f"{BENCHMARK_PREFIX} ").order_by("fitness_number")
+        )
+        self.equipment_options = {
+            option.name: option for option in EquipmentOption.objects.filter(name__in=EQUIPMENT_OPTIONS)
+        }
+        self.equipments = {
+            equipment.name.split(" ", 1)[1]: equipment
+            for equipment in Equipment.objects.filter(name__startswith=f"{BENCHMARK_PREFIX} ")
+        }
+        self.injuries = list(Injury.objects.filter(name__startswith=f"{BENCHMARK_PREFIX} ").order_by("name"))
+        self.standard_variables = [
+            (variable, low, high)
+            for name, low, high in STANDARD_VARIABLES
+            for variable in StandardVariable.objects.filter(name=name)
+        ]
+        self.questions = list(BaselineAssessment.objects.filter(question__in=BASELINE_QUESTIONS).order_by("question"))
+        self.system_rirs = {
+            (reps_in_reserve.goal_id, reps_in_reserve.fitness_level_id): reps_in_reserve.weeks
+            for reps_in_reserve in RepsInReserve.objects.filter(
+                goal__in=self.goals, fitness_level__in=self.fitness_levels
+            )
+        }
+        self.rir_ids = {key: index for index, key in enumerate(sorted(self.system_rirs))}
+        self.templates = {}
+        self.catalog = get_catalog()
+
+    def __equipments(self, option):
+        weighted = sorted(name for name, weights in EQUIPMENTS.items() if weights)
+        unweighted = sorted(name for name, weights in EQUIPMENTS.items() if not weights)
+        names = []
+        if option == "1 weight":
+            names = self.rng.sample(weighted[1:], self.rng.randint(1, 2))
+        elif option == "2 weights":
+            names = self.rng.sample(weighted, self.rng.randint(1, 3))
+        names += self.rng.sample(unweighted, self.rng.randint(0 if names else 1, 2))
+        weight_type = "lbs" if self.rng.random() < 0.2 else "kg"
+        user_equipments = []
+        for name in names:
+            weights = EQUIPMENTS[name]
+            user_equipments.append(
+                UserEquipment(
+                    equipment=self.equipments[name],
+                    equipment_option=self.equipment_options[option if weights else "None"],
+                    weights=(
+                        {
+                            str(weight): 1
+                            for weight in sorted(self.rng.sample(weights, self.rng.randint(3, len(weights))))
+                        }
+                        if weights
+                        else None
+                    ),
+                    weight_type=weight_type,
+                )
+            )
+        return user_equipments
+
+    def draw(self, index):
+        """Return the unsaved rows of one user, its profile's related rows and its program plan."""
+        rng = self.rng
+        goal = rng.choice(self.goals)
+        session = rng.choices(self.sessions, weights=(1, 2, 4, 4, 2, 1)[: len(self.sessions)])[0]
+        total_session_length = rng.choice(SESSION_LENGTHS)
+        fitness_level = rng.choice(self.fitness_levels)
+        option = rng.choices(EQUIPMENT_OPTIONS, weights=(2, 3, 5))[0]
+        user = User(
+            email=f"user-{self.seed}-{index + 1}@{BENCHMARK_EMAIL_DOMAIN}",
+            password="!",
+            first_name="Benchmark",
+            last_name=str(index + 1),
+        )
+        user_profile = UserProfile(
+            goal=goal,
+            session=session,
+            max_session_length=str(int(Decimal(total_session_length))),
+            fitness_level=fitness_level,
+            is_personalized=rng.random() < 0.6,
+            baseline_assessment=[
+                {"id": question.id, "question": question.question, "value": str(rng.randint(5, 40))}
+                for question in self.questions
+            ],
+            gym_type=rng.choice(UserProfile.GYM_CHOICES)[0],
+            is_pd_exist=True,
+        )
+        user_equipments = self.__equipments(option)
+        user_injuries = [
+            UserInjury(injury=injury, injury_type_id=injury.injury_type_id)
+            for injury in rng.sample(self.injuries, rng.choices((0, 1, 2), weights=(7, 2, 1))[0])
+        ]
+        user_standard_variables = [
+            UserStandardVariable(standard_variable_id=variable, value=str(rng.randint(low, high)))
+            for variable, low, high in self.standard_variables
+        ]
+        start_date = (self.now - datetime.timedelta(days=rng.randint(0, 7 * self.weeks - 1))).replace(
+            hour=rng.randint(6, 21), minute=rng.randint(0, 59), second=0, microsecond=0
+        )
+        plan = {
+            "template": (goal.id, option, total_session_length, session.id),
+            "is_personalized": user_profile.is_personalized,
+            "start_date": start_date,
+            "completion": round(rng.uniform(0.5, 0.95), 3),
+            "rir_id": self.rir_ids.get((goal.id, fitness_level.id)),
+        }
+        return user, user_profile, user_equipments + user_injuries + user_standard_variables, plan
+
+    def template_id(self, key):
+        """Return the id of the program template of key, and its rows when the template is new."""
+        if key in self.templates:
+            return self.templates[key], []
+        template_id = len(self.templates)
+        self.templates[key] = template_id
+        program_designs = _program_template(self.catalog, *key)
+        offsets = get_pd_day_offsets(self.catalog.sessions[key[3]])
+        rows = [
+            (template_id, day, offsets[day - 1], offsets[-1], json.dumps(program_design))
+            for day, program_design in enumerate(program_designs, start=1)
+        ]
+        return template_id, rows
+
+
+def seed_users(users, seed=42, weeks=TOTAL_PROGRAM_DESIGN_WEEKS, batch_size=2000):
+    """Public Method
+
+    The method creates users with profiles, equipment, injuries, standard variables and baseline answers drawn
+    from the benchmark catalog, each with one program of the given number of weeks that started within that
+    many weeks before now, so most programs are partly in the past and partly completed. Users, profiles and
+    their rows are written with bulk_create a batch at a time. The UserProgramDesign rows are expanded in
+    PostgreSQL by one INSERT ... SELECT per batch, from the batch's plans and program templates kept in
+    temporary tables, so no program row passes through Python. The same seed produces the same dataset.
+
+    Parameters
+    ----------
+    users : integer
+    seed : integer
+    weeks : integer
+    batch_size : integer
+        users written per transaction
+
+    Returns
+    -------
+    list
+        returns the ids of the seeded user profiles
+    """
+    benchmark_users = _BenchmarkUsers(seed, weeks, timezone.now())
+    user_profile_ids = []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE benchmark_program_templates "
+            "(template_id integer, day integer, day_offset integer, last_offset integer, program_design jsonb)"
+        )
+        cursor.execute("CREATE TEMPORARY TABLE benchmark_system_rirs (rir_id integer, week integer, rir integer)")
+        rir_rows = [
+            (benchmark_users.rir_ids[key], int(rir["week"]), int(rir["rir"]))
+            for key, rirs in benchmark_users.system_rirs.items()
+            for rir in rirs
+        ]
+        _insert_rows(cursor, "benchmark_system_rirs", ("integer", "integer", "integer"), rir_rows)
+        try:
+            for offset in range(0, users, batch_size):
+                with transaction.atomic():
+                    user_profile_ids.extend(
+                        _seed_user_batch(cursor, benchmark_users, range(offset, min(offset + batch_size, users)))
+                    )
+                logger.info(f"Seeded {len(user_profile_ids)} of {users} benchmark users")
+        finally:
+            cursor.execute("DROP TABLE IF EXISTS benchmark_program_templates, benchmark_system_rirs")
+        for model in (User, UserProfile, UserEquipment, UserInjury, UserStandardVariable, UserProgramDesign):
+            cursor.execute(f"ANALYZE {_table(model)}")
+    return user_profile_ids
+
+
+def _insert_rows(cursor, table, types, rows):
+    """Insert rows into a temporary table with one statement, passing each column as an array."""
+    if not rows:
+        return
+    columns = ", ".join(f"%s::{column_type}[]" for column_type in types)
+    cursor.execute(f"INSERT INTO {table} SELECT * FROM unnest({columns})", [list(column) for column in zip(*rows)])
+
+
+def _seed_user_batch(cursor, benchmark_users, indexes):
+    drawn = [benchmark_users.draw(index) for index in indexes]
+    users = User.objects.bulk_create([user for user, _, _, _ in drawn])
+    for user, (_, user_profile, _, _) in zip(users, drawn):
+        user_profile.user_id = user
+    user_profiles = UserProfile.objects.bulk_create([user_profile for _, user_profile, _, _ in drawn])
+
+    related = {}
+    for user_profile, (_, _, rows, _) in zip(user_profiles, drawn):
+        for row in rows:
+            row.user_profile = user_profile
+            related.setdefault(type(row), []).append(row)
+    for model, rows in related.items():
+        model.objects.bulk_create(rows, batch_size=5000)
+
+    plans = []
+    for index, user_profile, (_, _, _, plan) in zip(indexes, user_profiles, drawn):
+        template_id, template_rows = benchmark_users.template_id(plan["template"])
+        _insert_rows(
+            cursor,
+            "benchmark_program_templates",
+            ("integer", "integer", "integer", "integer", "jsonb"),
+            template_rows,
+        )
+        plans.append(
+            (
+                user_profile.id,
+                index,
+                template_id,
+                plan["is_personalized"],
+                plan["start_date"],
+                plan["completion"],
+                plan["rir_id"],
+            )
+        )
+    # a workout in the past is complete with the profile's completion rate, hashtext keeps it deterministic
+    cursor.execute(
+        f"""
+        INSERT INTO {_table(UserProgramDesign)}
+            (user_id, day, week, program_design, workout_date, is_complete, is_personalized, system_rir, start_date,
+            end_date, created_at, updated_at)
+        SELECT
+            p.user_profile_id,
+            t.day,
+            w.week,
+            t.program_design,
+            p.start_date + (t.day_offset + 7 * (w.week - 1)) * interval '1 day',
+            p.start_date + (t.day_offset + 7 * (w.week - 1)) * interval '1 day' < %(now)s
+                AND abs(hashtext(concat_ws('-', %(seed)s, p.position, w.week, t.day))) %% 1000 < p.completion * 1000,
+            p.is_personalized,
+            r.rir,
+            p.start_date,
+            p.start_date + (t.last_offset + 7 * (%(weeks)s - 1)) * interval '1 day',
+            p.start_date,
+            p.start_date
+        FROM unnest(
+            %(user_profile_ids)s::integer[],
+            %(positions)s::integer[],
+            %(template_ids)s::integer[],
+            %(is_personalized)s::boolean[],
+            %(start_dates)s::timestamptz[],
+            %(completions)s::real[],
+            %(rir_ids)s::integer[]
+        ) AS p(user_profile_id, position, template_id, is_personalized, start_date, completion, rir_id)
+        JOIN benchmark_program_templates AS t ON t.template_id = p.template_id
+        CROSS JOIN generate_series(1, %(weeks)s) AS w(week)
+        LEFT JOIN benchmark_system_rirs AS r ON r.rir_id = p.rir_id AND r.week = w.week
+        ORDER BY p.position, w.week, t.day
+        """,
+        dict(
+            zip(
+                (
+                    "user_profile_ids",
+                    "positions",
+                    "template_ids",
+                    "is_personalized",
+                    "start_dates",
+                    "completions",
+                    "rir_ids",
+                ),
+                [list(column) for column in zip(*plans)],
+            ),
+            now=benchmark_users.now,
+            seed=benchmark_users.seed,
+            weeks=benchmark_users.weeks,
+        ),
+    )
+    return [user_profile.id for user_profile in user_profiles]
+
+
+def flush_benchmark_data():
+    """Public Method
+
+    The method deletes every benchmark user, the benchmark catalog and the goal Config row pointing at it.
+    The UserProgramDesign rows and the profiles' other rows are deleted with plain DELETE statements first,
+    so the deletion collector doesn't load a million program rows.
+
+    Returns
+    -------
+    integer
+        returns the number of deleted user profiles
+    """
+    with transaction.atomic():
+        user_profile_ids = list(
+            UserProfile.objects.filter(user_id__email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").values_list(
+                "id", flat=True
+            )
+        )
+        with connection.cursor() as cursor:
+            for model, column in (
+                (UserFeedback, "user_profile_id"),
+                (UserProgramDesign, "user_id"),
+                (UserEquipment, "user_profile_id"),
+                (UserInjury, "user_profile_id"),
+                (UserStandardVariable, "user_profile_id"),
+            ):
+                cursor.execute(f"DELETE FROM {_table(model)} WHERE {column} = ANY(%s)", [user_profile_ids])
+        User.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").delete()
+
+        prefix = f"{BENCHMARK_PREFIX} "
+        benchmark_goal_ids = Goal.objects.filter(name__startswith=prefix).values_list("id", flat=True)
+        for config in Config.objects.filter(key="goal"):
+            if config.value.isdigit() and int(config.value) in benchmark_goal_ids:
+                config.delete()
+        Goal.objects.filter(name__startswith=prefix).delete()
+        Exercise.objects.filter(name__startswith=prefix).delete()
+        EquipmentCombination.objects.filter(name__startswith=prefix).delete()
+        Equipment.objects.filter(name__startswith=prefix).delete()
+        BodyPart.objects.filter(name__startswith=prefix).delete()
+        Variance.objects.filter(name__startswith=prefix).delete()
+        InjuryType.objects.filter(name__startswith=prefix).delete()
+        FitnessLevel.objects.filter(fitness_name__startswith=prefix).delete()
+        StandardVariable.objects.filter(name__startswith=prefix).delete()
+        BaselineAssessment.objects.filter(question__in=BASELINE_QUESTIONS).delete()
+    logger.info(f"Deleted {len(user_profile_ids)} benchmark user profiles and the benchmark catalog")
+    return len(user_profile_ids)
@@ -0,0 +1,416 @@
+"""Benchmark suite file.
+
+Scenarios call the mobile API views and helpers directly against the seed_benchmark_data dataset, with
+APIRequestFactory requests authenticated as sampled benchmark users, so middleware and URL routing are not
+part of the measurement. Scenarios that write run inside a transaction that is rolled back, leaving the
+dataset as it was for the next iteration and the next run.
+"""
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+import django
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.benchmarks.seed import BENCHMARK_EMAIL_DOMAIN
+from apps.mobile_api.v1.models import UserProfile, UserProgramDesign
+from apps.mobile_api.v1.views import UserProgramDesignView, UserWorkoutProgramsView, get_missed_sessions
+
+logger = logging.getLogger(__name__)
+
+# metric: statistic, the values compared by compare_results
+COMPARED_METRICS = (
+    ("wall_ms", "p50"),
+    ("wall_ms", "p95"),
+    ("wall_ms", "p99"),
+    ("queries", "mean"),
+    ("memory_peak_kb", "mean"),
+)
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def _program_query(user_profile):
+    # the week the mobile app shows, filtered on the goal and session length the programs were seeded with
+    today = timezone.now().date()
+    return {
+        "goal": user_profile.goal.name,
+        "total_session_length": f"{int(user_profile.max_session_length)}.00",
+        "startdate": today.isoformat(),
+        "endate": (today + datetime.timedelta(days=6)).isoformat(),
+    }
+
+
+def _authenticated(request, user_profile):
+    force_authenticate(request, user=user_profile.user_id)
+    return request
+
+
+def generate_programs(factory, user_profile):
+    request = factory.post(
+        "/api/user-workout-programs/",
+        {
+            "is_personalized": user_profile.is_personalized,
+            "goal": user_profile.goal_id,
+            "session_per_week": user_profile.session_id,
+            "total_session_length": user_profile.max_session_length,
+        },
+        format="json",
+    )
+    _authenticated(request, user_profile)
+
+    def call():
+        with transaction.atomic():
+            response = UserWorkoutProgramsView.as_view()(request)
+            response.render()
+            transaction.set_rollback(True)
+        return response.status_code
+
+    return call
+
+
+def read_programs(factory, user_profile):
+    request = factory.get(f"/api/user-programs-designs/{user_profile.id}/", _program_query(user_profile))
+    _authenticated(request, user_profile)
+
+    def call():
+        response = UserProgramDesignView.as_view()(request, user_id=user_profile.id)
+        response.render()
+        return response.status_code
+
+    return call
+
+
+def update_programs(factory, user_profile):
+    # a rir update of the first working set of the next workout, which also adjusts the set after it
+    user_program_design = (
+        UserProgramDesign.objects.filter(user=user_profile.id, is_complete=False)
+        .exclude(program_design=[])
+        .order_by("workout_date")
+        .first()
+    )
+    if user_program_design is None:
+        return lambda: 404
+    exercise = next(
+        (exercise for exercise in user_program_design.program_design if exercise["set"] == "1"),
+        user_program_design.program_design[0],
+    )
+    request = factory.put(
+        f"/api/user-programs-designs/{user_profile.id}/?{urlencode(_program_query(user_profile))}",
+        {
+            "user_rir": (user_program_design.system_rir or 0) + 1,
+            "system_rir": user_program_design.system_rir or 0,
+            "exercise_id": exercise["id"],
+            "user_program_design_id": user_program_design.id,
+            "system_calculated_reps": exercise["system_calculated_reps"],
+            "system_calculated_weight": exercise["system_calculated_weight"],
+        },
+        format="json",
+    )
+    _authenticated(request, user_profile)
+
+    def call():
+        with transaction.atomic():
+            response = UserProgramDesignView.as_view()(request, user_id=user_profile.id)
+            response.render()
+            transaction.set_rollback(True)
+        return response.status_code
+
+    return call
+
+
+def missed_sessions(factory, user_profile):
+    # a helper, not a view, so its outcome is mapped to the status code UserProgramDesignView would answer with
+    def call():
+        try:
+            missed, response_data = get_missed_sessions(user_profile.id)
+        except Exception as e:
+            logger.exception(f"get_missed_sessions failed for user profile {user_profile.id}: {str(e)}")
+            return 500
+        return 200 if isinstance(missed, int) and "can_reschedule" in response_data else 500
+
+    return call
+
+
+# name: function taking an APIRequestFactory and a UserProfile, preparing the request outside the
+# measurement and returning the call to measure, which returns the response status code
+SCENARIOS = {
+    "generate_programs": generate_programs,
+    "read_programs": read_programs,
+    "update_programs": update_programs,
+    "missed_sessions": missed_sessions,
+}
+
+
+def is_success(status_code):
+    return 200 <= int(status_code) < 300
+
+
+def _success_share(statuses):
+    calls = sum(statuses.values())
+    return sum(count for status_code, count in statuses.items() if is_success(status_code)) / calls if calls else 0.0
+
+
+def _percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def _summary(values, digits=2):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "mean": round(statistics.fmean(values), digits),
+        "min": round(values[0], digits),
+        "p50": round(statistics.median(values), digits),
+        "p95": round(_percentile(values, 0.95), digits),
+        "p99": round(_percentile(values, 0.99), digits),
+        "max": round(values[-1], digits),
+    }
+
+
+def sample_user_profiles(users, seed=42):
+    """Public Method
+
+    The method picks the benchmark user profiles the scenarios run as, the same ones for the same seed and
+    dataset.
+
+    Parameters
+    ----------
+    users : integer
+    seed : integer
+
+    Returns
+    -------
+    list
+        returns apps.mobile_api.v1.models.UserProfile objects with their user, goal and session
+    """
+    user_profile_ids = list(
+        UserProfile.objects.filter(user_id__email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}", is_pd_exist=True)
+        .exclude(goal=None)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if not user_profile_ids:
+        raise ValueError("No benchmark users found, seed them with the seed_benchmark_data command")
+    user_profile_ids = random.Random(seed).sample(user_profile_ids, min(users, len(user_profile_ids)))
+    user_profiles = UserProfile.objects.select_related("user_id", "goal", "session").in_bulk(user_profile_ids)
+    return [user_profiles[user_profile_id] for user_profile_id in user_profile_ids]
+
+
+def run_scenario(scenario, user_profiles, iterations, warmup=3, memory_iterations=10):
+    """Public Method
+
+    The method runs a scenario for iterations calls, cycling through the user profiles, after warmup calls
+    that aren't measured. Wall time and query count are measured on every call. Memory is measured on
+    memory_iterations further calls, with tracemalloc tracing only those so its overhead stays out of the
+    timings. A result is only valid when every call, warm-up and memory calls included, answered 2xx;
+    otherwise the timings measure an error path.
+
+    Parameters
+    ----------
+    scenario : str
+        key of SCENARIOS
+    user_profiles : list
+    iterations : integer
+    warmup : integer
+    memory_iterations : integer
+
+    Returns
+    -------
+    dict
+        returns the wall_ms, queries and memory_peak_kb summaries, the status code counts of the measured calls
+        and whether the result is valid
+    """
+    prepare = SCENARIOS[scenario]
+    factory = APIRequestFactory()
+    valid = True
+    for index in range(warmup):
+        valid = is_success(prepare(factory, user_profiles[index % len(user_profiles)])()) and valid
+
+    timings, queries, statuses = [], [], {}
+    for index in range(iterations):
+        call = prepare(factory, user_profiles[index % len(user_profiles)])
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            status_code = call()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.queries)
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+
+    peaks = []
+    for index in range(memory_iterations):
+        call = prepare(factory, user_profiles[index % len(user_profiles)])
+        tracemalloc.start()
+        try:
+            valid = is_success(call()) and valid
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "valid": valid and all(is_success(status_code) for status_code in statuses),
+        "statuses": statuses,
+        "wall_ms": _summary(timings),
+        "queries": _summary(queries),
+        "memory_peak_kb": _summary(peaks, 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT current_setting('server_version')")
+        database_version = cursor.fetchone()[0]
+        cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(UserProgramDesign._meta.db_table)}")
+        user_program_designs = cursor.fetchone()[0]
+    return {
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": f"{connection.vendor} {database_version}",
+        "cpu_count": os.cpu_count(),
+        "user_program_designs": user_program_designs,
+    }
+
+
+def run_suite(scenarios, users=20, iterations=50, warmup=3, memory_iterations=10, seed=42):
+    """Public Method
+
+    The method runs the given scenarios against the same sample of benchmark users.
+
+    Parameters
+    ----------
+    scenarios : list
+        keys of SCENARIOS
+    users : integer
+        benchmark user profiles the iterations cycle through
+    iterations : integer
+    warmup : integer
+    memory_iterations : integer
+    seed : integer
+        picks the user profiles
+
+    Returns
+    -------
+    dict
+        returns the results, JSON serializable
+    """
+    user_profiles = sample_user_profiles(users, seed)
+    results = {
+        "created_at": timezone.now().isoformat(),
+        "environment": environment(),
+        "options": {
+            "users": len(user_profiles),
+            "iterations": iterations,
+            "warmup": warmup,
+            "memory_iterations": memory_iterations,
+            "seed": seed,
+        },
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        logger.info(f"Running benchmark scenario {scenario}")
+        results["scenarios"][scenario] = run_scenario(scenario, user_profiles, iterations, warmup, memory_iterations)
+    return results
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(baseline, current, threshold=0.1, min_wall_ms=1.0):
+    """Public Method
+
+    The method compares the scenarios present in both results. A metric regresses when it grew by more than
+    threshold relative to the baseline, and wall times also by more than min_wall_ms, so noise on fast calls
+    isn't flagged. Any increase of the mean query count is a regression. The share of 2xx calls is compared as
+    statuses.success, which regresses when either run had a non-2xx call or the status codes differ, since
+    the timings of such a run don't measure the same path.
+
+    Parameters
+    ----------
+    baseline : dict
+        results of run_suite
+    current : dict
+        results of run_suite
+    threshold : float
+        allowed relative growth, 0.1 for 10%
+    min_wall_ms : float
+
+    Returns
+    -------
+    list
+        returns a dict per compared metric with scenario, metric, baseline, current, change and regression
+    """
+    comparisons = []
+    for scenario, current_result in current["scenarios"].items():
+        baseline_result = baseline["scenarios"].get(scenario)
+        if baseline_result is None:
+            continue
+        before_statuses = baseline_result.get("statuses")
+        after_statuses = current_result.get("statuses")
+        if before_statuses is not None and after_statuses is not None:
+            before, after = _success_share(before_statuses), _success_share(after_statuses)
+            comparisons.append(
+                {
+                    "scenario": scenario,
+                    "metric": "statuses.success",
+                    "baseline": before,
+                    "current": after,
+                    "change": round(after - before, 4),
+                    "regression": before < 1 or after < 1 or set(before_statuses) != set(after_statuses),
+                }
+            )
+        for metric, statistic in COMPARED_METRICS:
+            before = baseline_result.get(metric, {}).get(statistic)
+            after = current_result.get(metric, {}).get(statistic)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            if metric == "queries":
+                regression = after > before
+            elif metric == "wall_ms":
+                regression = change > threshold and after - before > min_wall_ms
+            else:
+                regression = change > threshold
+            comparisons.append(
+                {
+                    "scenario": scenario,
+                    "metric": f"{metric}.{statistic}",
+                    "baseline": before,
+                    "current": after,
+                    "change": round(change, 4),
+                    "regression": regression,
+                }
+            )
+    return comparisons
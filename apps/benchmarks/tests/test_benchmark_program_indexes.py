@@ -0,0 +1,47 @@
+import io
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.benchmarks.seed import BENCHMARK_EMAIL_DOMAIN, seed_catalog
+from apps.controlled.catalog import bump_catalog_version
+from apps.mobile_api.v1.models import UserProgramDesign
+from apps.testing import CacheVersionsMixin
+
+
+class BenchmarkProgramIndexesTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+        bump_catalog_version()
+
+    def test_compares_the_queries_on_a_tiny_dataset(self):
+        stdout = io.StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "benchmark_program_indexes", users=4, weeks=1, samples=2, repeat=1, batch_size=2, stdout=stdout
+            )
+        output = stdout.getvalue()
+        self.assertIn("Seeded 4 users", output)
+        for name in ("next_workout", "program_design", "past_incomplete", "next_exercise", "missed_sessions"):
+            self.assertIn(f"\n{name}", output)
+
+        statements = [query["sql"] for query in queries.captured_queries]
+        first_explain = next(index for index, sql in enumerate(statements) if sql.startswith("EXPLAIN"))
+        analyzed = [sql for sql in statements[:first_explain] if sql.startswith("ANALYZE")]
+        self.assertIn(f'ANALYZE "{UserProgramDesign._meta.db_table}"', analyzed)
+
+        # the seeded users and the dropped indexes are rolled back
+        self.assertFalse(User.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").exists())
+        index_names = {index.name for index in UserProgramDesign._meta.indexes}
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, UserProgramDesign._meta.db_table)
+        self.assertLessEqual(index_names, set(constraints))
+
+    def test_refuses_to_run_next_to_seeded_users(self):
+        User.objects.create(email=f"user-42-1@{BENCHMARK_EMAIL_DOMAIN}", password="!")
+        with self.assertRaises(CommandError):
+            call_command("benchmark_program_indexes", users=1, stdout=io.StringIO())
@@ -0,0 +1,79 @@
+from django.apps import apps
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.benchmarks.seed import STANDARD_VARIABLES, flush_benchmark_data, seed_catalog, seed_users
+from apps.config.models import Config
+from apps.controlled.catalog import bump_catalog_version
+from apps.controlled.models import ControlProgram, Exercise, FirstEverCalc, SessionLength
+from apps.equipment.models import Equipment, EquipmentOption
+from apps.mobile_api.v1.models import UserEquipment, UserInjury, UserProfile, UserProgramDesign, UserStandardVariable
+from apps.session.models import Session
+from apps.standard_variable.models import StandardVariable
+from apps.testing import CacheVersionsMixin
+
+USER_MODELS = (User, UserProfile, UserEquipment, UserInjury, UserStandardVariable, UserProgramDesign)
+
+
+def row_counts(models):
+    return {model.__name__: model.objects.count() for model in models}
+
+
+class SeedCatalogTest(TestCase):
+    def test_only_the_config_rows_send_signals(self):
+        senders = []
+
+        def receiver(sender, **kwargs):
+            senders.append(sender)
+
+        post_save.connect(receiver, weak=False, dispatch_uid="seed_catalog_test")
+        try:
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.assertTrue(seed_catalog(exercises=12))
+        finally:
+            post_save.disconnect(dispatch_uid="seed_catalog_test")
+        self.assertEqual(set(senders), {Config})
+        self.assertEqual([callback.__name__ for callback in callbacks].count(bump_catalog_version.__name__), 1)
+        self.assertEqual(ControlProgram.objects.count(), 12)
+        self.assertEqual(FirstEverCalc.objects.filter(type="FSC").count(), 12)
+
+    def test_reuses_an_existing_catalog(self):
+        Session.objects.create(value=3, description="Three days")
+        seed_catalog(exercises=12)
+        counts = row_counts((Exercise, SessionLength, Session, EquipmentOption, Equipment))
+        self.assertFalse(seed_catalog(exercises=12))
+        self.assertEqual(row_counts((Exercise, SessionLength, Session, EquipmentOption, Equipment)), counts)
+        self.assertEqual(Session.objects.filter(value=3).count(), 1)
+
+
+class SeedUsersTest(CacheVersionsMixin, TestCase):
+    def test_seed_and_flush_row_counts(self):
+        catalog_models = [model for model in apps.get_models() if model not in USER_MODELS]
+        before = row_counts(USER_MODELS + tuple(catalog_models))
+        seed_catalog(exercises=24)
+        bump_catalog_version()
+
+        user_profile_ids = seed_users(5, weeks=2, batch_size=2)
+        self.assertEqual(len(user_profile_ids), 5)
+        seeded = row_counts(USER_MODELS)
+        for model in (User, UserProfile):
+            self.assertEqual(seeded[model.__name__] - before[model.__name__], 5)
+        self.assertEqual(
+            UserStandardVariable.objects.filter(user_profile__in=user_profile_ids).count(), 5 * len(STANDARD_VARIABLES)
+        )
+        self.assertTrue(UserEquipment.objects.filter(user_profile__in=user_profile_ids).exists())
+        for user_profile in UserProfile.objects.filter(id__in=user_profile_ids).select_related("session"):
+            programs = UserProgramDesign.objects.filter(user=user_profile)
+            self.assertEqual(programs.count(), 2 * user_profile.session.value)
+            self.assertEqual(set(programs.values_list("week", flat=True)), {1, 2})
+
+        self.assertEqual(flush_benchmark_data(), 5)
+        after = row_counts(USER_MODELS + tuple(catalog_models))
+        # the shared lookups are kept: equipment options, sessions, the Weight standard variable and the Config
+        # rows that don't point at a benchmark goal
+        for model in (EquipmentOption, Session, StandardVariable, Config):
+            after.pop(model.__name__)
+            before.pop(model.__name__)
+        self.assertEqual(after, before)
+        self.assertFalse(Config.objects.filter(key="goal").exists())
@@ -0,0 +1,153 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from apps.benchmarks import suite
+from apps.benchmarks.suite import compare_results, run_scenario
+
+
+def scenario_result(p50=10.0, p95=20.0, p99=30.0, queries=5, memory=100.0, statuses=None):
+    return {
+        "iterations": 10,
+        "valid": True,
+        "statuses": {"200": 10} if statuses is None else statuses,
+        "wall_ms": {"mean": p50, "p50": p50, "p95": p95, "p99": p99},
+        "queries": {"mean": queries},
+        "memory_peak_kb": {"mean": memory},
+    }
+
+
+def results(**scenarios):
+    return {"scenarios": scenarios}
+
+
+class CompareResultsTest(SimpleTestCase):
+    def regressions(self, baseline, current, **kwargs):
+        return {
+            (comparison["scenario"], comparison["metric"])
+            for comparison in compare_results(baseline, current, **kwargs)
+            if comparison["regression"]
+        }
+
+    def test_unchanged_and_faster_results_pass(self):
+        baseline = results(read=scenario_result())
+        for current in (scenario_result(), scenario_result(p50=5, p95=10, p99=15, queries=3, memory=50)):
+            comparisons = compare_results(baseline, results(read=current))
+            self.assertEqual(
+                [comparison["metric"] for comparison in comparisons],
+                [
+                    "statuses.success",
+                    "wall_ms.p50",
+                    "wall_ms.p95",
+                    "wall_ms.p99",
+                    "queries.mean",
+                    "memory_peak_kb.mean",
+                ],
+            )
+            self.assertFalse(any(comparison["regression"] for comparison in comparisons))
+
+    def test_growth_within_the_threshold_passes(self):
+        current = results(read=scenario_result(p50=10.9, p95=21.9, p99=32.9, memory=109))
+        self.assertEqual(self.regressions(results(read=scenario_result()), current), set())
+
+    def test_growth_beyond_the_threshold_regresses(self):
+        comparisons = compare_results(
+            results(read=scenario_result()), results(read=scenario_result(p95=25, memory=120)), threshold=0.1
+        )
+        p95 = next(comparison for comparison in comparisons if comparison["metric"] == "wall_ms.p95")
+        self.assertEqual((p95["baseline"], p95["current"], p95["change"], p95["regression"]), (20, 25, 0.25, True))
+        self.assertEqual(
+            {comparison["metric"] for comparison in comparisons if comparison["regression"]},
+            {"wall_ms.p95", "memory_peak_kb.mean"},
+        )
+
+    def test_small_wall_time_growth_is_noise(self):
+        baseline = results(read=scenario_result(p50=0.5, p95=0.6, p99=0.7))
+        current = results(read=scenario_result(p50=1.0, p95=1.5, p99=1.8))
+        self.assertEqual(self.regressions(baseline, current, min_wall_ms=1.0), {("read", "wall_ms.p99")})
+        self.assertEqual(self.regressions(baseline, current, min_wall_ms=2.0), set())
+
+    def test_any_extra_query_regresses(self):
+        current = results(read=scenario_result(queries=5.1))
+        self.assertEqual(self.regressions(results(read=scenario_result()), current), {("read", "queries.mean")})
+
+    def test_failed_calls_regress(self):
+        baseline = results(read=scenario_result())
+        for statuses in ({"200": 9, "500": 1}, {"204": 10}):
+            with self.subTest(statuses=statuses):
+                current = results(read=scenario_result(statuses=statuses))
+                self.assertEqual(self.regressions(baseline, current), {("read", "statuses.success")})
+        failing_baseline = results(read=scenario_result(statuses={"400": 10}))
+        self.assertIn(("read", "statuses.success"), self.regressions(failing_baseline, results(read=scenario_result())))
+
+    def test_scenarios_missing_from_either_run_are_skipped(self):
+        baseline = results(read=scenario_result(), generate=scenario_result())
+        current = results(read=scenario_result(), update=scenario_result(p50=1000))
+        self.assertEqual({comparison["scenario"] for comparison in compare_results(baseline, current)}, {"read"})
+
+    def test_missing_metrics_and_zero_baselines(self):
+        baseline = scenario_result(queries=0)
+        del baseline["memory_peak_kb"]
+        comparisons = compare_results(results(read=baseline), results(read=scenario_result(queries=1)))
+        self.assertNotIn("memory_peak_kb.mean", {comparison["metric"] for comparison in comparisons})
+        queries = next(comparison for comparison in comparisons if comparison["metric"] == "queries.mean")
+        self.assertEqual((queries["change"], queries["regression"]), (0.0, True))
+
+
+class CompareBenchmarksCommandTest(SimpleTestCase):
+    def write(self, data):
+        descriptor, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(data, file)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def compare(self, baseline, current):
+        stdout = io.StringIO()
+        call_command("compare_benchmarks", self.write(baseline), self.write(current), stdout=stdout)
+        return stdout.getvalue()
+
+    def test_passes_without_regressions(self):
+        self.assertIn("No regressions", self.compare(results(read=scenario_result()), results(read=scenario_result())))
+
+    def test_fails_on_a_regression(self):
+        with self.assertRaisesMessage(CommandError, "1 metrics regressed"):
+            self.compare(results(read=scenario_result()), results(read=scenario_result(queries=6)))
+
+    def test_fails_without_common_scenarios(self):
+        with self.assertRaisesMessage(CommandError, "no scenario in common"):
+            self.compare(results(read=scenario_result()), results(update=scenario_result()))
+
+
+class RunScenarioTest(SimpleTestCase):
+    def run_with_statuses(self, statuses, warmup=0, memory_iterations=0):
+        status_codes = iter(statuses)
+
+        def prepare(factory, user_profile):
+            return lambda: next(status_codes)
+
+        with mock.patch.dict(suite.SCENARIOS, {"fake": prepare}):
+            return run_scenario(
+                "fake",
+                ["user"],
+                iterations=len(statuses) - warmup - memory_iterations,
+                warmup=warmup,
+                memory_iterations=memory_iterations,
+            )
+
+    def test_counts_the_statuses_of_the_measured_calls(self):
+        result = self.run_with_statuses([200, 200, 201, 200, 200], warmup=1, memory_iterations=1)
+        self.assertEqual(result["statuses"], {"200": 2, "201": 1})
+        self.assertTrue(result["valid"])
+        self.assertEqual((result["iterations"], result["queries"]["mean"]), (3, 0))
+        self.assertIn("p99", result["wall_ms"])
+
+    def test_any_non_2xx_call_invalidates_the_result(self):
+        for statuses in ([500, 200, 200, 200], [200, 404, 200, 200], [200, 200, 200, 503]):
+            with self.subTest(statuses=statuses):
+                self.assertFalse(self.run_with_statuses(statuses, warmup=1, memory_iterations=1)["valid"])
@@ -12,3 +12,6 @@ class BodyPartsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.body_part"
+
+    def ready(self):
+        import apps.body_part.signals  # noqa: F401
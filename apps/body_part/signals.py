@@ -0,0 +1,5 @@
+"""BodyPart signals file."""
+from apps.etag import track_table_versions
+from apps.body_part.models import BodyPart
+
+track_table_versions(BodyPart)
@@ -8,12 +8,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.body_part.serializers import BodyPart, BodyPartSerializer, ClassificationSerializer
+from apps.etag import ConditionalGetMixin
 from apps.utils import response_json
 
 logger = logging.getLogger(__name__)
 
 
-class BodyPartsView(APIView):
+class BodyPartsView(ConditionalGetMixin, APIView):
     """BodyPartsView class
 
     This view performs POST and FETCHALL operations for BodyPart
@@ -25,6 +26,7 @@ class BodyPartsView(APIView):
     """
 
     permission_classes = [permissions.IsAdminUser]
+    etag_models = (BodyPart,)
 
     @swagger_auto_schema(
         responses={
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ConfigConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.config"
+
+    def ready(self):
+        import apps.config.signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""Config registry file."""
+import logging
+import threading
+from types import MappingProxyType
+
+from apps.config.models import Config
+from apps.metrics import record_cache_access
+from apps.utils import bump_cache_version, get_cache_version
+
+logger = logging.getLogger(__name__)
+
+CONFIG_VERSION_KEY = "config:registry_version"
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+class ConfigRegistry:
+    """ConfigRegistry class
+
+    Immutable in-process copy of every Config row. When a key is stored more than once the most recently
+    created row wins, the same row ``Config.objects.filter(key=key)[0]`` returns.
+
+    Parameters
+    ----------
+    version : integer
+        config version the registry was built against
+    """
+
+    def __init__(self, version):
+        self.version = version
+        values = {}
+        for record in Config.objects.values("key", "value").order_by("-created_at", "-id"):
+            values.setdefault(record["key"], record["value"])
+        self.values = MappingProxyType(values)
+        logger.info(f"Config registry built for version {version}")
+
+    def __getitem__(self, key):
+        try:
+            return self.values[key]
+        except KeyError:
+            raise KeyError(f"Config with the key: {key} doesn't exist")
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    @property
+    def goal_id(self) -> int:
+        return int(self["goal"])
+
+    @property
+    def session_per_week_id(self) -> int:
+        return int(self["session_per_week"])
+
+    @property
+    def total_session_length(self) -> str:
+        return self["total_session_length"]
+
+
+def get_config():
+    """Public Method
+
+    The method returns the config registry for the current config version, reloading the Config rows only
+    when a write has bumped the version since the last load.
+
+    Returns
+    -------
+    apps.config.registry.ConfigRegistry
+    """
+    global _registry
+
+    version = get_cache_version(CONFIG_VERSION_KEY)
+    registry = _registry
+    record_cache_access(registry is not None and registry.version == version)
+    if registry is None or registry.version != version:
+        with _registry_lock:
+            registry = _registry
+            if registry is None or registry.version != version:
+                registry = ConfigRegistry(version)
+                _registry = registry
+    return registry
+
+
+def bump_config_version():
+    """Public Method
+
+    The method invalidates the config registry of every process sharing the cache.
+
+    Returns
+    -------
+    integer
+        returns the new config version
+    """
+    return bump_cache_version(CONFIG_VERSION_KEY)
@@ -0,0 +1,15 @@
+"""Config signals file."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.config.models import Config
+from apps.config.registry import bump_config_version
+
+
+def invalidate_config(sender, **kwargs):
+    # bump after commit so no process can reload the registry from uncommitted rows
+    transaction.on_commit(bump_config_version)
+
+
+post_save.connect(invalidate_config, sender=Config, dispatch_uid="invalidate_config_save")
+post_delete.connect(invalidate_config, sender=Config, dispatch_uid="invalidate_config_delete")
@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from apps.config.models import Config
+from apps.config.registry import get_config
+from apps.testing import CacheVersionsMixin
+
+
+class ConfigRegistryTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Config.objects.create(key="goal", value="7")
+        Config.objects.create(key="session_per_week", value="3")
+        Config.objects.create(key="total_session_length", value="45.00")
+
+    def test_typed_values(self):
+        config = get_config()
+        self.assertEqual(config.goal_id, 7)
+        self.assertEqual(config.session_per_week_id, 3)
+        self.assertEqual(config.total_session_length, "45.00")
+        self.assertEqual(config["goal"], "7")
+
+    def test_registry_is_reused_without_queries(self):
+        config = get_config()
+        with self.assertNumQueries(0):
+            self.assertIs(get_config(), config)
+
+    def test_missing_keys(self):
+        config = get_config()
+        self.assertIsNone(config.get("unknown"))
+        self.assertEqual(config.get("unknown", "default"), "default")
+        with self.assertRaisesMessage(KeyError, "Config with the key: unknown doesn't exist"):
+            config["unknown"]
+
+    def test_newest_duplicate_wins_like_the_queryset_lookup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Config.objects.create(key="goal", value="8")
+        self.assertEqual(get_config()["goal"], Config.objects.filter(key="goal")[0].value)
+        self.assertEqual(get_config().goal_id, 8)
+
+    def test_registry_reloads_after_a_committed_write(self):
+        config = get_config()
+        with self.captureOnCommitCallbacks() as callbacks:
+            session_per_week = Config.objects.get(key="session_per_week")
+            session_per_week.value = "4"
+            session_per_week.save()
+            Config.objects.get(key="total_session_length").delete()
+        self.assertTrue(callbacks)
+        self.assertIs(get_config(), config)
+
+        for callback in callbacks:
+            callback()
+        reloaded = get_config()
+        self.assertIsNot(reloaded, config)
+        self.assertEqual(reloaded.session_per_week_id, 4)
+        self.assertIsNone(reloaded.get("total_session_length"))
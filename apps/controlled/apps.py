@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ControlledConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.controlled"
+
+    def ready(self):
+        import apps.controlled.signals  # noqa: F401
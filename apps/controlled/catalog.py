@@ -0,0 +1,280 @@
+"""Controlled catalog snapshot file."""
+import logging
+import threading
+from collections import defaultdict
+from decimal import Decimal
+from types import MappingProxyType
+
+from apps.controlled.models import (
+    ControlProgram,
+    ControlProgramInjury,
+    EquipmentGroup,
+    EquipmentRelation,
+    FirstEverCalc,
+    ProgramDesign,
+    SessionLength,
+    Video,
+    WorkoutFlow,
+)
+from apps.equipment.models import EquipmentOption
+from apps.goal.models import Goal
+from apps.injury.models import Injury
+from apps.metrics import record_cache_access
+from apps.session.models import Session
+from apps.utils import bump_cache_version, get_cache_version
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "controlled:catalog_version"
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _freeze(grouped):
+    return MappingProxyType({key: tuple(rows) for key, rows in grouped.items()})
+
+
+def _order_key(row):
+    return row["created_at"], row["id"]
+
+
+class CatalogSnapshot:
+    """CatalogSnapshot class
+
+    Immutable in-process copy of the apps.controlled graph used by workout generation. Every lookup the
+    generator needs is precomputed into a dictionary, so reading the catalog costs no queries once the
+    snapshot is built.
+
+    Parameters
+    ----------
+    version : integer
+        catalog version the snapshot was built against
+    """
+
+    def __init__(self, version):
+        self.version = version
+
+        self.equipment_options = MappingProxyType(
+            {record["name"]: record["id"] for record in EquipmentOption.objects.values("id", "name")}
+        )
+        self.sessions = MappingProxyType(
+            {record["id"]: record["value"] for record in Session.objects.values("id", "value")}
+        )
+        self.goals = MappingProxyType({record["id"]: record["name"] for record in Goal.objects.values("id", "name")})
+        self.injuries = MappingProxyType(
+            {record["id"]: record["name"] for record in Injury.objects.values("id", "name")}
+        )
+
+        session_lengths = defaultdict(list)
+        for record in SessionLength.objects.values().order_by("created_at", "id"):
+            key = (record["equipment_option_id"], record["goal_id"], record["total_session_length"])
+            session_lengths[key].append(MappingProxyType(record))
+        self._session_lengths = _freeze(session_lengths)
+
+        workout_flows = defaultdict(list)
+        for record in WorkoutFlow.objects.exclude(value="").values().order_by("created_at", "id"):
+            workout_flows[record["session_length_id"]].append(MappingProxyType(record))
+        self._workout_flows = _freeze(workout_flows)
+
+        program_designs = defaultdict(list)
+        for record in (
+            ProgramDesign.objects.values(
+                "id",
+                "day",
+                "session_per_week_id",
+                "sequence_flow_id",
+                "body_part_id",
+                "body_part__name",
+                "body_part_classification_id",
+                "variance_id",
+                "created_at",
+                "updated_at",
+            )
+            .order_by("created_at", "id")
+            .iterator()
+        ):
+            program_designs[(record["sequence_flow_id"], record["session_per_week_id"])].append(
+                MappingProxyType(record)
+            )
+        self._program_designs = _freeze(program_designs)
+
+        control_programs = defaultdict(list)
+        for record in (
+            ControlProgram.objects.values(
+                "id",
+                "equipment_option_id",
+                "body_part_id",
+                "body_part_classification_id",
+                "variance_id",
+                "exercise_id",
+                "exercise__name",
+                "is_two_sided",
+                "reps",
+                "weight",
+                "created_at",
+                "updated_at",
+            )
+            .order_by("created_at", "id")
+            .iterator()
+        ):
+            key = (
+                record["variance_id"],
+                record["body_part_id"],
+                record["body_part_classification_id"],
+                record["equipment_option_id"],
+            )
+            control_programs[key].append(MappingProxyType(record))
+        self._control_programs = _freeze(control_programs)
+
+        first_ever_calcs = defaultdict(list)
+        for record in FirstEverCalc.objects.values(
+            "id", "control_program_id", "type", "weight_formula_string", "reps_formula_string", "updated_at"
+        ).order_by("id"):
+            first_ever_calcs[(record["control_program_id"], record["type"])].append(MappingProxyType(record))
+        self._first_ever_calcs = _freeze(first_ever_calcs)
+
+        combinations = defaultdict(list)
+        for record in EquipmentRelation.objects.values("exercise_program_id", "equipment_combination_id").order_by(
+            "id"
+        ):
+            combinations[record["exercise_program_id"]].append(record["equipment_combination_id"])
+        self._combinations = _freeze(combinations)
+
+        equipment_groups = defaultdict(list)
+        for record in EquipmentGroup.objects.values(
+            "equipment_combination_id", "equipment_id", "equipment__name"
+        ).order_by("id"):
+            equipment_groups[record["equipment_combination_id"]].append(
+                MappingProxyType({"id": record["equipment_id"], "name": record["equipment__name"]})
+            )
+        self._equipment_groups = _freeze(equipment_groups)
+
+        # each Equipment id gets one bit, a combination is the OR of its equipments' bits
+        self._equipment_bits = {}
+        combination_masks = defaultdict(int)
+        for combination_id, equipments in self._equipment_groups.items():
+            for equipment in equipments:
+                bit = self._equipment_bits.setdefault(equipment["id"], 1 << len(self._equipment_bits))
+                combination_masks[combination_id] |= bit
+        self._combination_masks = MappingProxyType(
+            {
+                control_program_id: tuple(
+                    (combination_id, combination_masks[combination_id]) for combination_id in combination_ids
+                )
+                for control_program_id, combination_ids in self._combinations.items()
+            }
+        )
+
+        videos = defaultdict(list)
+        for record in Video.objects.values("control_program_id", "url").order_by("id"):
+            videos[record["control_program_id"]].append(record["url"])
+        self._videos = _freeze(videos)
+
+        program_injuries = defaultdict(set)
+        injury_programs = defaultdict(set)
+        for record in ControlProgramInjury.objects.values("control_program_id", "injury_id"):
+            program_injuries[record["control_program_id"]].add(record["injury_id"])
+            injury_programs[record["injury_id"]].add(record["control_program_id"])
+        self._program_injuries = MappingProxyType(
+            {key: frozenset(injuries) for key, injuries in program_injuries.items()}
+        )
+        # inverted index, Injury id to the control programs excluded for it
+        self._injury_programs = MappingProxyType(
+            {key: frozenset(control_programs) for key, control_programs in injury_programs.items()}
+        )
+
+        logger.info(f"Catalog snapshot built for version {version}")
+
+    def session_lengths(self, equipment_option, goal, total_session_length):
+        key = (int(equipment_option), int(goal), Decimal(str(total_session_length)))
+        return self._session_lengths.get(key, ())
+
+    def workout_flows(self, session_length_id):
+        return self._workout_flows.get(session_length_id, ())
+
+    def program_designs(self, workout_flow_id, session_per_week):
+        return self._program_designs.get((workout_flow_id, int(session_per_week)), ())
+
+    def control_programs(self, variance, body_part, body_part_classification, equipment_options):
+        """Return control programs for a program design, ordered by creation date across all equipment options."""
+        control_programs = []
+        for equipment_option in equipment_options:
+            control_programs.extend(
+                self._control_programs.get((variance, body_part, body_part_classification, equipment_option), ())
+            )
+        return sorted(control_programs, key=_order_key)
+
+    def first_ever_calc(self, control_program_id, formula_type):
+        first_ever_calcs = self._first_ever_calcs.get((control_program_id, formula_type), ())
+        return first_ever_calcs[0] if first_ever_calcs else None
+
+    def equipment_combinations(self, control_program_id):
+        return self._combinations.get(control_program_id, ())
+
+    def combination_equipments(self, equipment_combination_id):
+        return self._equipment_groups.get(equipment_combination_id, ())
+
+    def equipment_mask(self, equipment_ids):
+        """Return the bitmask of the given Equipment ids, ids not used by any combination are ignored."""
+        mask = 0
+        for equipment_id in equipment_ids:
+            mask |= self._equipment_bits.get(equipment_id, 0)
+        return mask
+
+    def matching_combination(self, control_program_id, equipment_mask):
+        """Return the first combination of the control program covered by the equipment mask, None otherwise."""
+        for combination_id, combination_mask in self._combination_masks.get(control_program_id, ()):
+            if combination_mask & ~equipment_mask == 0:
+                return combination_id
+        return None
+
+    def videos(self, control_program_id):
+        return self._videos.get(control_program_id, ())
+
+    def program_injuries(self, control_program_id):
+        return self._program_injuries.get(control_program_id, frozenset())
+
+    def excluded_control_programs(self, injury_ids):
+        """Return the ids of every control program excluded for at least one of the given Injury ids."""
+        excluded = set()
+        for injury_id in injury_ids:
+            excluded.update(self._injury_programs.get(injury_id, ()))
+        return frozenset(excluded)
+
+
+def get_catalog():
+    """Public Method
+
+    The method returns the catalog snapshot for the current catalog version, rebuilding it only when an
+    admin write has bumped the version since the last build.
+
+    Returns
+    -------
+    apps.controlled.catalog.CatalogSnapshot
+    """
+    global _snapshot
+
+    version = get_cache_version(CATALOG_VERSION_KEY)
+    snapshot = _snapshot
+    record_cache_access(snapshot is not None and snapshot.version == version)
+    if snapshot is None or snapshot.version != version:
+        with _snapshot_lock:
+            snapshot = _snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = CatalogSnapshot(version)
+                _snapshot = snapshot
+    return snapshot
+
+
+def bump_catalog_version():
+    """Public Method
+
+    The method invalidates the catalog snapshot of every process sharing the cache.
+
+    Returns
+    -------
+    integer
+        returns the new catalog version
+    """
+    return bump_cache_version(CATALOG_VERSION_KEY)
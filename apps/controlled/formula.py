@@ -0,0 +1,264 @@
+"""Controlled formula compiler file."""
+import ast
+import threading
+from functools import reduce
+from string import Formatter
+
+import numpy as np
+
+ALLOWED_FUNCTIONS = {"abs": abs, "max": max, "min": min, "round": round}
+VECTORIZED_FUNCTIONS = {
+    "abs": np.abs,
+    "max": lambda *args: reduce(np.maximum, args),
+    "min": lambda *args: reduce(np.minimum, args),
+    "round": np.round,
+}
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+# ** only takes a constant exponent up to this size and a base without another **, so no formula can grow a
+# number large enough to stall the worker evaluating it
+MAX_EXPONENT = 4
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+class FormulaError(ValueError):
+    """FormulaError class
+
+    Raised when a formula string uses syntax outside the supported arithmetic subset, or when a variable
+    value cannot be read as a number.
+    """
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    # str.format rendered the value into the formula text before, so parse the rendered text the same way
+    text = str(value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            raise FormulaError(f"Value `{value}` is not a number")
+
+
+def _to_number_or_nan(value):
+    try:
+        return _to_number(value)
+    except FormulaError:
+        return np.nan
+
+
+def _to_column(values, size):
+    if isinstance(values, (str, bytes)) or not hasattr(values, "__len__"):
+        return np.full(size, _to_number_or_nan(values), dtype=np.float64)
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        column = values.astype(np.float64)
+    else:
+        column = np.fromiter((_to_number_or_nan(value) for value in values), dtype=np.float64, count=len(values))
+    if column.shape != (size,):
+        raise FormulaError(f"Column holds {column.shape[0]} values, expected {size}")
+    return column
+
+
+class Formula:
+    """Formula class
+
+    A formula string such as ``{Weight} * 0.5 * {fitness_level}`` parsed once into a validated expression.
+    Placeholders become variables, and only numbers, arithmetic operators and the functions listed in
+    ``ALLOWED_FUNCTIONS`` are accepted. ``**`` is limited to a constant exponent of at most ``MAX_EXPONENT``.
+
+    Parameters
+    ----------
+    string : str
+        formula string stored on apps.controlled.models.FirstEverCalc
+    """
+
+    def __init__(self, string):
+        self.string = string
+        self.variables = []
+        source = []
+        for literal_text, field_name, _, _ in Formatter().parse(string):
+            source.append(literal_text)
+            if field_name is not None:
+                if field_name not in self.variables:
+                    self.variables.append(field_name)
+                source.append(f" _v{self.variables.index(field_name)} ")
+        self._names = {f"_v{index}": name for index, name in enumerate(self.variables)}
+
+        try:
+            tree = ast.parse("".join(source).strip(), mode="eval")
+        except SyntaxError as e:
+            raise FormulaError(f"Invalid formula `{string}`: {e.msg}")
+        for node in ast.walk(tree):
+            self.__validate_node(node)
+        self._code = compile(tree, "<formula>", "eval")
+
+    def __validate_node(self, node):
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            self.__validate_power(node)
+        if isinstance(node, (ast.Expression, ast.Load, ast.BinOp, ast.UnaryOp)):
+            return
+        if isinstance(node, _BINARY_OPERATORS + _UNARY_OPERATORS):
+            return
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return
+        if isinstance(node, ast.Name) and (node.id in self._names or node.id in ALLOWED_FUNCTIONS):
+            return
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            if node.func.id in ALLOWED_FUNCTIONS:
+                return
+        raise FormulaError(f"Unsupported expression `{type(node).__name__}` in formula `{self.string}`")
+
+    def __validate_power(self, node):
+        exponent = node.right
+        if isinstance(exponent, ast.UnaryOp) and isinstance(exponent.op, _UNARY_OPERATORS):
+            exponent = exponent.operand
+        if not (
+            isinstance(exponent, ast.Constant)
+            and type(exponent.value) in (int, float)
+            and abs(exponent.value) <= MAX_EXPONENT
+        ):
+            raise FormulaError(
+                f"Exponents must be numbers between -{MAX_EXPONENT} and {MAX_EXPONENT} in formula `{self.string}`"
+            )
+        if any(isinstance(child, ast.BinOp) and isinstance(child.op, ast.Pow) for child in ast.walk(node.left)):
+            raise FormulaError(f"Nested exponents are not supported in formula `{self.string}`")
+
+    def __namespace(self, variables):
+        namespace = {}
+        for alias, name in self._names.items():
+            if name not in variables:
+                raise FormulaError(f"Variable `{name}` is missing for formula `{self.string}`")
+            namespace[alias] = _to_number(variables[name])
+        return namespace
+
+    def evaluate(self, variables):
+        """Public Method
+
+        The method evaluates the formula against a mapping of variable name to value.
+
+        Parameters
+        ----------
+        variables : dict
+
+        Returns
+        -------
+        integer or float
+        """
+        return eval(self._code, {"__builtins__": ALLOWED_FUNCTIONS}, self.__namespace(variables))
+
+    def evaluate_many(self, variables_list):
+        """Public Method
+
+        The method evaluates the formula once per mapping, e.g. for the variables of many users at once.
+
+        Parameters
+        ----------
+        variables_list : iterable of dict
+
+        Returns
+        -------
+        list
+            returns one result per mapping, in the same order
+        """
+        code = self._code
+        builtins = {"__builtins__": ALLOWED_FUNCTIONS}
+        return [eval(code, builtins, self.__namespace(variables)) for variables in variables_list]
+
+    def evaluate_columns(self, columns, size):
+        """Public Method
+
+        The method evaluates the formula for ``size`` rows in a single vectorized pass. Every variable is
+        given as a column holding one value per row, or as a scalar shared by all rows. Values that are not
+        numbers, and rows the formula can't be evaluated for (division by zero, overflow, ...), give NaN or
+        infinity instead of raising.
+
+        Parameters
+        ----------
+        columns : dict
+            variable name to sequence of values (or a single value)
+        size : integer
+            number of rows
+
+        Returns
+        -------
+        numpy.ndarray
+            returns a float64 array with one result per row
+        """
+        namespace = {}
+        for alias, name in self._names.items():
+            if name not in columns:
+                raise FormulaError(f"Variable `{name}` is missing for formula `{self.string}`")
+            namespace[alias] = _to_column(columns[name], size)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            result = eval(self._code, {"__builtins__": VECTORIZED_FUNCTIONS}, namespace)
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), (size,)).copy()
+
+
+def compile_first_ever_calc(first_ever, field):
+    """Public Method
+
+    The method returns one compiled formula of a FirstEverCalc row. Compiled formulas are cached by record
+    id and reused until the record's updated_at changes.
+
+    Parameters
+    ----------
+    first_ever : dict
+        FirstEverCalc row holding id, updated_at and the formula strings
+    field : str
+        weight_formula_string or reps_formula_string
+
+    Returns
+    -------
+    apps.controlled.formula.Formula
+    """
+    key = (first_ever["id"], field)
+    cached = _compiled.get(key)
+    if cached is None or cached[0] != first_ever["updated_at"]:
+        cached = (first_ever["updated_at"], Formula(first_ever[field]))
+        with _compiled_lock:
+            _compiled[key] = cached
+    return cached[1]
+
+
+def evaluate_first_ever_calc_batch(first_ever, columns, size, skip_weight=False):
+    """Public Method
+
+    The method calculates weight and reps of a FirstEverCalc row for many users at once, mirroring the
+    per-user calculation: results are truncated to integers, and rows whose formula cannot be evaluated
+    (division by zero, missing answer, ...) are reported as invalid instead of failing the whole batch.
+
+    Parameters
+    ----------
+    first_ever : dict
+        FirstEverCalc row holding id, updated_at and the formula strings
+    columns : dict
+        variable name to one value per user, e.g. Weight, fitness_level and baseline answers
+    size : integer
+        number of users
+    skip_weight : boolean
+        weight is not calculated for equipment option None
+
+    Returns
+    -------
+    tuple
+        returns the weights, reps and valid arrays, each holding one entry per user
+    """
+    valid = np.ones(size, dtype=bool)
+    results = []
+    for field, skip in (("weight_formula_string", skip_weight), ("reps_formula_string", False)):
+        if skip:
+            results.append(np.zeros(size, dtype=np.int64))
+            continue
+        values = compile_first_ever_calc(first_ever, field).evaluate_columns(columns, size)
+        finite = np.isfinite(values)
+        valid &= finite
+        results.append(np.trunc(np.where(finite, values, 0)).astype(np.int64))
+    return results[0], results[1], valid
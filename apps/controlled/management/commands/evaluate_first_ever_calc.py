@@ -0,0 +1,98 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.controlled.formula import FormulaError, compile_first_ever_calc, evaluate_first_ever_calc_batch
+from apps.controlled.models import FirstEverCalc
+from apps.mobile_api.v1.models import UserProfile
+from apps.mobile_api.v1.views import fetch_formula_columns
+
+
+class Command(BaseCommand):
+    help = (
+        "Calculate the first-ever weight and reps of FirstEverCalc formulas for many users in one vectorized pass "
+        "per formula and batch, e.g. to review a formula change against the existing users before their programs "
+        "are regenerated. Writes one CSV row per formula and user"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--first-ever-calc", type=int, nargs="*", default=[], help="FirstEverCalc ids")
+        parser.add_argument("--control-program", type=int, nargs="*", default=[], help="Control program ids")
+        parser.add_argument("--type", choices=[choice for choice, _ in FirstEverCalc.FORMULA_CHOICES])
+        parser.add_argument("--users", type=int, nargs="*", default=[], help="User profile ids, all by default")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Users evaluated per pass")
+
+    def __first_ever_calcs(self, options):
+        first_ever_calcs = FirstEverCalc.objects.order_by("id")
+        if options["first_ever_calc"]:
+            first_ever_calcs = first_ever_calcs.filter(id__in=options["first_ever_calc"])
+        if options["control_program"]:
+            first_ever_calcs = first_ever_calcs.filter(control_program__in=options["control_program"])
+        if options["type"]:
+            first_ever_calcs = first_ever_calcs.filter(type=options["type"])
+        first_ever_calcs = list(
+            first_ever_calcs.values(
+                "id",
+                "updated_at",
+                "type",
+                "control_program_id",
+                "weight_formula_string",
+                "reps_formula_string",
+                "control_program__equipment_option__name",
+            )
+        )
+        if not first_ever_calcs:
+            raise CommandError("No FirstEverCalc formula matches the given filters")
+        return first_ever_calcs
+
+    def __user_profile_batches(self, user_profile_ids, batch_size):
+        user_profiles = UserProfile.objects.order_by("id").values_list("id", flat=True)
+        if user_profile_ids:
+            user_profiles = user_profiles.filter(id__in=user_profile_ids)
+        user_profile_ids = list(user_profiles)
+        for start in range(0, len(user_profile_ids), batch_size):
+            yield user_profile_ids[start : start + batch_size]
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        first_ever_calcs = self.__first_ever_calcs(options)
+        writer = csv.writer(self.stdout, lineterminator="\n")
+        writer.writerow(["first_ever_calc", "control_program", "type", "user_profile", "weight", "reps", "valid"])
+        rows = invalid = 0
+        for batch in self.__user_profile_batches(options["users"], options["batch_size"]):
+            for first_ever in first_ever_calcs:
+                # the same skip as the per-user calculation, equipment option None has no weight
+                skip_weight = first_ever["control_program__equipment_option__name"] == "None"
+                try:
+                    variables = (
+                        [] if skip_weight else compile_first_ever_calc(first_ever, "weight_formula_string").variables
+                    )
+                    variables += compile_first_ever_calc(first_ever, "reps_formula_string").variables
+                except FormulaError as e:
+                    self.stderr.write(f"Skipping FirstEverCalc {first_ever['id']}: {e}")
+                    continue
+                user_profile_ids, columns = fetch_formula_columns(
+                    batch, first_ever["type"], list(dict.fromkeys(variables))
+                )
+                weights, reps, valid = evaluate_first_ever_calc_batch(
+                    first_ever, columns, len(user_profile_ids), skip_weight=skip_weight
+                )
+                for index, user_profile_id in enumerate(user_profile_ids):
+                    writer.writerow(
+                        [
+                            first_ever["id"],
+                            first_ever["control_program_id"],
+                            first_ever["type"],
+                            user_profile_id,
+                            weights[index],
+                            reps[index],
+                            int(valid[index]),
+                        ]
+                    )
+                rows += len(user_profile_ids)
+                invalid += len(user_profile_ids) - int(valid.sum())
+        self.stderr.write(
+            f"Evaluated {len(first_ever_calcs)} formulas into {rows} rows, {invalid} invalid, in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
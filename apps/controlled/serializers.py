@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from django.db.models import Prefetch
+
+from apps.body_part.models import BodyPart
 from apps.body_part.serializers import BodyPartSerializer
 from apps.controlled.models import (
     ControlProgram,
@@ -26,7 +29,71 @@ class WorkoutFlowSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+def build_program_designs(session_length_ids):
+    """Public Method
+
+    The method builds the nested program_designs tree of every given session length from one ProgramDesign
+    query, days in ascending order and the workout flows of a day in insertion order.
+
+    Parameters
+    ----------
+    session_length_ids : list
+
+    Returns
+    -------
+    dict
+        returns session length id to its list of program designs grouped by day
+    """
+    trees = {session_length_id: {} for session_length_id in session_length_ids}
+    program_designs = (
+        ProgramDesign.objects.filter(sequence_flow__session_length__in=session_length_ids)
+        .values(
+            "id",
+            "day",
+            "session_per_week_id",
+            "sequence_flow_id",
+            "sequence_flow__name",
+            "sequence_flow__value",
+            "sequence_flow__session_length_id",
+            "body_part_id",
+            "body_part_classification_id",
+            "variance_id",
+        )
+        .order_by("day", "id")
+    )
+    for program_design in program_designs:
+        days = trees[program_design["sequence_flow__session_length_id"]]
+        if program_design["day"] not in days:
+            days[program_design["day"]] = {
+                "day": program_design["day"],
+                "session_per_week": program_design["session_per_week_id"],
+                "workout_flows": [],
+            }
+        PD_response_object = days[program_design["day"]]
+        PD_response_object["session_per_week"] = program_design["session_per_week_id"]
+        workout = {}
+        workout["program_design_id"] = program_design["id"]
+        workout["workout_flow_id"] = program_design["sequence_flow_id"]
+        workout["name"] = program_design["sequence_flow__name"]
+        if program_design["sequence_flow__value"] != "":
+            workout["value"] = program_design["sequence_flow__value"]
+        if program_design["body_part_id"] is not None:
+            workout["body_part"] = program_design["body_part_id"]
+        if program_design["body_part_classification_id"] is not None:
+            workout["body_part_classification"] = program_design["body_part_classification_id"]
+        if program_design["variance_id"] is not None:
+            workout["variance"] = program_design["variance_id"]
+        PD_response_object["workout_flows"].append(workout)
+    return {session_length_id: list(days.values()) for session_length_id, days in trees.items()}
+
+
 class SessionLengthSerializer(serializers.ModelSerializer):
+    """Serializer class for model SessionLength
+
+    The program_designs tree is read from context["program_designs"] when the view built it for the whole
+    page with build_program_designs, otherwise it is built for the single instance.
+    """
+
     class Meta:
         model = SessionLength
         fields = "__all__"
@@ -35,33 +102,10 @@ class SessionLengthSerializer(serializers.ModelSerializer):
         response = super().to_representation(instance)
         response["goal"] = GoalSerializer(instance.goal).data
         response["equipment_option"] = EquipmentOptionSerializer(instance.equipment_option).data
-        program_designs = []
-        PD_objects = ProgramDesign.objects.filter(sequence_flow__session_length__id=instance.id)
-        PD_objects_distinct = PD_objects.values("day").distinct()
-        for data in PD_objects_distinct:
-            day = data["day"]
-            PD_response_object = {}
-            PD_response_object["day"] = day
-            workout_flows = []
-            for PD in PD_objects.filter(day=day):
-                PD_response_object["session_per_week"] = PD.session_per_week.id
-                workout = {}
-                workout["program_design_id"] = PD.id
-                workout["workout_flow_id"] = PD.sequence_flow_id
-                workout["name"] = PD.sequence_flow.name
-                if PD.sequence_flow.value != "":
-                    workout["value"] = PD.sequence_flow.value
-                if PD.body_part is not None:
-                    workout["body_part"] = PD.body_part.id
-                if PD.body_part_classification is not None:
-                    workout["body_part_classification"] = PD.body_part_classification.id
-                if PD.variance is not None:
-                    workout["variance"] = PD.variance.id
-                workout_flows.append(workout)
-
-            PD_response_object["workout_flows"] = workout_flows
-            program_designs.append(PD_response_object)
-        response["program_designs"] = program_designs
+        program_designs = self.context.get("program_designs")
+        if program_designs is None or instance.id not in program_designs:
+            program_designs = build_program_designs([instance.id])
+        response["program_designs"] = program_designs[instance.id]
         return response
 
 
@@ -145,6 +189,27 @@ class ControlProgramSerializer(serializers.ModelSerializer):
         model = ControlProgram
         fields = "__all__"
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation to_representation reads, so a page costs a fixed number of queries
+
+        Parameters
+        ----------
+        queryset : django.db.models.QuerySet
+            ControlProgram queryset
+
+        Returns
+        -------
+        django.db.models.QuerySet
+        """
+        return queryset.select_related(
+            "equipment_option", "body_part", "body_part_classification", "variance", "exercise"
+        ).prefetch_related(
+            Prefetch("body_part__classifications", queryset=BodyPart.objects.all()),
+            Prefetch("body_part_classification__classifications", queryset=BodyPart.objects.all()),
+            Prefetch("cp_injuries", queryset=ControlProgramInjury.objects.select_related("injury", "injury_type")),
+        )
+
     def to_representation(self, instance):
         response = super().to_representation(instance)
         response["body_part_classification"] = None
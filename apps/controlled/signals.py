@@ -0,0 +1,58 @@
+"""Controlled signals file."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.body_part.models import BodyPart
+from apps.controlled.catalog import bump_catalog_version
+from apps.controlled.models import (
+    ControlProgram,
+    ControlProgramInjury,
+    EquipmentCombination,
+    EquipmentGroup,
+    EquipmentRelation,
+    Exercise,
+    FirstEverCalc,
+    ProgramDesign,
+    SessionLength,
+    Video,
+    WorkoutFlow,
+)
+from apps.equipment.models import Equipment, EquipmentOption
+from apps.etag import track_table_versions
+from apps.goal.models import Goal
+from apps.injury.models import Injury
+from apps.session.models import Session
+
+# every model the catalog snapshot reads from
+CATALOG_MODELS = (
+    SessionLength,
+    WorkoutFlow,
+    ProgramDesign,
+    Exercise,
+    ControlProgram,
+    ControlProgramInjury,
+    FirstEverCalc,
+    Video,
+    EquipmentCombination,
+    EquipmentRelation,
+    EquipmentGroup,
+    Equipment,
+    EquipmentOption,
+    BodyPart,
+    Goal,
+    Injury,
+    Session,
+)
+
+
+def invalidate_catalog(sender, **kwargs):
+    # bump after commit so no process can rebuild the snapshot from uncommitted rows
+    transaction.on_commit(bump_catalog_version)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog, sender=model, dispatch_uid=f"invalidate_catalog_save_{model.__name__}")
+    post_delete.connect(invalidate_catalog, sender=model, dispatch_uid=f"invalidate_catalog_delete_{model.__name__}")
+
+# the mobile goals listing is built from SessionLength rows
+track_table_versions(SessionLength)
@@ -0,0 +1,148 @@
+from django.test import TestCase
+
+from apps.benchmarks.seed import seed_catalog
+from apps.controlled.catalog import get_catalog
+from apps.controlled.models import ControlProgram, ControlProgramInjury, EquipmentGroup, EquipmentRelation, Exercise
+from apps.equipment.models import Equipment
+from apps.injury.models import Injury
+from apps.testing import CacheVersionsMixin
+
+
+class CatalogSnapshotVersionTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+
+    def add_control_program(self):
+        control_program = ControlProgram.objects.order_by("id").first()
+        control_program.pk = None
+        control_program.exercise = Exercise.objects.create(name="Catalog test exercise")
+        control_program.save()
+        return control_program
+
+    def test_snapshot_is_reused_without_queries(self):
+        snapshot = get_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), snapshot)
+
+    def test_snapshot_is_kept_until_the_write_commits(self):
+        snapshot = get_catalog()
+        with self.captureOnCommitCallbacks() as callbacks:
+            control_program = self.add_control_program()
+        self.assertTrue(callbacks)
+        self.assertIs(get_catalog(), snapshot)
+        self.assertEqual(snapshot.videos(control_program.id), ())
+
+    def test_snapshot_is_rebuilt_after_a_committed_write(self):
+        snapshot = get_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            control_program = self.add_control_program()
+        rebuilt = get_catalog()
+        self.assertIsNot(rebuilt, snapshot)
+        self.assertGreater(rebuilt.version, snapshot.version)
+        self.assertIn(
+            control_program.id,
+            [
+                record["id"]
+                for record in rebuilt.control_programs(
+                    control_program.variance_id,
+                    control_program.body_part_id,
+                    control_program.body_part_classification_id,
+                    [control_program.equipment_option_id],
+                )
+            ],
+        )
+
+    def test_deletes_invalidate_the_snapshot(self):
+        snapshot = get_catalog()
+        exercise = Exercise.objects.order_by("id").first()
+        with self.captureOnCommitCallbacks(execute=True):
+            exercise.delete()
+        self.assertNotIn(
+            exercise.name,
+            {record["exercise__name"] for records in get_catalog()._control_programs.values() for record in records},
+        )
+        self.assertIsNot(get_catalog(), snapshot)
+
+    def equipment_names(self, snapshot, equipment_combination_id):
+        return {equipment["name"] for equipment in snapshot.combination_equipments(equipment_combination_id)}
+
+    def test_equipment_renames_invalidate_the_snapshot(self):
+        group = EquipmentGroup.objects.select_related("equipment").order_by("id").first()
+        snapshot = get_catalog()
+        self.assertIn(group.equipment.name, self.equipment_names(snapshot, group.equipment_combination_id))
+        with self.captureOnCommitCallbacks(execute=True):
+            group.equipment.name = "Catalog test kettlebell"
+            group.equipment.save()
+        rebuilt = get_catalog()
+        self.assertIsNot(rebuilt, snapshot)
+        self.assertIn("Catalog test kettlebell", self.equipment_names(rebuilt, group.equipment_combination_id))
+
+
+class CatalogEquipmentTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+
+    def combinations(self):
+        """Return control program id to its combinations' Equipment id sets, in relation order."""
+        equipments = {}
+        for group in EquipmentGroup.objects.all():
+            equipments.setdefault(group.equipment_combination_id, set()).add(group.equipment_id)
+        combinations = {}
+        for relation in EquipmentRelation.objects.order_by("id"):
+            combinations.setdefault(relation.exercise_program_id, []).append(
+                (relation.equipment_combination_id, equipments.get(relation.equipment_combination_id, set()))
+            )
+        return combinations
+
+    def equipment_sets(self):
+        equipment_ids = list(Equipment.objects.order_by("id").values_list("id", flat=True))
+        return [set(), set(equipment_ids), set(equipment_ids[:1]), set(equipment_ids[::2]), set(equipment_ids[1:])]
+
+    def test_matching_combination_is_the_first_covered_combination(self):
+        catalog = get_catalog()
+        combinations = self.combinations()
+        self.assertTrue(combinations)
+        for equipment_ids in self.equipment_sets():
+            equipment_mask = catalog.equipment_mask(equipment_ids)
+            for control_program_id in ControlProgram.objects.values_list("id", flat=True):
+                expected = next(
+                    (
+                        combination_id
+                        for combination_id, required in combinations.get(control_program_id, ())
+                        if required <= equipment_ids
+                    ),
+                    None,
+                )
+                self.assertEqual(catalog.matching_combination(control_program_id, equipment_mask), expected)
+
+    def test_unused_equipment_is_ignored(self):
+        catalog = get_catalog()
+        unused = Equipment.objects.create(name="Catalog test rower")
+        self.assertEqual(catalog.equipment_mask([unused.id]), 0)
+        self.assertIsNone(catalog.matching_combination(next(iter(self.combinations())), 0))
+
+
+class CatalogInjuryTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+
+    def test_excluded_control_programs_match_the_injury_rows(self):
+        catalog = get_catalog()
+        injury_ids = list(Injury.objects.order_by("id").values_list("id", flat=True))
+        self.assertTrue(ControlProgramInjury.objects.exists())
+        for selected in ([], injury_ids[:1], injury_ids[1:], injury_ids):
+            expected = set(
+                ControlProgramInjury.objects.filter(injury__in=selected).values_list("control_program", flat=True)
+            )
+            self.assertEqual(catalog.excluded_control_programs(selected), expected)
+
+    def test_program_injuries(self):
+        catalog = get_catalog()
+        for control_program_injury in ControlProgramInjury.objects.all():
+            self.assertIn(
+                control_program_injury.injury_id, catalog.program_injuries(control_program_injury.control_program_id)
+            )
+        self.assertEqual(catalog.program_injuries(0), frozenset())
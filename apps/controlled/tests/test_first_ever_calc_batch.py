@@ -0,0 +1,133 @@
+import csv
+import io
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.benchmarks.seed import seed_catalog, seed_users
+from apps.controlled.catalog import bump_catalog_version
+from apps.controlled.formula import compile_first_ever_calc, evaluate_first_ever_calc_batch
+from apps.controlled.models import FirstEverCalc
+from apps.mobile_api.v1.models import UserProfile, UserStandardVariable
+from apps.mobile_api.v1.views import fetch_formula_columns
+from apps.testing import CacheVersionsMixin
+
+FIRST_EVER_FIELDS = (
+    "id",
+    "updated_at",
+    "type",
+    "control_program_id",
+    "weight_formula_string",
+    "reps_formula_string",
+    "control_program__equipment_option__name",
+)
+
+
+def evaluate_per_user(first_ever, user_profile, field):
+    """Return the int result of one formula for one user the way UserWorkoutProgramsView calculates it, or None."""
+    standard_variables = {
+        variable.standard_variable_id.name: variable.value
+        for variable in UserStandardVariable.objects.filter(user_profile=user_profile).select_related(
+            "standard_variable_id"
+        )
+    }
+    formula = compile_first_ever_calc(first_ever, field)
+    try:
+        if first_ever["type"] == "FSC":
+            if field == "reps_formula_string" and first_ever[field].isdigit():
+                return int(first_ever[field])
+            if "Weight" not in standard_variables:
+                return None
+            variables = {
+                "Weight": standard_variables["Weight"],
+                "fitness_level": user_profile.fitness_level.fitness_level,
+            }
+        else:
+            variables = {name: standard_variables.get(name, 0) for name in formula.variables}
+            for json in user_profile.baseline_assessment:
+                if json["question"] in variables:
+                    variables[json["question"]] = json["value"]
+        return int(formula.evaluate(variables))
+    except Exception:
+        return None
+
+
+class FirstEverCalcBatchTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+        bump_catalog_version()
+        user_profile_ids = seed_users(12, weeks=1)
+        # profiles the per-user calculation fails on: no Weight, no baseline answers, a non-numeric answer and
+        # no fitness level
+        UserStandardVariable.objects.filter(
+            user_profile=user_profile_ids[0], standard_variable_id__name="Weight"
+        ).delete()
+        UserProfile.objects.filter(id=user_profile_ids[1]).update(baseline_assessment=None)
+        user_profile = UserProfile.objects.get(id=user_profile_ids[2])
+        user_profile.baseline_assessment[0]["value"] = "many"
+        user_profile.save(update_fields=["baseline_assessment"])
+        UserProfile.objects.filter(id=user_profile_ids[3]).update(fitness_level=None)
+        UserStandardVariable.objects.filter(
+            user_profile=user_profile_ids[4], standard_variable_id__name="Weight"
+        ).update(value="0")
+        cls.user_profile_ids = user_profile_ids
+
+    def first_ever_calcs(self):
+        return list(FirstEverCalc.objects.order_by("id").values(*FIRST_EVER_FIELDS))
+
+    def test_batch_matches_the_per_user_calculation(self):
+        first_ever_calcs = self.first_ever_calcs()
+        self.assertEqual({first_ever["type"] for first_ever in first_ever_calcs}, {"Baseline", "FSC"})
+        user_profiles = list(UserProfile.objects.filter(id__in=self.user_profile_ids).order_by("id"))
+        for first_ever in first_ever_calcs:
+            variables = compile_first_ever_calc(first_ever, "weight_formula_string").variables
+            variables += compile_first_ever_calc(first_ever, "reps_formula_string").variables
+            user_profile_ids, columns = fetch_formula_columns(
+                self.user_profile_ids, first_ever["type"], list(dict.fromkeys(variables))
+            )
+            self.assertEqual(user_profile_ids, [user_profile.id for user_profile in user_profiles])
+            weights, reps, valid = evaluate_first_ever_calc_batch(first_ever, columns, len(user_profile_ids))
+            for index, user_profile in enumerate(user_profiles):
+                with self.subTest(first_ever_calc=first_ever["id"], user_profile=user_profile.id):
+                    weight = evaluate_per_user(first_ever, user_profile, "weight_formula_string")
+                    rep = evaluate_per_user(first_ever, user_profile, "reps_formula_string")
+                    self.assertEqual(bool(valid[index]), weight is not None and rep is not None)
+                    if valid[index]:
+                        self.assertEqual((weights[index], reps[index]), (weight, rep))
+
+    def test_command_writes_one_row_per_formula_and_user(self):
+        first_ever_calcs = self.first_ever_calcs()[:3]
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command(
+            "evaluate_first_ever_calc",
+            "--first-ever-calc",
+            *[str(first_ever["id"]) for first_ever in first_ever_calcs],
+            "--users",
+            *[str(user_profile_id) for user_profile_id in self.user_profile_ids],
+            "--batch-size",
+            "5",
+            stdout=stdout,
+            stderr=stderr,
+        )
+        rows = list(csv.DictReader(io.StringIO(stdout.getvalue())))
+        self.assertEqual(len(rows), len(first_ever_calcs) * len(self.user_profile_ids))
+        self.assertIn(f"Evaluated {len(first_ever_calcs)} formulas into {len(rows)} rows", stderr.getvalue())
+        user_profiles = {user_profile.id: user_profile for user_profile in UserProfile.objects.all()}
+        first_ever_calcs = {first_ever["id"]: first_ever for first_ever in first_ever_calcs}
+        for row in rows:
+            first_ever = first_ever_calcs[int(row["first_ever_calc"])]
+            user_profile = user_profiles[int(row["user_profile"])]
+            self.assertEqual(int(row["control_program"]), first_ever["control_program_id"])
+            rep = evaluate_per_user(first_ever, user_profile, "reps_formula_string")
+            self.assertEqual(row["valid"], "1" if rep is not None else "0")
+            if rep is not None:
+                self.assertEqual(int(row["reps"]), rep)
+
+    def test_command_requires_a_matching_formula(self):
+        with self.assertRaises(CommandError):
+            call_command("evaluate_first_ever_calc", "--control-program", "0", stdout=io.StringIO())
+
+    def test_fsc_users_without_weight_are_invalid_for_any_formula(self):
+        _, columns = fetch_formula_columns(self.user_profile_ids[:5], "FSC", ["fitness_level"])
+        self.assertEqual([value is None for value in columns["fitness_level"]], [True, False, False, True, False])
@@ -0,0 +1,153 @@
+import numpy as np
+
+from django.test import SimpleTestCase
+
+from apps.controlled.formula import (
+    MAX_EXPONENT,
+    Formula,
+    FormulaError,
+    compile_first_ever_calc,
+    evaluate_first_ever_calc_batch,
+)
+
+
+class FormulaTest(SimpleTestCase):
+    def test_evaluates_placeholders(self):
+        formula = Formula("{Weight}*0.5*{fitness_level}/40")
+        self.assertEqual(formula.variables, ["Weight", "fitness_level"])
+        self.assertEqual(formula.evaluate({"Weight": "80", "fitness_level": 40}), 40.0)
+
+    def test_evaluates_allowed_functions(self):
+        self.assertEqual(Formula("max({a}, 3) + round(2.6) + abs(-1) + min(4, 5)").evaluate({"a": 1}), 11)
+
+    def test_rejects_unsupported_nodes(self):
+        for string in (
+            "__import__('os')",
+            "open('/etc/passwd')",
+            "{Weight}.real",
+            "[1, 2][0]",
+            "(lambda: 1)()",
+            "{Weight} if 1 else 2",
+            "{Weight} > 1",
+            "1 and 2",
+            "'a' * 3",
+            "max(1, key=abs)",
+            "x + 1",
+            "{Weight} << 2",
+        ):
+            with self.subTest(string=string):
+                with self.assertRaises(FormulaError):
+                    Formula(string)
+
+    def test_rejects_invalid_syntax(self):
+        with self.assertRaises(FormulaError):
+            Formula("{Weight} *")
+
+    def test_allows_small_constant_exponents(self):
+        self.assertEqual(Formula("{a}**2").evaluate({"a": 3}), 9)
+        self.assertEqual(Formula(f"2**-{MAX_EXPONENT}").evaluate({}), 2 ** -MAX_EXPONENT)
+
+    def test_rejects_unbounded_exponents(self):
+        for string in (
+            "9**9**9",
+            f"2**{MAX_EXPONENT + 1}",
+            "2**{a}",
+            "2**(1+1)",
+            "(2**4)**4",
+            "2**4.5",
+        ):
+            with self.subTest(string=string):
+                with self.assertRaises(FormulaError):
+                    Formula(string)
+
+    def test_missing_variable(self):
+        with self.assertRaises(FormulaError):
+            Formula("{Weight}*2").evaluate({})
+
+    def test_non_numeric_variable(self):
+        with self.assertRaises(FormulaError):
+            Formula("{Weight}*2").evaluate({"Weight": "heavy"})
+
+    def test_evaluate_many_matches_evaluate(self):
+        formula = Formula("max({Weight}*0.5*{fitness_level}/40, 2.5) // 2.5 * 2.5")
+        variables_list = [
+            {"Weight": "80", "fitness_level": 40},
+            {"Weight": 62.5, "fitness_level": "20"},
+            {"Weight": 0, "fitness_level": 10},
+            {"Weight": True, "fitness_level": 1},
+        ]
+        self.assertEqual(
+            formula.evaluate_many(variables_list), [formula.evaluate(variables) for variables in variables_list]
+        )
+        self.assertEqual(formula.evaluate_many(iter(variables_list[:1])), [40.0])
+        self.assertEqual(formula.evaluate_many([]), [])
+
+    def test_evaluate_many_fails_on_the_first_invalid_mapping(self):
+        with self.assertRaises(FormulaError):
+            Formula("{Weight}*2").evaluate_many([{"Weight": 1}, {}])
+        with self.assertRaises(ZeroDivisionError):
+            Formula("1/{Weight}").evaluate_many([{"Weight": 1}, {"Weight": 0}])
+
+    def test_evaluate_columns_matches_evaluate(self):
+        for string in (
+            "{Weight}*0.5*{fitness_level}/40",
+            "max({Weight}, 70) // 3 + min(2, {fitness_level}) % 7",
+            "round({Weight}/7) - abs(-{fitness_level})",
+            "{Weight}**2 / 100 - {fitness_level}**-1",
+        ):
+            formula = Formula(string)
+            rows = [{"Weight": weight, "fitness_level": level} for weight in (55, "72.5", 110) for level in (20, "40")]
+            columns = {name: [row[name] for row in rows] for name in formula.variables}
+            with self.subTest(string=string):
+                self.assertEqual(
+                    list(formula.evaluate_columns(columns, len(rows))),
+                    formula.evaluate_many(rows),
+                )
+
+    def test_evaluate_columns_reports_failures_as_non_finite(self):
+        values = Formula("{Weight}/{reps}").evaluate_columns(
+            {"Weight": [10, 10, "heavy", None], "reps": [2, 0, 1, 1]}, 4
+        )
+        self.assertEqual(values[0], 5)
+        self.assertEqual(np.isfinite(values).tolist(), [True, False, False, False])
+
+    def test_evaluate_columns_broadcasts_scalars(self):
+        self.assertEqual(
+            Formula("{Weight}*{fitness_level}").evaluate_columns({"Weight": 2, "fitness_level": [1, 2]}, 2).tolist(),
+            [2, 4],
+        )
+        self.assertEqual(Formula("8").evaluate_columns({}, 3).tolist(), [8, 8, 8])
+
+    def test_evaluate_columns_checks_the_columns(self):
+        with self.assertRaises(FormulaError):
+            Formula("{Weight}*2").evaluate_columns({}, 1)
+        with self.assertRaises(FormulaError):
+            Formula("{Weight}*2").evaluate_columns({"Weight": [1, 2]}, 3)
+
+    def test_batch_truncates_like_the_per_user_int(self):
+        first_ever = {
+            "id": -2,
+            "updated_at": 1,
+            "weight_formula_string": "{Weight}*0.15",
+            "reps_formula_string": "{Weight}/-7",
+        }
+        weights, reps, valid = evaluate_first_ever_calc_batch(first_ever, {"Weight": [55, 99, "n/a"]}, 3)
+        self.assertEqual(weights.tolist(), [int(55 * 0.15), int(99 * 0.15), 0])
+        self.assertEqual(reps.tolist(), [int(55 / -7), int(99 / -7), 0])
+        self.assertEqual(valid.tolist(), [True, True, False])
+        weights, _, valid = evaluate_first_ever_calc_batch(first_ever, {"Weight": [55]}, 1, skip_weight=True)
+        self.assertEqual((weights.tolist(), valid.tolist()), ([0], [True]))
+
+
+class CompileFirstEverCalcTest(SimpleTestCase):
+    def first_ever(self, updated_at, weight="{Weight}*0.5"):
+        return {"id": -1, "updated_at": updated_at, "weight_formula_string": weight, "reps_formula_string": "10"}
+
+    def test_compiled_formula_is_reused_until_updated_at_changes(self):
+        formula = compile_first_ever_calc(self.first_ever(1), "weight_formula_string")
+        self.assertIs(
+            compile_first_ever_calc(self.first_ever(1, weight="{Weight}*2"), "weight_formula_string"), formula
+        )
+        self.assertIsNot(compile_first_ever_calc(self.first_ever(1), "reps_formula_string"), formula)
+        recompiled = compile_first_ever_calc(self.first_ever(2, weight="{Weight}*2"), "weight_formula_string")
+        self.assertEqual(recompiled.evaluate_many([{"Weight": 10}, {"Weight": 20}]), [20, 40])
@@ -0,0 +1,72 @@
+from rest_framework.test import APITestCase
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.benchmarks.seed import seed_catalog
+from apps.controlled.models import ProgramDesign, SessionLength
+
+
+def queryset_program_designs(session_length_id):
+    """The per-instance tree build_program_designs replaced, days ascending and workout flows by id."""
+    program_designs = []
+    PD_objects = ProgramDesign.objects.filter(sequence_flow__session_length__id=session_length_id).order_by("id")
+    for day in sorted({PD.day for PD in PD_objects}):
+        PD_response_object = {"day": day}
+        workout_flows = []
+        for PD in PD_objects.filter(day=day):
+            PD_response_object["session_per_week"] = PD.session_per_week.id
+            workout = {
+                "program_design_id": PD.id,
+                "workout_flow_id": PD.sequence_flow_id,
+                "name": PD.sequence_flow.name,
+            }
+            if PD.sequence_flow.value != "":
+                workout["value"] = PD.sequence_flow.value
+            if PD.body_part is not None:
+                workout["body_part"] = PD.body_part.id
+            if PD.body_part_classification is not None:
+                workout["body_part_classification"] = PD.body_part_classification.id
+            if PD.variance is not None:
+                workout["variance"] = PD.variance.id
+            workout_flows.append(workout)
+        PD_response_object["workout_flows"] = workout_flows
+        program_designs.append(PD_response_object)
+    return program_designs
+
+
+class SessionLengthViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=24)
+        cls.admin = User.objects.create_superuser("admin@joompa.local", "Admin", "Joompa", "password")
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def test_list_trees_match_the_per_instance_build(self):
+        response = self.client.get("/api/session-lengths/", {"page_size": 10})
+        self.assertEqual(response.status_code, 200)
+        session_lengths = response.json()["data"]["data"]
+        self.assertEqual(len(session_lengths), 10)
+        for session_length in session_lengths:
+            self.assertTrue(session_length["program_designs"])
+            self.assertEqual(session_length["program_designs"], queryset_program_designs(session_length["id"]))
+            self.assertIn("name", session_length["goal"])
+            self.assertIn("name", session_length["equipment_option"])
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        # count, session lengths with their goal and equipment option, program designs
+        with self.assertNumQueries(3):
+            self.client.get("/api/session-lengths/", {"page_size": 25})
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get("/api/session-lengths/", {"page_size": 2})
+        self.assertEqual(len(small_page), 3)
+
+    def test_detail_tree_matches_the_per_instance_build(self):
+        session_length = SessionLength.objects.order_by("id").last()
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/session-length/{session_length.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["program_designs"], queryset_program_designs(session_length.id))
@@ -0,0 +1,42 @@
+import json
+
+from rest_framework.test import APITestCase
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.benchmarks.seed import seed_catalog
+from apps.controlled.models import ControlProgram, ControlProgramInjury
+from apps.controlled.serializers import ControlProgramSerializer
+from apps.renderers import ORJSONRenderer
+
+
+class ControlProgramsViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+        cls.admin = User.objects.create_superuser("admin@joompa.local", "Admin", "Joompa", "password")
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def test_page_query_budget(self):
+        # count, control programs, and one query per prefetched relation, whatever the page size
+        self.assertTrue(ControlProgramInjury.objects.exists())
+        with self.assertNumQueries(5):
+            response = self.client.get("/api/control-programs/", {"page_size": 50})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]["data"]), 50)
+
+    def test_query_count_independent_of_page_size(self):
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get("/api/control-programs/", {"page_size": 2})
+        with CaptureQueriesContext(connection) as full_page:
+            self.client.get("/api/control-programs/", {"page_size": 25})
+        self.assertEqual(len(small_page), len(full_page))
+
+    def test_page_matches_unoptimized_serialization(self):
+        response = self.client.get("/api/control-programs/", {"page_size": 25})
+        expected = ControlProgramSerializer(ControlProgram.objects.all()[:25], many=True).data
+        self.assertEqual(response.json()["data"]["data"], json.loads(ORJSONRenderer().render(expected)))
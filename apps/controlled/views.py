@@ -9,6 +9,7 @@ from rest_framework.views import APIView
 from django.db import IntegrityError, transaction
 
 from apps.body_part.models import BodyPart
+from apps.controlled.catalog import bump_catalog_version
 from apps.controlled.models import (
     ControlProgram,
     EquipmentCombination,
@@ -36,6 +37,7 @@ from apps.controlled.serializers import (
     SwaggerSessoinLengthSerializer,
     VideoSerializer,
     WorkoutFlowSerializer,
+    build_program_designs,
 )
 from apps.equipment.models import Equipment
 from apps.pagination import CustomPagination
@@ -84,10 +86,13 @@ class SessionLengthView(APIView):
         :return: if 200 return data, if 500 return exception message
         """
         try:
-            session_lengths = SessionLength.objects.all()
+            session_lengths = SessionLength.objects.select_related("goal", "equipment_option")
             paginator = CustomPagination()
             result_page = paginator.paginate_queryset(session_lengths, request)
-            session_length = SessionLengthSerializer(result_page, many=True)
+            program_designs = build_program_designs([instance.id for instance in result_page])
+            session_length = SessionLengthSerializer(
+                result_page, many=True, context={"program_designs": program_designs}
+            )
             response_object = paginator.get_paginated_response(data=session_length.data)
             return Response(response_json(status=True, data=response_object, message=None), status=status.HTTP_200_OK)
 
@@ -202,34 +207,8 @@ class SessionLengthsView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
         try:
+            program_designs = build_program_designs([session_length.id])[session_length.id]
             session_length = session_length.to_dict()
-            program_designs = []
-            PD_objects = ProgramDesign.objects.filter(sequence_flow__session_length__id=pk)
-            PD_objects_distinct = PD_objects.values("day").distinct()
-            for data in PD_objects_distinct:
-                day = data["day"]
-                PD_response_object = {}
-                PD_response_object["day"] = day
-                workout_flows = []
-                for PD in PD_objects.filter(day=day):
-                    PD_response_object["session_per_week"] = PD.session_per_week.id
-                    workout = {}
-                    workout["program_design_id"] = PD.id
-                    workout["workout_flow_id"] = PD.sequence_flow_id
-                    workout["name"] = PD.sequence_flow.name
-                    if PD.sequence_flow.value != "":
-                        workout["value"] = PD.sequence_flow.value
-                    if PD.body_part is not None:
-                        workout["body_part"] = PD.body_part.id
-                    if PD.body_part_classification is not None:
-                        workout["body_part_classification"] = PD.body_part_classification.id
-                    if PD.variance is not None:
-                        workout["variance"] = PD.variance.id
-                    workout_flows.append(workout)
-
-                PD_response_object["workout_flows"] = workout_flows
-                program_designs.append(PD_response_object)
-
             session_length["program_designs"] = program_designs
             return Response(response_json(status=True, data=session_length), status=status.HTTP_200_OK)
 
@@ -353,7 +332,7 @@ class SessionLengthsView(APIView):
         :return: if 200 return data, if 400 return error.
         """
         try:
-            session_length = SessionLength.objects.get(pk=pk)
+            session_length = SessionLength.objects.select_related("goal", "equipment_option").get(pk=pk)
             return session_length
         except SessionLength.DoesNotExist:
             logger.info(f"Session-length object with the id: {pk} doesn't exist")
@@ -478,6 +457,8 @@ class ProgramDesignsView(APIView):
                         pd_object = ProgramDesign.objects.filter(id=record["id"])
                         record.pop("id")
                         pd_object.update(**record)
+                        # queryset update skips post_save
+                        bump_catalog_version()
 
             except Exception:
                 ProgramDesign.objects.filter(id__in=new_pd_objects).delete()
@@ -800,10 +781,13 @@ class ControlProgramView(APIView):
             data = request.data
             exercise_name = data.pop("exercise")
             Exercise.objects.filter(id=control_program_object.exercise.id).update(name=exercise_name)
+            bump_catalog_version()
             data["exercise"] = control_program_object.exercise.id
             serializer = ControlProgramSerializer(control_program_object, data=data)
             if serializer.is_valid():
                 serializer.save()
+                # control program is written with a queryset update which skips post_save
+                bump_catalog_version()
                 return Response(
                     response_json(
                         status=True, data=serializer.data, message="Control Program updated " "successfully."
@@ -890,7 +874,7 @@ class ControlProgramsView(APIView):
     def get(self, request):
 
         try:
-            control_program_objects = ControlProgram.objects.all()
+            control_program_objects = ControlProgramSerializer.setup_eager_loading(ControlProgram.objects.all())
             paginator = CustomPagination()
             result_page = paginator.paginate_queryset(control_program_objects, request)
             serializer = ControlProgramSerializer(result_page, many=True)
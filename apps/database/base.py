@@ -0,0 +1,67 @@
+"""PostgreSQL backend with connection health checks and an optional connection pool.
+
+Selected with ``"ENGINE": "apps.database"``. Two extra keys of the database settings are read:
+
+    CONN_HEALTH_CHECKS    check a persistent connection with SELECT 1 before its first use in each request
+    POOL                  None, or {"MAX_SIZE": ..., "IDLE_TIMEOUT": ..., "TIMEOUT": ...} to share a pool of
+                          connections between the threads of a worker, CONN_MAX_AGE should be 0 then
+"""
+from django.db.backends.postgresql import base
+
+from apps.database.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get("POOL")
+        if not options:
+            return None
+        return get_pool(self.alias, options, self.settings_dict.get("CONN_HEALTH_CHECKS", False))
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection = pool.acquire(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        self.isolation_level = self.settings_dict["OPTIONS"].get("isolation_level", connection.isolation_level)
+        return connection
+
+    def connect(self):
+        # a connection that is being opened, or was checked by the pool, doesn't need another check, set first
+        # since connect() itself calls ensure_connection()
+        self.health_check_done = True
+        super().connect()
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django holds on to a connection closed inside an atomic block until the block exits, so it
+                # can't be handed to another thread
+                pool.discard(self.connection)
+            else:
+                pool.release(self.connection)
+
+    def close_if_unusable_or_obsolete(self):
+        # runs when a request starts and finishes, the next request checks the connection again
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and not self.health_check_done
+            and self.settings_dict.get("CONN_HEALTH_CHECKS", False)
+            and not self.in_atomic_block
+        ):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+        super().ensure_connection()
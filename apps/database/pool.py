@@ -0,0 +1,255 @@
+"""PostgreSQL connection pool file."""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+logger = logging.getLogger(__name__)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """ConnectionPool class
+
+    Thread safe pool of psycopg2 connections shared by the threads of one worker process. Idle connections are
+    handed out most recently used first, so under low load the surplus ones age past idle_timeout and are
+    closed. When max_size connections are checked out, acquire waits up to timeout seconds for one to be
+    released and raises PoolTimeout after that.
+
+    Parameters
+    ----------
+    max_size : integer
+    idle_timeout : float
+        seconds an idle connection is kept open
+    timeout : float
+        seconds acquire waits for a free connection
+    health_check : boolean
+        run SELECT 1 on an idle connection before handing it out
+    """
+
+    def __init__(self, max_size, idle_timeout=300, timeout=10, health_check=True):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.health_check = health_check
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._counters = dict.fromkeys(
+            ("created", "reused", "closed_idle", "closed_broken", "waits", "timeouts", "wait_time"), 0
+        )
+
+    def __prune_idle(self, now):
+        # the oldest connections sit at the left end
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            self._size -= 1
+            self._counters["closed_idle"] += 1
+            _close_quietly(connection)
+
+    def __is_healthy(self, connection):
+        if connection.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    def acquire(self, connect):
+        """Public Method
+
+        The method checks out an idle connection, or opens a new one with connect while the pool holds fewer
+        than max_size connections.
+
+        Parameters
+        ----------
+        connect : callable
+            returns a new psycopg2 connection
+
+        Returns
+        -------
+        psycopg2.extensions.connection
+        """
+        deadline = time.monotonic() + self.timeout
+        waited = None
+        while True:
+            with self._condition:
+                connection = None
+                while True:
+                    now = time.monotonic()
+                    self.__prune_idle(now)
+                    if self._idle:
+                        connection, _ = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    if waited is None:
+                        waited = now
+                        self._counters["waits"] += 1
+                    if now >= deadline:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(f"No database connection free within {self.timeout}s")
+                    self._condition.wait(deadline - now)
+                if waited is not None:
+                    self._counters["wait_time"] += time.monotonic() - waited
+
+            if connection is None:
+                try:
+                    connection = connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._counters["created"] += 1
+                return connection
+
+            # checked outside the lock, a broken connection is dropped and the next one tried
+            if self.__is_healthy(connection):
+                with self._condition:
+                    self._counters["reused"] += 1
+                return connection
+            self.discard(connection)
+
+    def release(self, connection):
+        """Public Method
+
+        The method returns a checked out connection to the pool, rolling back an open transaction first.
+        Broken connections are closed instead.
+
+        Parameters
+        ----------
+        connection : psycopg2.extensions.connection
+        """
+        if not connection.closed and connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                _close_quietly(connection)
+        if connection.closed:
+            self.discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        """Public Method
+
+        The method closes a checked out connection and frees its slot in the pool.
+
+        Parameters
+        ----------
+        connection : psycopg2.extensions.connection
+        """
+        _close_quietly(connection)
+        with self._condition:
+            self._size -= 1
+            self._counters["closed_broken"] += 1
+            self._condition.notify()
+
+    def close_idle(self):
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._size -= 1
+                _close_quietly(connection)
+
+    def stats(self):
+        """Public Method
+
+        The method returns the pool's current size and its counters since the process started.
+
+        Returns
+        -------
+        dict
+        """
+        with self._condition:
+            self.__prune_idle(time.monotonic())
+            stats = dict(self._counters)
+            stats.update(
+                size=self._size, idle=len(self._idle), in_use=self._size - len(self._idle), max_size=self.max_size
+            )
+        stats["wait_time"] = round(stats["wait_time"], 4)
+        return stats
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        logger.exception("Error occurred while closing a pooled database connection")
+
+
+def get_pool(alias, options, health_check):
+    """Public Method
+
+    The method returns the connection pool of a database alias, creating it on first use.
+
+    Parameters
+    ----------
+    alias : str
+    options : dict
+        the POOL entry of the database settings, MAX_SIZE, IDLE_TIMEOUT and TIMEOUT
+    health_check : boolean
+
+    Returns
+    -------
+    apps.database.pool.ConnectionPool
+    """
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = ConnectionPool(
+                    options["MAX_SIZE"],
+                    idle_timeout=options.get("IDLE_TIMEOUT", 300),
+                    timeout=options.get("TIMEOUT", 10),
+                    health_check=health_check,
+                )
+                _pools[alias] = pool
+    return pool
+
+
+def pool_stats():
+    """Public Method
+
+    The method returns the stats of every connection pool of this process.
+
+    Returns
+    -------
+    dict
+        returns the stats keyed by database alias
+    """
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def _close_idle_before_fork():
+    # a forked child must not inherit the sockets of pooled connections, gunicorn forks its workers from the
+    # master after the warm-up queries
+    for pool in list(_pools.values()):
+        pool.close_idle()
+
+
+def _forget_pools_in_child():
+    _pools.clear()
+
+
+os.register_at_fork(before=_close_idle_before_fork, after_in_child=_forget_pools_in_child)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FitnessConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.equipment"
+
+    def ready(self):
+        import apps.equipment.signals  # noqa: F401
@@ -0,0 +1,5 @@
+"""Equipment signals file."""
+from apps.etag import track_table_versions
+from apps.equipment.models import Equipment
+
+track_table_versions(Equipment)
@@ -10,13 +10,15 @@ from django.db import IntegrityError, transaction
 from apps.equipment.models import Equipment, EquipmentOption
 from apps.equipment.serializers import CustomeEquipmentSerializer, EquipmentOptionSerializer, EquipmentSerializer
 from apps.equipment.validators import check_s3_bucket_access
+from apps.etag import ConditionalGetMixin
 from apps.utils import response_json
 
 logger = logging.getLogger(__name__)
 
 
-class EquipmentsView(APIView):
+class EquipmentsView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Equipment,)
 
     @swagger_auto_schema(
         operation_description="GET /api/equipments/",
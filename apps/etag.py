@@ -0,0 +1,130 @@
+"""Conditional GET file."""
+import hashlib
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+from apps.metrics import record_cache_access
+from apps.utils import bump_cache_version, get_cache_version
+
+
+def table_version_key(model):
+    return f"etag:table_version:{model._meta.db_table}"
+
+
+def get_table_versions(models):
+    """Public Method
+
+    The method returns the version counters of the given models' tables with one cache round trip, seeding
+    the counters that are missing.
+
+    Parameters
+    ----------
+    models : iterable
+        django.db.models.Model classes
+
+    Returns
+    -------
+    list
+        returns the versions in the order of the given models
+    """
+    keys = [table_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        record_cache_access(key in versions)
+    return [versions[key] if key in versions else get_cache_version(key) for key in keys]
+
+
+def bump_table_versions(*models):
+    """Public Method
+
+    The method bumps the version counters of the given models' tables once the current transaction commits.
+    Writes that send no post_save or post_delete signal, bulk_create() and QuerySet.update(), must call it
+    themselves.
+
+    Parameters
+    ----------
+    models : django.db.models.Model
+    """
+
+    def bump():
+        for model in models:
+            bump_cache_version(table_version_key(model))
+
+    transaction.on_commit(bump)
+
+
+def invalidate_table_version(sender, **kwargs):
+    bump_table_versions(sender)
+
+
+def track_table_versions(*models):
+    """Public Method
+
+    The method bumps a model's table version on every post_save and post_delete signal of that model.
+
+    Parameters
+    ----------
+    models : django.db.models.Model
+    """
+    for model in models:
+        label = model._meta.label_lower
+        post_save.connect(invalidate_table_version, sender=model, dispatch_uid=f"table_version_save_{label}")
+        post_delete.connect(invalidate_table_version, sender=model, dispatch_uid=f"table_version_delete_{label}")
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """ConditionalGetMixin class
+
+    Adds a strong ETag to the GET responses of an APIView, derived from the version counters of the tables
+    listed in etag_models, and answers a matching If-None-Match with 304 Not Modified right after
+    authentication and permission checks, before the handler runs a single query. Every model in etag_models
+    must be registered with track_table_versions. The ETag also varies on request.user.is_staff, since
+    several listings return more rows to admins.
+
+    Parameters
+    ----------
+    etag_models : tuple
+        django.db.models.Model classes the GET response is built from
+    """
+
+    etag_models = ()
+
+    def get_etag(self, request):
+        versions = ".".join(str(version) for version in get_table_versions(self.etag_models))
+        digest = hashlib.sha1(f"{type(self).__name__}:{request.user.is_staff}:{versions}".encode()).hexdigest()
+        return quote_etag(digest)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method in ("GET", "HEAD"):
+            self.etag = self.get_etag(request)
+            if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+            # If-None-Match uses the weak comparison
+            if "*" in if_none_match or self.etag in (etag.replace("W/", "", 1) for etag in if_none_match):
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "etag", None) and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = self.etag
+            # clients must revalidate, and shared caches must not serve one user's listing to another
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -12,3 +12,6 @@ class FeedbackConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.feedback"
+
+    def ready(self):
+        import apps.feedback.signals  # noqa: F401
@@ -0,0 +1,5 @@
+"""Feedback signals file."""
+from apps.etag import track_table_versions
+from apps.feedback.models import Feedback, FeedbackRange, FeedbackValue
+
+track_table_versions(Feedback, FeedbackRange, FeedbackValue)
@@ -8,14 +8,15 @@ from rest_framework.views import APIView
 
 from django.db import IntegrityError, transaction
 
-from apps.feedback.models import Feedback
+from apps.etag import ConditionalGetMixin
+from apps.feedback.models import Feedback, FeedbackRange, FeedbackValue
 from apps.feedback.serializers import FeedbackSerializer
 from apps.utils import response_json
 
 logger = logging.getLogger(__name__)
 
 
-class FeedbacksView(APIView):
+class FeedbacksView(ConditionalGetMixin, APIView):
     """FeedbacksView class
 
     Parameters
@@ -24,6 +25,7 @@ class FeedbacksView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Feedback, FeedbackValue, FeedbackRange)
 
     @swagger_auto_schema(
         responses={
@@ -12,3 +12,6 @@ class GoalConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.goal"
+
+    def ready(self):
+        import apps.goal.signals  # noqa: F401
@@ -0,0 +1,5 @@
+"""Goal signals file."""
+from apps.etag import track_table_versions
+from apps.goal.models import Goal
+
+track_table_versions(Goal)
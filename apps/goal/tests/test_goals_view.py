@@ -0,0 +1,61 @@
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.goal.models import Goal
+from apps.testing import create_user_profile
+
+
+class GoalsViewETagTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin@joompa.local", "Admin", "Joompa", "password")
+        cls.athlete = create_user_profile("athlete@joompa.local").user_id
+        Goal.objects.create(name="Strength")
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def get(self, **headers):
+        return self.client.get("/api/goals/", **headers)
+
+    def test_responses_carry_a_private_etag(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_matching_etag_is_answered_without_queries(self):
+        etag = self.get()["ETag"]
+        for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+            with self.subTest(if_none_match=if_none_match), self.assertNumQueries(0):
+                response = self.get(HTTP_IF_NONE_MATCH=if_none_match)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+
+    def test_stale_etag_gets_the_listing(self):
+        response = self.get(HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([goal["name"] for goal in response.json()["data"]], ["Strength"])
+
+    def test_committed_writes_change_the_etag(self):
+        etag = self.get()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Goal.objects.create(name="Endurance")
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["data"]), 2)
+
+        etag = response["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Goal.objects.filter(name="Endurance").delete()
+        self.assertNotEqual(self.get()["ETag"], etag)
+
+    def test_admins_and_mobile_users_get_different_etags(self):
+        etag = self.get()["ETag"]
+        self.client.force_authenticate(self.athlete)
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
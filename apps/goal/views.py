@@ -9,6 +9,7 @@ from rest_framework.views import APIView
 from django.db.models import Count
 
 from apps.controlled.models import SessionLength
+from apps.etag import ConditionalGetMixin
 from apps.goal.serializers import Goal, GoalSerializer
 from apps.mobile_api.v1.models import UserProfile
 from apps.reps_in_reserve.models import RepsRange
@@ -201,7 +202,7 @@ class GoalView(APIView):
             return None
 
 
-class GoalsView(APIView):
+class GoalsView(ConditionalGetMixin, APIView):
     """GoalsView class
 
     This view performs POST and FETCHALL operations for Goal
@@ -213,6 +214,7 @@ class GoalsView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Goal, SessionLength, RepsRange)
 
     @swagger_auto_schema(
         responses={
@@ -12,3 +12,6 @@ class InjuryConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.injury"
+
+    def ready(self):
+        import apps.injury.signals  # noqa: F401
@@ -0,0 +1,5 @@
+"""Injury signals file."""
+from apps.etag import track_table_versions
+from apps.injury.models import Injury, InjuryType
+
+track_table_versions(Injury, InjuryType)
@@ -6,6 +6,8 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.body_part.models import BodyPart
+from apps.etag import ConditionalGetMixin
 from apps.injury.models import Injury, InjuryType
 from apps.injury.serializers import InjurySerializer, InjuryTypeSerializer
 from apps.mobile_api.v1.models import UserInjury
@@ -197,7 +199,7 @@ class InjuryView(APIView):
             return None
 
 
-class InjuriesView(APIView):
+class InjuriesView(ConditionalGetMixin, APIView):
     """InjuriesView class
 
     This view performs POST and FETCHALL operations for Injury
@@ -209,6 +211,7 @@ class InjuriesView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Injury, InjuryType, BodyPart)
 
     @swagger_auto_schema(
         responses={
@@ -0,0 +1,148 @@
+"""Request metrics file."""
+import contextlib
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from apps.database.pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+_request_metrics = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """RequestMetrics class
+
+    Counters collected for one sampled request: database queries and their total time, shared cache and
+    in-process snapshot hits and misses, and the durations of the phases named with request_phase.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.phases = {}
+
+    def execute(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook timing every query run while the request is active"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self, total):
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'cache;desc="{self.cache_hits} hits {self.cache_misses} misses"',
+        ]
+        entries.extend(f"{name};dur={duration * 1000:.1f}" for name, duration in self.phases.items())
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+    def as_dict(self, total):
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 1),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "phases_ms": {name: round(duration * 1000, 1) for name, duration in self.phases.items()},
+            "total_ms": round(total * 1000, 1),
+        }
+
+
+@contextlib.contextmanager
+def request_phase(name):
+    """Public Method
+
+    The method times the enclosed block as a named phase of the current request, reported in the
+    Server-Timing header. Nothing is recorded when the request isn't sampled. A phase entered more than once
+    adds up.
+
+    Parameters
+    ----------
+    name : str
+        Server-Timing metric name, a token without spaces
+    """
+    metrics = _request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[name] = metrics.phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def record_cache_access(hit):
+    """Public Method
+
+    The method counts a cache hit or miss against the current request, when it is sampled.
+
+    Parameters
+    ----------
+    hit : boolean
+    """
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+class RequestMetricsMiddleware:
+    """RequestMetricsMiddleware class
+
+    Collects RequestMetrics for a REQUEST_METRICS_SAMPLE_RATE share of the requests and reports them in the
+    Server-Timing and X-DB-Queries response headers and in one JSON log line. It is only loaded when
+    REQUEST_METRICS_ENABLED is set. Queries run while a StreamingHttpResponse is consumed happen after the
+    headers are sent and are not counted.
+
+    Parameters
+    ----------
+    get_response : callable
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_METRICS_SAMPLE_RATE", 1.0)
+
+    def __call__(self, request):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute))
+                response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+
+        total = time.perf_counter() - metrics.started
+        response["Server-Timing"] = metrics.server_timing(total)
+        response["X-DB-Queries"] = str(metrics.queries)
+        line = {"method": request.method, "path": request.path, "status": response.status_code}
+        line.update(metrics.as_dict(total))
+        pools = pool_stats()
+        if pools:
+            line["db_pools"] = pools
+        logger.info(json.dumps(line))
+        return response
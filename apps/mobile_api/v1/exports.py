@@ -0,0 +1,157 @@
+"""UserProgramDesign exports file."""
+import csv
+import datetime
+import logging
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.mobile_api.v1.models import UserProgramDesign
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+# UserProgramDesign columns repeated on every exported set, as (column, values() lookup)
+PROGRAM_COLUMNS = (
+    ("user_program_design_id", "id"),
+    ("user_profile_id", "user_id"),
+    ("is_personalized", "is_personalized"),
+    ("week", "week"),
+    ("day", "day"),
+    ("workout_date", "workout_date"),
+    ("is_complete", "is_complete"),
+    ("system_rir", "system_rir"),
+    ("start_date", "start_date"),
+    ("end_date", "end_date"),
+)
+# scalar keys of one program_design entry, lists such as videos and equipments are not exported
+SET_COLUMNS = (
+    "exercise",
+    "name",
+    "value",
+    "set",
+    "total_sets",
+    "reps",
+    "weight",
+    "user_calculated_reps",
+    "user_calculated_weight",
+    "system_calculated_reps",
+    "system_calculated_weight",
+    "user_rir",
+    "is_two_sided",
+    "goal",
+    "total_session_length",
+    "session_per_week",
+    "rest_time",
+    "workout_time",
+    "warm_up_time",
+    "pd_id",
+    "workout_id",
+    "checked",
+)
+EXPORT_COLUMNS = tuple(column for column, _ in PROGRAM_COLUMNS) + ("set_index",) + SET_COLUMNS
+
+
+def export_rows(queryset=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Public Method
+
+    The method yields one flat dict per exercise set of the given UserProgramDesign rows. Rows are read in id
+    order through a server-side cursor, chunk_size at a time, so memory stays constant however many rows
+    are exported.
+
+    Parameters
+    ----------
+    queryset : django.db.models.QuerySet
+        UserProgramDesign queryset, every row when None
+    chunk_size : integer
+
+    Returns
+    -------
+    generator
+        returns dicts keyed by EXPORT_COLUMNS
+    """
+    if queryset is None:
+        queryset = UserProgramDesign.objects.all()
+    lookups = [lookup for _, lookup in PROGRAM_COLUMNS]
+    for record in queryset.order_by("id").values(*lookups, "program_design").iterator(chunk_size=chunk_size):
+        program = {column: record[lookup] for column, lookup in PROGRAM_COLUMNS}
+        for set_index, exercise_set in enumerate(record["program_design"] or []):
+            row = dict(program)
+            row["set_index"] = set_index
+            for column in SET_COLUMNS:
+                row[column] = exercise_set.get(column)
+            yield row
+
+
+class Echo:
+    """Pseudo buffer whose write returns the written value, so csv.writer output can be yielded"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def render_csv(rows, batch_size=500):
+    """Public Method
+
+    The method yields the header and the rows as CSV, batch_size rows per chunk.
+
+    Parameters
+    ----------
+    rows : iterable
+        dicts keyed by EXPORT_COLUMNS
+    batch_size : integer
+
+    Returns
+    -------
+    generator
+        returns CSV text chunks
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    batch = []
+    for row in rows:
+        batch.append(writer.writerow([_csv_value(row[column]) for column in EXPORT_COLUMNS]))
+        if len(batch) >= batch_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def render_ndjson(rows, batch_size=500):
+    """Public Method
+
+    The method yields the rows as newline delimited JSON, encoded like DRF's JSONRenderer encodes them,
+    batch_size rows per chunk.
+
+    Parameters
+    ----------
+    rows : iterable
+    batch_size : integer
+
+    Returns
+    -------
+    generator
+        returns NDJSON text chunks
+    """
+    encoder = JSONEncoder()
+    batch = []
+    for row in rows:
+        batch.append(encoder.encode(row) + "\n")
+        if len(batch) >= batch_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+# export_format to its renderer, content type and file extension
+EXPORT_FORMATS = {
+    "csv": (render_csv, "text/csv", "csv"),
+    "ndjson": (render_ndjson, "application/x-ndjson", "ndjson"),
+}
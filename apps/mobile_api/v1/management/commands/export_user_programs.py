@@ -0,0 +1,47 @@
+import datetime
+import logging
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mobile_api.v1.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_rows
+from apps.mobile_api.v1.models import UserProgramDesign
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Stream UserProgramDesign rows, one line per exercise set, as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--export-format", choices=list(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--output", default="-", help="File written to, - for stdout")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Rows fetched per round trip")
+        parser.add_argument("--user-profile", type=int, default=None)
+        parser.add_argument("--from-date", type=datetime.date.fromisoformat, default=None)
+        parser.add_argument("--to-date", type=datetime.date.fromisoformat, default=None)
+
+    def __get_user_programs(self, options):
+        user_programs = UserProgramDesign.objects.all()
+        if options["user_profile"] is not None:
+            user_programs = user_programs.filter(user=options["user_profile"])
+        if options["from_date"] is not None:
+            user_programs = user_programs.filter(workout_date__date__gte=options["from_date"])
+        if options["to_date"] is not None:
+            user_programs = user_programs.filter(workout_date__date__lte=options["to_date"])
+        return user_programs
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+        render, _, _ = EXPORT_FORMATS[options["export_format"]]
+        rows = export_rows(self.__get_user_programs(options), chunk_size=options["chunk_size"])
+
+        output = sys.stdout if options["output"] == "-" else open(options["output"], "w", newline="")
+        try:
+            for chunk in render(rows):
+                output.write(chunk)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        logger.info(f"User programs exported as {options['export_format']} to {options['output']}")
@@ -0,0 +1,44 @@
+# Generated by Django 3.2.7 on 2026-10-18 11:20
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.datetime
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1", "0013_userprofile_is_pd_exist"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprogramdesign",
+            index=models.Index(fields=["user", "is_personalized", "workout_date"], name="v1_upd_user_workout_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userprogramdesign",
+            index=models.Index(
+                django.db.models.expressions.F("user"),
+                django.db.models.expressions.F("is_personalized"),
+                django.db.models.functions.datetime.TruncDate("workout_date"),
+                name="v1_upd_user_workout_day_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprogramdesign",
+            index=models.Index(
+                condition=models.Q(("is_complete", False)),
+                fields=["user", "is_personalized", "workout_date"],
+                name="v1_upd_user_incomplete_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprogramdesign",
+            index=models.Index(fields=["user", "is_personalized", "start_date"], name="v1_upd_user_start_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userprogramdesign",
+            index=models.Index(fields=["user", "week", "day"], name="v1_upd_user_week_day_idx"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.7 on 2026-10-18 11:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1", "0014_userprogramdesign_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprogramdesign",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["program_design"], name="v1_upd_program_design_gin", opclasses=["jsonb_path_ops"]
+            ),
+        ),
+    ]
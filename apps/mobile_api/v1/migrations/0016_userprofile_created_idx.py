@@ -0,0 +1,17 @@
+# Generated by Django 3.2.7 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1", "0015_userprogramdesign_program_design_gin"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(fields=["created_at", "id"], name="v1_userprofile_created_idx"),
+        ),
+    ]
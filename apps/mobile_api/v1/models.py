@@ -1,5 +1,7 @@
 """Mobile API models file."""
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import TruncDate
 
 from apps.accounts.models import User
 from apps.equipment.models import Equipment, EquipmentOption
@@ -55,6 +57,12 @@ class UserProfile(models.Model):
             "is_personalized": self.is_personalized,
         }
 
+    class Meta:
+        indexes = [
+            # created_at sort and keyset pagination of the admin users listing
+            models.Index(fields=["created_at", "id"], name="v1_userprofile_created_idx"),
+        ]
+
 
 class UserStandardVariable(models.Model):
     user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="user_profiles_std_var")
@@ -146,6 +154,29 @@ class UserProgramDesign(models.Model):
     start_date = models.DateTimeField(blank=True, null=True)
     end_date = models.DateTimeField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # workout_date range and ordering reads of the active program
+            models.Index(fields=["user", "is_personalized", "workout_date"], name="v1_upd_user_workout_idx"),
+            # workout_date__date lookups compare the date in TIME_ZONE, which a plain workout_date index can't serve
+            models.Index(
+                models.F("user"),
+                models.F("is_personalized"),
+                TruncDate("workout_date"),
+                name="v1_upd_user_workout_day_idx",
+            ),
+            # missed and upcoming sessions only look at incomplete workouts
+            models.Index(
+                fields=["user", "is_personalized", "workout_date"],
+                condition=models.Q(is_complete=False),
+                name="v1_upd_user_incomplete_idx",
+            ),
+            models.Index(fields=["user", "is_personalized", "start_date"], name="v1_upd_user_start_date_idx"),
+            models.Index(fields=["user", "week", "day"], name="v1_upd_user_week_day_idx"),
+            # program_design__contains filters on goal, total_session_length, exercise, ...
+            GinIndex(fields=["program_design"], opclasses=["jsonb_path_ops"], name="v1_upd_program_design_gin"),
+        ]
+
 
 class UserFeedback(models.Model):
     user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="user_profile_feedbacks")
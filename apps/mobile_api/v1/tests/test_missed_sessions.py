@@ -0,0 +1,129 @@
+import datetime
+
+from django.test import TestCase
+
+from apps.mobile_api.v1.models import UserProgramDesign
+from apps.mobile_api.v1.views import get_missed_sessions, get_missed_sessions_bulk
+from apps.testing import create_lookups, create_user_profile, create_user_programs, days_from_now
+
+
+def queryset_missed_sessions(user_profile):
+    """The ORM implementation get_missed_sessions replaced, kept as the reference of its results."""
+    missed_sessions = 0
+    response_data = {"can_reschedule": True}
+    current_date = datetime.datetime.now()
+    user_programs = UserProgramDesign.objects.filter(
+        user=user_profile.id, workout_date__date__lt=current_date, is_personalized=user_profile.is_personalized
+    ).order_by("workout_date")
+    in_complete_programs = user_programs.filter(is_complete=False)
+    if in_complete_programs.exists():
+        missed_sessions = in_complete_programs.count()
+        if abs((in_complete_programs.first().workout_date.replace(tzinfo=None) - current_date).days) > 14:
+            response_data["can_reschedule"] = False
+        recent_workout = user_programs.last()
+        if recent_workout.is_complete:
+            missed_sessions = 0
+            response_data["can_reschedule"] = True
+        else:
+            recent_complete_workout = user_programs.filter(
+                is_complete=True, start_date=recent_workout.start_date
+            ).last()
+            if recent_complete_workout is not None:
+                missed_sessions = (
+                    UserProgramDesign.objects.filter(
+                        workout_date__date__range=[
+                            recent_complete_workout.workout_date,
+                            current_date + datetime.timedelta(days=-1),
+                        ],
+                        user=user_profile.id,
+                        is_personalized=user_profile.is_personalized,
+                    ).count()
+                    - 1
+                )
+                if abs((recent_complete_workout.workout_date.replace(tzinfo=None) - current_date).days) > 14:
+                    response_data["can_reschedule"] = False
+    return missed_sessions, response_data
+
+
+class MissedSessionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lookups = create_lookups()
+
+    def create_user_profile(self, name, **fields):
+        return create_user_profile(
+            f"{name}@joompa.local",
+            self.lookups["goal"],
+            self.lookups["sessions"][3],
+            self.lookups["fitness_level"],
+            **fields,
+        )
+
+    def create_programs(self, user_profile, days, completed=(), **fields):
+        user_programs = create_user_programs(user_profile, days_from_now(*days), **fields)
+        UserProgramDesign.objects.filter(
+            pk__in=[user_program.pk for user_program, day in zip(user_programs, sorted(days)) if day in completed]
+        ).update(is_complete=True)
+        return user_programs
+
+    def assertMissedSessions(self, user_profile, expected):
+        self.assertEqual(get_missed_sessions(user_profile.id), expected)
+        self.assertEqual(queryset_missed_sessions(user_profile), expected)
+
+    def test_without_programs(self):
+        self.assertMissedSessions(self.create_user_profile("new"), (0, {"can_reschedule": True}))
+
+    def test_future_and_todays_workouts_are_not_missed(self):
+        user_profile = self.create_user_profile("upcoming")
+        self.create_programs(user_profile, (0, 2, 4))
+        self.assertMissedSessions(user_profile, (0, {"can_reschedule": True}))
+
+    def test_counts_past_incomplete_workouts(self):
+        user_profile = self.create_user_profile("missed")
+        self.create_programs(user_profile, (-5, -3, -1, 1))
+        self.assertMissedSessions(user_profile, (3, {"can_reschedule": True}))
+
+    def test_missed_for_more_than_two_weeks_cannot_be_rescheduled(self):
+        user_profile = self.create_user_profile("lapsed")
+        self.create_programs(user_profile, (-20, -18, -16, 1))
+        self.assertMissedSessions(user_profile, (3, {"can_reschedule": False}))
+
+    def test_nothing_is_missed_when_the_last_workout_is_complete(self):
+        user_profile = self.create_user_profile("caught-up")
+        self.create_programs(user_profile, (-20, -5, -3, 1), completed=(-3,))
+        self.assertMissedSessions(user_profile, (0, {"can_reschedule": True}))
+
+    def test_counts_from_the_last_completed_workout(self):
+        user_profile = self.create_user_profile("returning")
+        self.create_programs(user_profile, (-7, -5, -3, -1, 1), completed=(-7,))
+        self.assertMissedSessions(user_profile, (3, {"can_reschedule": True}))
+
+    def test_last_completed_workout_more_than_two_weeks_ago(self):
+        user_profile = self.create_user_profile("stale")
+        self.create_programs(user_profile, (-20, -18, -3), completed=(-20,))
+        self.assertMissedSessions(user_profile, (2, {"can_reschedule": False}))
+
+    def test_completed_workouts_of_an_older_program_are_ignored(self):
+        user_profile = self.create_user_profile("restarted")
+        self.create_programs(user_profile, (-9, -8), completed=(-9, -8))
+        self.create_programs(user_profile, (-4, -2, 1))
+        self.assertMissedSessions(user_profile, (2, {"can_reschedule": True}))
+
+    def test_programs_of_the_other_personalization_are_ignored(self):
+        user_profile = self.create_user_profile("switched", is_personalized=False)
+        self.create_programs(user_profile, (-4, -2), is_personalized=True)
+        self.create_programs(user_profile, (-3, 1), is_personalized=False)
+        self.assertMissedSessions(user_profile, (1, {"can_reschedule": True}))
+
+    def test_bulk_matches_single_calls_in_one_query(self):
+        user_profiles = [self.create_user_profile(f"athlete-{index}") for index in range(4)]
+        self.create_programs(user_profiles[0], (-5, -3, 1))
+        self.create_programs(user_profiles[1], (-7, -5, -3), completed=(-7,))
+        self.create_programs(user_profiles[2], (-3, -1), completed=(-1,))
+        user_profile_ids = [user_profile.id for user_profile in user_profiles]
+        with self.assertNumQueries(1):
+            missed_sessions = get_missed_sessions_bulk(user_profile_ids)
+        self.assertEqual(
+            missed_sessions,
+            {user_profile.id: queryset_missed_sessions(user_profile) for user_profile in user_profiles},
+        )
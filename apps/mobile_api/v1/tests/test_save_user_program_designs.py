@@ -0,0 +1,66 @@
+import datetime
+
+from django.test import TestCase
+
+from apps.const import TOTAL_PROGRAM_DESIGN_WEEKS
+from apps.mobile_api.v1.models import UserProgramDesign
+from apps.mobile_api.v1.views import get_pd_day_offsets, save_user_program_designs
+from apps.reps_in_reserve.models import RepsInReserve
+from apps.testing import create_lookups, create_user_profile, program_design
+
+
+class SaveUserProgramDesignsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lookups = create_lookups()
+        cls.user_profile = create_user_profile(
+            "athlete@joompa.local", cls.lookups["goal"], cls.lookups["sessions"][3], cls.lookups["fitness_level"]
+        )
+
+    def create_reps_in_reserve(self, weeks):
+        # weeks listed newest first, the rir of a week is looked up by its number, not its position
+        RepsInReserve.objects.create(
+            goal=self.lookups["goal"],
+            fitness_level=self.lookups["fitness_level"],
+            weeks=[{"week": str(week), "rir": str(week % 4)} for week in reversed(weeks)],
+        )
+
+    def save(self, data):
+        return save_user_program_designs(
+            self.user_profile, self.lookups["sessions"][3].id, self.lookups["goal"].id, True, data
+        )
+
+    def test_creates_every_week_and_day_in_one_insert(self):
+        self.create_reps_in_reserve(range(1, TOTAL_PROGRAM_DESIGN_WEEKS + 1))
+        data = {1: program_design(exercises=("Squat", "Lunge")), 3: program_design(exercises=("Row",))}
+        with self.assertNumQueries(3):
+            created_ids = self.save(data)
+
+        user_programs = list(UserProgramDesign.objects.filter(user=self.user_profile).order_by("week", "day"))
+        self.assertEqual(sorted(created_ids), [user_program.id for user_program in user_programs])
+        days = len(get_pd_day_offsets(3))
+        self.assertEqual(len(user_programs), TOTAL_PROGRAM_DESIGN_WEEKS * days)
+        self.assertEqual(
+            [(user_program.week, user_program.day) for user_program in user_programs],
+            [(week, day) for week in range(1, TOTAL_PROGRAM_DESIGN_WEEKS + 1) for day in range(1, days + 1)],
+        )
+        for user_program in user_programs:
+            self.assertEqual(user_program.system_rir, user_program.week % 4)
+            self.assertTrue(user_program.is_personalized)
+            first_week = user_programs[user_program.day - 1]
+            self.assertEqual(
+                user_program.workout_date - first_week.workout_date,
+                datetime.timedelta(days=7 * (user_program.week - 1)),
+            )
+        self.assertEqual({user_program.start_date for user_program in user_programs}, {user_programs[0].start_date})
+        self.assertEqual({user_program.end_date for user_program in user_programs}, {user_programs[-1].workout_date})
+
+        self.assertEqual([exercise["exercise"] for exercise in user_programs[0].program_design], ["Squat", "Lunge"])
+        self.assertEqual([exercise["id"] for exercise in user_programs[0].program_design], [1, 2])
+        self.assertEqual(user_programs[1].program_design, [])
+
+    def test_missing_rir_week_creates_nothing(self):
+        self.create_reps_in_reserve(range(1, TOTAL_PROGRAM_DESIGN_WEEKS))
+        with self.assertRaisesMessage(Exception, f"RepsInReserve week {TOTAL_PROGRAM_DESIGN_WEEKS} doesn't exist"):
+            self.save({1: program_design()})
+        self.assertFalse(UserProgramDesign.objects.filter(user=self.user_profile).exists())
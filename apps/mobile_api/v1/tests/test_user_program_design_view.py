@@ -0,0 +1,65 @@
+from rest_framework.test import APITestCase
+
+from apps.mobile_api.v1.models import UserProgramDesign
+from apps.testing import CacheVersionsMixin, create_lookups, create_user_profile, create_user_programs, days_from_now
+
+
+class UserProgramDesignViewTest(CacheVersionsMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        lookups = create_lookups()
+        cls.user_profile = create_user_profile(
+            "athlete@joompa.local", lookups["goal"], lookups["sessions"][3], lookups["fitness_level"]
+        )
+        # two weeks of three workouts, the first one today
+        cls.user_programs = create_user_programs(cls.user_profile, days_from_now(0, 2, 4, 7, 9, 11))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user_profile.user_id)
+        self.url = f"/api/user-programs-designs/{self.user_profile.id}/"
+        dates = [user_program.workout_date.date() for user_program in self.user_programs]
+        self.date_range = {"startdate": dates[0].isoformat(), "endate": dates[-1].isoformat()}
+
+    def get_ids(self, **query_params):
+        response = self.client.get(self.url, {**self.date_range, **query_params})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row["id"] for row in response.json()["data"])
+
+    def test_week_filters_the_week_column(self):
+        self.assertEqual(self.get_ids(week=2), [user_program.id for user_program in self.user_programs[3:]])
+
+    def test_day_filters_the_day_column(self):
+        self.assertEqual(self.get_ids(day=1), [self.user_programs[0].id, self.user_programs[3].id])
+
+    def test_week_and_day_combine(self):
+        self.assertEqual(self.get_ids(week=1, day=3), [self.user_programs[2].id])
+
+    def test_without_week_or_day_returns_the_date_range(self):
+        self.assertEqual(self.get_ids(), [user_program.id for user_program in self.user_programs])
+
+    def test_non_integer_week_or_day_is_rejected(self):
+        for query_params in ({"week": "abc"}, {"day": "1.5"}, {"week": "-1"}):
+            with self.subTest(query_params=query_params):
+                response = self.client.get(self.url, {**self.date_range, **query_params})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()["status"])
+
+    def test_put_with_invalid_week_edits_nothing(self):
+        user_program = self.user_programs[0]
+        response = self.client.put(
+            f"{self.url}?week=abc",
+            {
+                "user_rir": 3,
+                "system_rir": 2,
+                "exercise_id": 1,
+                "user_program_design_id": user_program.id,
+                "system_calculated_reps": 10,
+                "system_calculated_weight": 20,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        stored = UserProgramDesign.objects.get(pk=user_program.pk)
+        self.assertEqual(stored.program_design, user_program.program_design)
+        self.assertEqual(stored.updated_at, user_program.updated_at)
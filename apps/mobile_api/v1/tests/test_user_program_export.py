@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from rest_framework.test import APITestCase
+
+from django.core.management import call_command
+
+from apps.accounts.models import User
+from apps.mobile_api.v1.exports import EXPORT_COLUMNS
+from apps.testing import create_lookups, create_user_profile, create_user_programs, days_from_now, program_design
+
+
+class UserProgramDesignExportTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin@joompa.local", "Admin", "Joompa", "password")
+        lookups = create_lookups()
+        cls.user_profile = create_user_profile(
+            "athlete@joompa.local", lookups["goal"], lookups["sessions"][3], lookups["fitness_level"]
+        )
+        cls.user_programs = create_user_programs(cls.user_profile, days_from_now(-2, 0, 2))
+        other_user_profile = create_user_profile("other@joompa.local", lookups["goal"], lookups["sessions"][3])
+        cls.other_user_programs = create_user_programs(other_user_profile, days_from_now(0))
+        # two sets on the first workout, every other workout has one
+        cls.user_programs[0].program_design = program_design(exercises=("Squat", "Lunge"))
+        cls.user_programs[0].save()
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **query_params):
+        response = self.client.get("/api/user-programs-designs/export/", query_params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_has_one_row_per_set(self):
+        response, content = self.export(user_profile=self.user_profile.id)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="user_programs.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(list(rows[0]), list(EXPORT_COLUMNS))
+        self.assertEqual(
+            [(int(row["user_program_design_id"]), int(row["set_index"]), row["exercise"]) for row in rows],
+            [
+                (self.user_programs[0].id, 0, "Squat"),
+                (self.user_programs[0].id, 1, "Lunge"),
+                (self.user_programs[1].id, 0, "Squat"),
+                (self.user_programs[2].id, 0, "Squat"),
+            ],
+        )
+        self.assertEqual(rows[0]["workout_date"], self.user_programs[0].workout_date.isoformat())
+
+    def test_ndjson_matches_the_csv_rows(self):
+        response, content = self.export(export_format="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            [row["user_program_design_id"] for row in rows], sorted(row["user_program_design_id"] for row in rows)
+        )
+        self.assertEqual(set(rows[0]), set(EXPORT_COLUMNS))
+        self.assertEqual(rows[0]["system_calculated_reps"], 10)
+
+    def test_date_filters(self):
+        today = self.user_programs[1].workout_date.date().isoformat()
+        _, content = self.export(export_format="ndjson", from_date=today, to_date=today)
+        self.assertEqual(
+            sorted({json.loads(line)["user_program_design_id"] for line in content.splitlines()}),
+            [self.user_programs[1].id, self.other_user_programs[0].id],
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        for query_params in ({"export_format": "xml"}, {"from_date": "yesterday"}, {"user_profile": "me"}):
+            with self.subTest(query_params=query_params):
+                response = self.client.get("/api/user-programs-designs/export/", query_params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_admins_only(self):
+        self.client.force_authenticate(self.user_profile.user_id)
+        response = self.client.get("/api/user-programs-designs/export/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_writes_the_same_export(self):
+        _, content = self.export(export_format="ndjson")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "user_programs.ndjson")
+            call_command("export_user_programs", export_format="ndjson", output=path, chunk_size=1)
+            with open(path) as file:
+                self.assertEqual(file.read(), content)
@@ -0,0 +1,99 @@
+import datetime
+
+from rest_framework.test import APITestCase
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.mobile_api.v1.models import UserProgramDesign
+from apps.testing import CacheVersionsMixin, create_lookups, create_user_profile, create_user_programs
+
+DAY = datetime.timedelta(days=1)
+
+
+class UserProgramRescheduleTest(CacheVersionsMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        lookups = create_lookups()
+        cls.user_profile = create_user_profile(
+            "athlete@joompa.local", lookups["goal"], lookups["sessions"][3], lookups["fitness_level"]
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user_profile.user_id)
+        # a minute ahead, so whole day differences to now are exact and no workout lands on another date
+        self.now = timezone.now().replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+
+    def reschedule(self, session):
+        response = self.client.put(f"/api/user-programs-designs/{self.user_profile.id}/", {"session": session})
+        self.assertEqual(response.status_code, 200)
+
+    def create_programs(self, *days, **fields):
+        return create_user_programs(self.user_profile, [self.now + day * DAY for day in days], **fields)
+
+    def stored(self, user_programs):
+        return [UserProgramDesign.objects.get(pk=user_program.pk) for user_program in user_programs]
+
+    def assertShifted(self, user_programs, days):
+        for user_program, stored, day in zip(user_programs, self.stored(user_programs), days):
+            self.assertEqual(stored.workout_date, user_program.workout_date + day * DAY)
+
+    def test_preponeone_moves_the_next_workout_to_now(self):
+        user_programs = self.create_programs(1, 3, 5)
+        started = timezone.now()
+        self.reschedule("preponeone")
+        stored = self.stored(user_programs)
+        self.assertLessEqual(abs(stored[0].workout_date - started), datetime.timedelta(minutes=1))
+        self.assertShifted(user_programs[1:], (0, 0))
+        self.assertEqual({user_program.end_date for user_program in stored}, {user_programs[-1].workout_date})
+
+    def test_preponeall_moves_the_next_workout_to_now_and_the_rest_by_the_session_gap(self):
+        user_programs = self.create_programs(1, 3, 5)
+        started = timezone.now()
+        self.reschedule("preponeall")
+        stored = self.stored(user_programs)
+        self.assertLessEqual(abs(stored[0].workout_date - started), datetime.timedelta(minutes=1))
+        # three sessions a week are one day apart
+        self.assertShifted(user_programs[1:], (-1, -1))
+        self.assertEqual({user_program.end_date for user_program in stored}, {user_programs[-1].workout_date - DAY})
+
+    def test_preponeall_leaves_past_and_completed_workouts(self):
+        user_programs = self.create_programs(-2, 1, 3)
+        UserProgramDesign.objects.filter(pk=user_programs[2].pk).update(is_complete=True)
+        self.reschedule("preponeall")
+        self.assertShifted((user_programs[0], user_programs[2]), (0, 0))
+
+    def test_preponeall_query_count_is_independent_of_program_length(self):
+        # the first request loads the config registry and catalog snapshot
+        self.reschedule("preponeall")
+        self.create_programs(1, 3, 5)
+        with CaptureQueriesContext(connection) as short_program:
+            self.reschedule("preponeall")
+        UserProgramDesign.objects.all().delete()
+        self.create_programs(*range(1, 60, 2))
+        with CaptureQueriesContext(connection) as long_program:
+            self.reschedule("preponeall")
+        self.assertEqual(len(short_program), len(long_program))
+
+    def test_postponeall_moves_todays_and_future_workouts_by_a_day(self):
+        user_programs = self.create_programs(-2, 0, 2, 4)
+        self.reschedule("postponeall")
+        self.assertShifted(user_programs, (0, 1, 1, 1))
+        self.assertEqual(
+            {user_program.end_date for user_program in self.stored(user_programs)},
+            {user_programs[-1].workout_date + DAY},
+        )
+
+    def test_rescheduleall_moves_the_program_from_the_first_missed_workout_to_today(self):
+        user_programs = self.create_programs(-5, -3, -1, 1, 3)
+        UserProgramDesign.objects.filter(pk=user_programs[0].pk).update(is_complete=True)
+        self.reschedule("rescheduleall")
+        self.assertShifted(user_programs, (0, 3, 3, 3, 3))
+        self.assertEqual(self.stored(user_programs)[1].workout_date.date(), self.now.date())
+        # the last workout moved, so every row's end_date moves with it
+        self.assertEqual(
+            {user_program.end_date for user_program in self.stored(user_programs)},
+            {user_programs[-1].workout_date + 3 * DAY},
+        )
@@ -0,0 +1,60 @@
+from rest_framework.test import APITestCase
+
+from apps.benchmarks.seed import seed_catalog, seed_users
+from apps.controlled.catalog import bump_catalog_version
+from apps.controlled.models import ControlProgram, ControlProgramInjury
+from apps.injury.models import Injury
+from apps.mobile_api.v1.models import UserInjury, UserProfile
+from apps.testing import CacheVersionsMixin
+
+
+class UserWorkoutProgramsInjuryTest(CacheVersionsMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(exercises=60)
+        bump_catalog_version()
+        cls.user_profile = UserProfile.objects.get(id=seed_users(1, weeks=2)[0])
+        cls.user_profile.is_personalized = True
+        cls.user_profile.save()
+        UserInjury.objects.filter(user_profile=cls.user_profile).delete()
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user_profile.user_id)
+
+    def generate(self):
+        response = self.client.post("/api/user-workout-programs/", {"is_personalized": True}, format="json")
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        exercises = {record["exercise"] for records in body["data"].values() for record in records}
+        messages = [message for messages in body["message"].values() for message in messages]
+        return exercises, messages
+
+    def test_injured_users_skip_the_excluded_exercises(self):
+        exercises, _ = self.generate()
+        self.assertTrue(exercises)
+        exercise = sorted(exercises)[0]
+        control_program = ControlProgram.objects.get(exercise__name=exercise)
+        injury = Injury.objects.filter(name__startswith="Benchmark ").order_by("id").first()
+        ControlProgramInjury.objects.create(
+            control_program=control_program, injury=injury, injury_type_id=injury.injury_type_id
+        )
+        UserInjury.objects.create(user_profile=self.user_profile, injury=injury, injury_type_id=injury.injury_type_id)
+        bump_catalog_version()
+
+        exercises, messages = self.generate()
+        self.assertNotIn(exercise, exercises)
+        self.assertIn(f"{exercise} skipped due to {{'{injury.name}'}}", messages)
+        excluded = set(
+            ControlProgramInjury.objects.filter(injury=injury).values_list("control_program__exercise__name", flat=True)
+        )
+        self.assertFalse(exercises & excluded)
+
+    def test_injuries_of_other_programs_keep_the_exercises(self):
+        exercises, _ = self.generate()
+        injury = Injury.objects.filter(name__startswith="Benchmark ").order_by("id").first()
+        ControlProgramInjury.objects.filter(injury=injury).delete()
+        UserInjury.objects.create(user_profile=self.user_profile, injury=injury, injury_type_id=injury.injury_type_id)
+        bump_catalog_version()
+
+        self.assertEqual(self.generate()[0], exercises)
@@ -1,10 +1,17 @@
 from django.urls import path
 
-from apps.mobile_api.v1.views import UserFeedbackView, UserProfileView, UserProgramDesignView, UserWorkoutProgramsView
+from apps.mobile_api.v1.views import (
+    UserFeedbackView,
+    UserProfileView,
+    UserProgramDesignExportView,
+    UserProgramDesignView,
+    UserWorkoutProgramsView,
+)
 
 urlpatterns = [
     path("user-workout-programs/", UserWorkoutProgramsView.as_view()),
     path("user-profile/", UserProfileView.as_view()),
     path("user-feedback/", UserFeedbackView.as_view()),
     path("user-programs-designs/<int:user_id>/", UserProgramDesignView.as_view()),
+    path("user-programs-designs/export/", UserProgramDesignExportView.as_view()),
 ]
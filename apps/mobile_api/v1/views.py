@@ -2,30 +2,27 @@ import datetime
 import enum
 import json as JSON
 import logging
-from string import Formatter
 
 from drf_yasg.openapi import IN_QUERY, Parameter
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, status
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from django.db import IntegrityError, transaction
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Max, Subquery
+from django.db.models.functions import Now
+from django.http import StreamingHttpResponse
 
-from apps.config.models import Config
+from apps.config.registry import get_config
 from apps.const import TOTAL_PROGRAM_DESIGN_WEEKS
-from apps.controlled.models import (
-    ControlProgram,
-    EquipmentGroup,
-    FirstEverCalc,
-    ProgramDesign,
-    SessionLength,
-    WorkoutFlow,
-)
-from apps.controlled.serializers import ProgramDesignSerializer
+from apps.controlled.catalog import CatalogSnapshot, get_catalog
+from apps.controlled.formula import Formula, compile_first_ever_calc
 from apps.equipment.models import EquipmentOption
-from apps.goal.models import Goal
-from apps.injury.models import Injury
+from apps.metrics import request_phase
+from apps.mobile_api.v1.exports import EXPORT_FORMATS, export_rows
 from apps.mobile_api.v1.models import (
     UserEquipment,
     UserFeedback,
@@ -48,7 +45,6 @@ from apps.mobile_api.v1.serializers import (
 )
 from apps.reps_in_reserve.models import RepsInReserve, RepsRange, RepsRating
 from apps.session.models import Session
-from apps.standard_variable.models import StandardVariable
 from apps.utils import response_json
 
 logger = logging.getLogger(__name__)
@@ -76,112 +72,261 @@ def get_current_date_missed_sessions(user_profile_id):
         return True
 
 
-def get_missed_sessions(user_profile_id):
-
-    user_profile = UserProfile.objects.get(pk=user_profile_id)
-    is_personalized = user_profile.is_personalized
+MISSED_SESSIONS_SQL = """
+WITH programs AS (
+    SELECT
+        upd.id,
+        upd.user_id,
+        upd.workout_date,
+        upd.is_complete,
+        upd.start_date,
+        (upd.workout_date AT TIME ZONE %(time_zone)s)::date AS workout_day,
+        (upd.workout_date AT TIME ZONE %(time_zone)s)::date < %(today)s AS is_past
+    FROM {user_program_design} upd
+    INNER JOIN {user_profile} up ON up.id = upd.user_id AND up.is_personalized = upd.is_personalized
+    WHERE upd.user_id = ANY(%(user_profile_ids)s)
+),
+ranked AS (
+    SELECT
+        programs.*,
+        ROW_NUMBER() OVER recent AS recent_rank,
+        FIRST_VALUE(start_date) OVER recent AS recent_start_date
+    FROM programs
+    WINDOW recent AS (PARTITION BY user_id, is_past ORDER BY workout_date DESC, id DESC)
+),
+completed AS (
+    SELECT
+        ranked.*,
+        MAX(workout_date) FILTER (
+            WHERE is_past AND is_complete AND start_date IS NOT DISTINCT FROM recent_start_date
+        ) OVER (PARTITION BY user_id) AS recent_complete_date
+    FROM ranked
+)
+SELECT
+    user_id,
+    COUNT(*) FILTER (WHERE is_past AND NOT is_complete) AS incomplete_count,
+    MIN(workout_date) FILTER (WHERE is_past AND NOT is_complete) AS first_incomplete_date,
+    BOOL_OR(is_complete) FILTER (WHERE is_past AND recent_rank = 1) AS is_recent_complete,
+    MAX(recent_complete_date) AS recent_complete_date,
+    COUNT(*) FILTER (
+        WHERE workout_day BETWEEN (recent_complete_date AT TIME ZONE %(time_zone)s)::date AND %(yesterday)s
+    ) AS range_count,
+    COUNT(*) FILTER (WHERE workout_day = %(today)s AND NOT is_complete) AS today_incomplete_count
+FROM completed
+GROUP BY user_id
+"""
+
+
+def summarize_missed_sessions(summary, current_date):
+    """Public Method
+
+    The method turns a row of fetch_missed_sessions_summaries into the get_missed_sessions result.
 
+    Parameters
+    ----------
+    summary : dict
+        row of fetch_missed_sessions_summaries, None when the user profile has no programs
+    current_date : datetime
+
+    Returns
+    -------
+    tuple
+        returns missed_sessions and response_data
+    """
     missed_sessions = 0
     response_data = {"can_reschedule": True}
+    if summary is None or summary["incomplete_count"] == 0:
+        return missed_sessions, response_data
+
+    # missed sessions
+    missed_sessions = summary["incomplete_count"]
+
+    # calculate date difference for first incomplete workout
+    difference = abs((summary["first_incomplete_date"].replace(tzinfo=None) - current_date).days)
+    if difference > 14:
+        # send can_reschedule indicator in response to hide continue button in app
+        response_data["can_reschedule"] = False
+
+    # ignore the whole scenario if last workout is completed
+    if summary["is_recent_complete"]:
+        missed_sessions = 0
+        response_data["can_reschedule"] = True
+
+    # missed sessions between last completed session and current day
+    elif summary["recent_complete_date"] is not None:
+        # subtract first completed session
+        missed_sessions = summary["range_count"] - 1
+        # check if date difference is more than 14
+        difference = abs((summary["recent_complete_date"].replace(tzinfo=None) - current_date).days)
+        if difference > 14:
+            # send can_reschedule indicator in response to hide continue button in app
+            response_data["can_reschedule"] = False
 
-    # get current date
-    current_date = datetime.datetime.now()
+    return missed_sessions, response_data
 
-    # get all previous in-complete programs
-    in_complete_programs = UserProgramDesign.objects.filter(
-        workout_date__date__lt=current_date,
-        is_complete=False,
-        user=user_profile_id,
-        is_personalized=is_personalized,
-    ).order_by("workout_date")
 
-    incomplete_programs_count = in_complete_programs.count()
+def fetch_missed_sessions_summaries(user_profile_ids, current_date):
+    """Public Method
 
-    if incomplete_programs_count > 0:
-        # missed sessions
-        missed_sessions = incomplete_programs_count
+    The method aggregates the programs of many user profiles with a single query. Programs of a user
+    profile are only considered when they match the profile's is_personalized flag.
 
-        # calculate date difference for first incomplete workout
-        difference = abs((in_complete_programs.first().workout_date.replace(tzinfo=None) - current_date).days)
-        if difference > 14:
-            # send can_reschedule indicator in response to hide continue button in app
-            response_data["can_reschedule"] = False
+    Parameters
+    ----------
+    user_profile_ids : list
+    current_date : datetime
 
-        # get most recent workout
-        recent_workout = UserProgramDesign.objects.filter(
-            user=user_profile_id,
-            workout_date__date__lt=current_date,
-            is_personalized=is_personalized,
-        ).order_by("workout_date")
+    Returns
+    -------
+    dict
+        returns user profile id to its summary row, user profiles without programs are left out
+    """
+    sql = MISSED_SESSIONS_SQL.format(
+        user_program_design=connection.ops.quote_name(UserProgramDesign._meta.db_table),
+        user_profile=connection.ops.quote_name(UserProfile._meta.db_table),
+    )
+    params = {
+        "time_zone": settings.TIME_ZONE,
+        "today": current_date.date(),
+        "yesterday": (current_date + datetime.timedelta(days=-1)).date(),
+        "user_profile_ids": [int(user_profile_id) for user_profile_id in user_profile_ids],
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
 
-        recent_workout = recent_workout[recent_workout.count() - 1]
-        starting_date = recent_workout.start_date
 
-        # ignore the whole scenario if last workout is completed
-        if recent_workout.is_complete is True:
-            missed_sessions = 0
-            response_data["can_reschedule"] = True
-            pass
-        else:
-            # logic to calculate missed sessions between last completed session and current day
-            recent_complete_workout = UserProgramDesign.objects.filter(
-                user=user_profile_id,
-                workout_date__date__lt=current_date,
-                is_complete=True,
-                start_date=starting_date,
-                is_personalized=is_personalized,
-            ).order_by("workout_date")
+def get_missed_sessions_bulk(user_profile_ids):
+    """Public Method
 
-            if recent_complete_workout.exists():
+    The method computes get_missed_sessions for many user profiles with a single query.
 
-                recent_complete_workout = recent_complete_workout[recent_complete_workout.count() - 1]
-                recent_complete_workout_date = recent_complete_workout.workout_date
-                missed_sessions = UserProgramDesign.objects.filter(
-                    workout_date__date__range=[
-                        recent_complete_workout_date,
-                        current_date + datetime.timedelta(days=-1),
-                    ],
-                    user=user_profile_id,
-                    is_personalized=is_personalized,
-                ).count()
-                # subtract first completed session
-                missed_sessions = missed_sessions - 1
-                # check if date difference is more than 14
-                difference = abs((recent_complete_workout_date.replace(tzinfo=None) - current_date).days)
-                if difference > 14:
-                    # send can_reschedule indicator in response to hide continue button in app
-                    response_data["can_reschedule"] = False
+    Parameters
+    ----------
+    user_profile_ids : list
 
-    return missed_sessions, response_data
+    Returns
+    -------
+    dict
+        returns user profile id to the (missed_sessions, response_data) tuple of get_missed_sessions
+    """
+    # get current date
+    current_date = datetime.datetime.now()
 
+    summaries = fetch_missed_sessions_summaries(user_profile_ids, current_date)
+    return {
+        int(user_profile_id): summarize_missed_sessions(summaries.get(int(user_profile_id)), current_date)
+        for user_profile_id in user_profile_ids
+    }
 
-def get_pd_dates(session_per_week):
+
+def get_missed_sessions(user_profile_id):
+    return get_missed_sessions_bulk([user_profile_id])[int(user_profile_id)]
+
+
+def get_pd_day_offsets(session_per_week):
     days = {1: "1:6", 2: "1:2", 3: "1:1", 4: "2:1", 5: "3:1", 6: "3:1"}
     no_of_workouts = int(days.get(session_per_week).split(":")[0])
     gaps = int(days.get(session_per_week).split(":")[1])
 
-    today_date = datetime.datetime.now()
     count = gaps + 1
-    dates = []
+    offsets = []
 
     for i in range(1, 7):
-        difference = datetime.timedelta(days=i)
         if count <= gaps:
             count += 1
         else:
-            dates.append(today_date + difference)
+            offsets.append(i)
             if count <= no_of_workouts:
                 count += 1
             else:
                 count = 1
-    return dates
+    return offsets
+
+
+def get_pd_dates(session_per_week):
+    today_date = datetime.datetime.now()
+    return [today_date + datetime.timedelta(days=i) for i in get_pd_day_offsets(session_per_week)]
+
+
+def get_system_rir_by_week(goal_id, fitness_level_id):
+    """Public Method
+
+    The method fetches the RepsInReserve weeks once and indexes the rir values by week number.
+
+    Parameters
+    ----------
+    goal_id : integer
+    fitness_level_id : integer
+
+    Returns
+    -------
+    dict
+        returns week number to system rir
+    """
+    reps_in_reserve = RepsInReserve.objects.only("id", "weeks").get(goal=goal_id, fitness_level=fitness_level_id)
+    system_rir_by_week = {}
+    for rir in reps_in_reserve.weeks:
+        if "week" not in rir.keys() or "rir" not in rir.keys():
+            raise Exception(f"Invalid format found in RepsInReserve against record id {reps_in_reserve.id}")
+        system_rir_by_week[int(rir["week"])] = rir["rir"]
+    return system_rir_by_week
+
+
+def bulk_create_user_program_designs(
+    user, workout_dates, program_designs, is_personalized, system_rir_by_week, start_date, end_date
+):
+    """Public Method
+
+    The method builds the rows of every week and day in memory and writes them with one batched insert.
+
+    Parameters
+    ----------
+    user : apps.mobile_api.v1.models.UserProfile
+    workout_dates : list
+        workout dates of the first week
+    program_designs : list
+        program design of each day, in the same order as workout_dates
+    is_personalized : boolean
+    system_rir_by_week : dict
+        week number to system rir, see get_system_rir_by_week
+    start_date : datetime
+    end_date : datetime
+
+    Returns
+    -------
+    list
+        returns the ids of the created UserProgramDesign rows
+    """
+    user_program_designs = []
+    for i in range(TOTAL_PROGRAM_DESIGN_WEEKS):
+        week = i + 1
+        if week not in system_rir_by_week:
+            raise Exception(f"RepsInReserve week {week} doesn't exist for Userprofile: {user.id}")
+        for counter, value in enumerate(workout_dates):
+            user_program_designs.append(
+                UserProgramDesign(
+                    user=user,
+                    day=counter + 1,
+                    program_design=program_designs[counter],
+                    workout_date=value + datetime.timedelta(days=i * 7),
+                    week=week,
+                    is_personalized=is_personalized,
+                    system_rir=system_rir_by_week[week],
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+            )
+    user_program_designs = UserProgramDesign.objects.bulk_create(user_program_designs)
+    return [user_program_design.id for user_program_design in user_program_designs]
 
 
 def save_user_program_designs(user, session_per_week, goal_id, is_personalized, data):
     no_of_sessions = Session.objects.get(pk=int(session_per_week)).value
     workout_dates = get_pd_dates(no_of_sessions)
     weeks = TOTAL_PROGRAM_DESIGN_WEEKS
-    system_rir_data = RepsInReserve.objects.get(goal=goal_id, fitness_level=user.fitness_level.id).weeks
+    system_rir_by_week = get_system_rir_by_week(goal_id, user.fitness_level_id)
     start_date = datetime.datetime.now()
     end_date_gap = datetime.timedelta(days=(weeks - 1) * 7)
 
@@ -191,30 +336,22 @@ def save_user_program_designs(user, session_per_week, goal_id, is_personalized,
     elif no_of_sessions > 1:
         end_date = workout_dates[len(workout_dates) - 1] + end_date_gap
 
-    for i in range(weeks):
+    program_designs = []
+    for counter in range(len(workout_dates)):
+        day = counter + 1
+        if day in data:
+            program_design = data[day]
+        else:
+            program_design = []
+        for exercise_counter, exercise in enumerate(program_design):
+            exercise["id"] = exercise_counter + 1
+        program_designs.append(program_design)
 
-        for counter, value in enumerate(workout_dates):
-            day = counter + 1
-            if day in data:
-                program_design = data[day]
-            else:
-                program_design = []
-
-            workout_date = value + datetime.timedelta(days=i * 7)
-            system_rir = system_rir_data[i]["rir"]
-            for exercise_counter, exercise in enumerate(program_design):
-                exercise["id"] = exercise_counter + 1
-            UserProgramDesign.objects.create(
-                user=user,
-                day=day,
-                program_design=program_design,
-                workout_date=workout_date,
-                week=i + 1,
-                is_personalized=is_personalized,
-                system_rir=system_rir,
-                start_date=start_date,
-                end_date=end_date,
-            )
+    created_user_program_ids = bulk_create_user_program_designs(
+        user, workout_dates, program_designs, is_personalized, system_rir_by_week, start_date, end_date
+    )
+    logger.info(f"UserPrograms created with IDs: {created_user_program_ids} for Userprofile: {user.id}")
+    return created_user_program_ids
 
 
 def re_schedule_user_program_designs(user_id, session_per_week, is_personalized, data, starting_date):
@@ -226,12 +363,12 @@ def re_schedule_user_program_designs(user_id, session_per_week, is_personalized,
         if is_personalized:
             goal_id = user.goal.id
         else:
-            goal_id = Goal.objects.get(pk=Config.objects.filter(key="goal")[0].value).id
+            goal_id = get_config().goal_id
 
         # create new workout data
         workout_dates = get_pd_dates(session_per_week)
         weeks = TOTAL_PROGRAM_DESIGN_WEEKS
-        system_rir_data = RepsInReserve.objects.get(goal=goal_id, fitness_level=user.fitness_level.id).weeks
+        system_rir_by_week = get_system_rir_by_week(goal_id, user.fitness_level_id)
         start_date = datetime.datetime.now()
         end_date_gap = datetime.timedelta(days=(weeks - 1) * 7)
         if session_per_week == 1:
@@ -246,26 +383,16 @@ def re_schedule_user_program_designs(user_id, session_per_week, is_personalized,
         old_user_programs = old_user_programs.delete()
         logger.info(f"Total UserPrograms deleted : {old_user_programs[0]} for Userprofile: {user_id}")
 
-        newly_created_user_program_ids = []
         # create and save new workouts
-        for i in range(weeks):
-            for counter, value in enumerate(workout_dates):
-                day = counter + 1
-                program_design = data[counter]
-                workout_date = value + datetime.timedelta(days=i * 7)
-                system_rir = system_rir_data[i]["rir"]
-                new_user_program_design = UserProgramDesign.objects.create(
-                    user=user,
-                    day=day,
-                    program_design=program_design,
-                    workout_date=workout_date,
-                    week=i + 1,
-                    is_personalized=is_personalized,
-                    system_rir=system_rir,
-                    start_date=start_date,
-                    end_date=end_date,
-                )
-                newly_created_user_program_ids.append(new_user_program_design.id)
+        newly_created_user_program_ids = bulk_create_user_program_designs(
+            user,
+            workout_dates,
+            [data[counter] for counter in range(len(workout_dates))],
+            is_personalized,
+            system_rir_by_week,
+            start_date,
+            end_date,
+        )
 
         user.is_pd_exist = True
         user.save()
@@ -304,36 +431,91 @@ def validate_reps_range(rep: int, reps_list: list):
     return rep in reps_list
 
 
+def fetch_formula_columns(user_profile_ids: list, formula_type: str, variables: list):
+    """Public Method
+
+    The method collects formula variables of many users as columns for
+    apps.controlled.formula.evaluate_first_ever_calc_batch, the way UserWorkoutProgramsView reads them for one
+    user. A Baseline variable takes the user's baseline answer, then the user's standard variable, and defaults
+    to 0. An FSC formula reads the Weight standard variable and the fitness level of the profile. Where the
+    per-user calculation fails the values are None, so that user's result is invalid.
+
+    Parameters
+    ----------
+    user_profile_ids : list
+    formula_type : str
+        Baseline or FSC
+    variables : list
+        variable names used by the formulas
+
+    Returns
+    -------
+    tuple
+        returns the user profile ids in column order and the columns dict
+    """
+    user_profiles = list(
+        UserProfile.objects.filter(id__in=user_profile_ids)
+        .select_related("fitness_level")
+        .only("id", "baseline_assessment", "fitness_level__fitness_level")
+        .order_by("id")
+    )
+    standard_variables = {}
+    for record in UserStandardVariable.objects.filter(
+        user_profile__in=user_profile_ids, standard_variable_id__name__in=[*variables, "Weight"]
+    ).values("user_profile_id", "standard_variable_id__name", "value"):
+        standard_variables[(record["user_profile_id"], record["standard_variable_id__name"])] = record["value"]
+
+    columns = {variable: [] for variable in variables}
+    for user_profile in user_profiles:
+        if formula_type == "Baseline":
+            answers = (
+                {json["question"]: json["value"] for json in user_profile.baseline_assessment}
+                if user_profile.baseline_assessment is not None
+                else None
+            )
+            for variable in variables:
+                if answers is None:
+                    columns[variable].append(None)
+                else:
+                    columns[variable].append(
+                        answers.get(variable, standard_variables.get((user_profile.id, variable), 0))
+                    )
+            continue
+        # the per-user FSC calculation fails without both of them, whichever the formula uses
+        fsc_variables = (
+            {
+                "Weight": standard_variables[(user_profile.id, "Weight")],
+                "fitness_level": user_profile.fitness_level.fitness_level,
+            }
+            if (user_profile.id, "Weight") in standard_variables and user_profile.fitness_level
+            else {}
+        )
+        for variable in variables:
+            columns[variable].append(fsc_variables.get(variable))
+    return [user_profile.id for user_profile in user_profiles], columns
+
+
 class UserWorkoutProgramsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def __user_equipment_list(self, user_profile: UserProfile):
-        equipment_list = user_profile.user_profile_equipments.all().values_list("equipment", flat=True)
-        return list(set(equipment_list))
-
-    def __validate_equipment(self, control_program: ControlProgram, user_profile: UserProfile):
+    def __user_equipment_list(self, user_equipments: list):
+        return list({user_equipment.equipment_id for user_equipment in user_equipments})
 
-        equipment_list = self.__user_equipment_list(user_profile)
-        combination_list = control_program.equipment_relations.all().values_list("equipment_combination", flat=True)
-        for combination in combination_list:
-            cp_equipments = set(
-                EquipmentGroup.objects.filter(equipment_combination_id=combination).values_list("equipment", flat=True)
-            )
-            if cp_equipments.issubset(set(equipment_list)):
-                return True, combination
-        return False, 0
+    def __validate_equipment(self, catalog: CatalogSnapshot, control_program: dict, equipment_mask: int):
+        combination = catalog.matching_combination(control_program["id"], equipment_mask)
+        if combination is None:
+            return False, 0
+        return True, combination
 
     def __populate_default_values(self, query_parameters: dict, user_profile):
         configurations = query_parameters.copy()
         keys = query_parameters.keys()
         default_config = None
         if not configurations["is_personalized"]:
-            default_config = Config.objects.filter(
-                key__in=["goal", "total_session_length", "session_per_week"]
-            ).values("key", "value")
-            for record in default_config:
-                if record["key"] not in keys:
-                    configurations[record["key"]] = record["value"]
+            default_config = get_config()
+            for key in ["goal", "total_session_length", "session_per_week"]:
+                if key not in keys and key in default_config.values:
+                    configurations[key] = default_config[key]
         else:
             configurations = {
                 "goal": user_profile.goal.id,
@@ -344,107 +526,63 @@ class UserWorkoutProgramsView(APIView):
 
         return configurations
 
-    def __variables_list(self, string: str):
-        return [fn for _, fn, _, _ in Formatter().parse(string) if fn is not None]
-
-    def __calculate_weight_fsc(self, first_ever: FirstEverCalc, user_profile: UserProfile):
-        actual = first_ever.weight_formula_string
-        variable = StandardVariable.objects.filter(name="Weight")
-        if not variable.exists():
-            raise Exception("Standard Variable `Weight` doesn't exist in the database")
-        user_standard_variable = UserStandardVariable.objects.filter(
-            user_profile=user_profile, standard_variable_id=variable[0]
-        )
-        if not user_standard_variable.exists():
+    def __fsc_variables(self, user_profile: UserProfile, standard_variables: dict) -> dict:
+        if "Weight" not in standard_variables:
             raise Exception(f"User Standard Variable `Weight` doesn't exist in the db against {user_profile.user_id}")
-        body_weight = user_standard_variable[0].value
-        formula = actual.format(Weight=body_weight, fitness_level=user_profile.fitness_level.fitness_level)
-        return int(eval(formula))
+        return {"Weight": standard_variables["Weight"], "fitness_level": user_profile.fitness_level.fitness_level}
+
+    def __baseline_variables(self, formula: Formula, user_profile: UserProfile, standard_variables: dict) -> dict:
+        variable_dict = {name: standard_variables.get(name, 0) for name in formula.variables}
+        for json in user_profile.baseline_assessment:
+            if json["question"] in variable_dict:
+                variable_dict[json["question"]] = json["value"]
+        return variable_dict
+
+    def __calculate_weight_fsc(self, first_ever: dict, user_profile: UserProfile, standard_variables: dict):
+        formula = compile_first_ever_calc(first_ever, "weight_formula_string")
+        return int(formula.evaluate(self.__fsc_variables(user_profile, standard_variables)))
 
-    def __calculate_reps_fsc(self, first_ever: FirstEverCalc, user_profile: UserProfile):
-        actual = first_ever.reps_formula_string
+    def __calculate_reps_fsc(self, first_ever: dict, user_profile: UserProfile, standard_variables: dict):
+        actual = first_ever["reps_formula_string"]
         if actual.isdigit():
             return int(actual)
-        else:
-            variable = StandardVariable.objects.filter(name="Weight")
-            if not variable.exists():
-                raise Exception("Standard Variable `Weight` doesn't exist in the database")
-            user_standard_variable = UserStandardVariable.objects.filter(
-                user_profile=user_profile, standard_variable_id=variable[0]
-            )
-            if not user_standard_variable.exists():
-                raise Exception(
-                    f"User Standard Variable `Weight` doesn't exist in the database against {user_profile.user_id}"
-                )
-            body_weight = user_standard_variable[0].value
-            formula = actual.format(Weight=body_weight, fitness_level=user_profile.fitness_level.fitness_level)
-            return int(eval(formula))
+        formula = compile_first_ever_calc(first_ever, "reps_formula_string")
+        return int(formula.evaluate(self.__fsc_variables(user_profile, standard_variables)))
 
-    def __calculate_weight_baseline(self, first_ever: FirstEverCalc, user_profile: UserProfile):
-        objects = user_profile.baseline_assessment
-        if objects is None:
+    def __calculate_weight_baseline(self, first_ever: dict, user_profile: UserProfile, standard_variables: dict):
+        if user_profile.baseline_assessment is None:
             return 0
-        string_formula = first_ever.weight_formula_string
-        variable_list = self.__variables_list(string_formula)
-        variable_dict = self.__populate_formulas_variables(user_profile, variable_list)
-        for json in objects:
-            if json["question"] in variable_list:
-                variable_dict[json["question"]] = json["value"]
-        keys = variable_dict.keys()
-        for variable in variable_list:
-            if variable not in keys:
-                variable_dict[variable] = 0
-        formula = string_formula.format(**variable_dict)
-        return int(eval(formula))
-
-    def __calculate_reps_baseline(self, first_ever: FirstEverCalc, user_profile: UserProfile):
-        objects = user_profile.baseline_assessment
-        reps_formula_string = first_ever.reps_formula_string
-        variable_list = self.__variables_list(reps_formula_string)
-        variable_dict = self.__populate_formulas_variables(user_profile, variable_list)
-        for json in objects:
-            if json["question"] in variable_list:
-                variable_dict[json["question"]] = json["value"]
-        keys = variable_dict.keys()
-        for variable in variable_list:
-            if variable not in keys:
-                variable_dict[variable] = 0
-        formula = reps_formula_string.format(**variable_dict)
-        return int(eval(formula))
-
-    def __populate_formulas_variables(self, user_profile: UserProfile, variables: list) -> dict:
-        standard_variables = UserStandardVariable.objects.filter(user_profile=user_profile)
-        sv_dict = {
-            sv.standard_variable_id.name: sv.value
-            for sv in standard_variables
-            if sv.standard_variable_id.name in variables
-        }
+        formula = compile_first_ever_calc(first_ever, "weight_formula_string")
+        return int(formula.evaluate(self.__baseline_variables(formula, user_profile, standard_variables)))
 
-        return sv_dict
+    def __calculate_reps_baseline(self, first_ever: dict, user_profile: UserProfile, standard_variables: dict):
+        formula = compile_first_ever_calc(first_ever, "reps_formula_string")
+        return int(formula.evaluate(self.__baseline_variables(formula, user_profile, standard_variables)))
+
+    def __user_standard_variables(self, user_profile: UserProfile) -> dict:
+        standard_variables = UserStandardVariable.objects.filter(user_profile=user_profile).select_related(
+            "standard_variable_id"
+        )
+        return {sv.standard_variable_id.name: sv.value for sv in standard_variables}
 
     def __adjust_weights_reps(
-        self, control_program: ControlProgram, calculated_reps: int, calculated_weight: int, required_weight: int
+        self, control_program: dict, calculated_reps: int, calculated_weight: int, required_weight: int
     ):
         logger.info(
-            f"control_program id: {control_program.id}, calculated_reps: {calculated_reps}, calculated_weight: "
+            f"control_program id: {control_program['id']}, calculated_reps: {calculated_reps}, calculated_weight: "
             f"{calculated_weight}, closest_weight: {required_weight}"
         )
         logger.info(f"difference: {(required_weight - calculated_weight)}")
         weight_difference = (required_weight - calculated_weight) // 2.5  # -5 = 5 - 10
         logger.info(f"weight_difference: {weight_difference}")
-        reps = weight_difference * float(control_program.reps) // float(control_program.weight)  # -10 = -5 * 2 / 1
+        # -10 = -5 * 2 / 1
+        reps = weight_difference * float(control_program["reps"]) // float(control_program["weight"])
         logger.info(f"reps: {reps}, updated_reps: {calculated_reps - reps}")
         return calculated_reps - reps  # 10 - (-10)
 
-    def __validate_injuries(self, user_profile, control_program):
-        program_injuries = set(control_program.cp_injuries.all().values_list("injury", flat=True))
-        user_injuries = set(user_profile.user_profile_injuries.all().values_list("injury", flat=True))
-        result = program_injuries.intersection(user_injuries)
-        if len(result) > 0:
-            # replace id within name to display injuries name in message
-            return True, {injury.name for injury in Injury.objects.filter(id__in=result)}
-        else:
-            return False, result
+    def __injury_names(self, catalog: CatalogSnapshot, user_injuries: set, control_program: dict):
+        # replace id within name to display injuries name in message
+        return {catalog.injuries[injury] for injury in catalog.program_injuries(control_program["id"]) & user_injuries}
 
     def __calculate_index(self, session, day):
         if day <= session:
@@ -452,14 +590,6 @@ class UserWorkoutProgramsView(APIView):
         else:
             day % session + 1
 
-    def __filter_control_programs(self, variance, body_part, body_part_classification, equip_op_list):
-        return ControlProgram.objects.filter(
-            variance=variance,
-            body_part=body_part,
-            body_part_classification=body_part_classification,
-            equipment_option__in=equip_op_list,
-        ).order_by("created_at")
-
     def __get_RepsInReserve(self, goal, fitness_level):
         reps_in_reserve = RepsInReserve.objects.filter(goal=goal, fitness_level=fitness_level)
         if reps_in_reserve.exists():
@@ -471,9 +601,9 @@ class UserWorkoutProgramsView(APIView):
                     return rir["rir"]
         return 0
 
-    def __user_weight_list(self, user_profile: UserProfile):
+    def __user_weight_list(self, user_equipments: list):
         user_weight_list = list()
-        for equipment in user_profile.user_profile_equipments.all():
+        for equipment in user_equipments:
             if equipment.weights is not None:
                 user_weight_list.extend([float(key) for key in dict(equipment.weights).keys()])
         return user_weight_list
@@ -519,14 +649,19 @@ class UserWorkoutProgramsView(APIView):
         data = {}
         exercise_list = []
         skipped_pd = []  # temp variable
+        catalog = get_catalog()
         configurations = self.__populate_default_values(query_parameters=request_data, user_profile=user_profile)
         logger.info(f"user_profile {user_profile.id} configurations data: {configurations}")
-        all_equipment_options = EquipmentOption.objects.all().values("id", "name")
-        _equipment_options = {record["name"]: record["id"] for record in all_equipment_options}
+        _equipment_options = catalog.equipment_options
         user_equipment_options = {}
-        equipment_options = user_profile.user_profile_equipments.all()
+        equipment_options = list(
+            user_profile.user_profile_equipments.select_related("equipment", "equipment_option").order_by("id")
+        )
         if equipment_options:
-            logger.info(f"user_profile {user_profile.id} equipment_options data: {equipment_options.values('id')}")
+            logger.info(
+                f"user_profile {user_profile.id} equipment_options data: "
+                f"{[{'id': _equipment_option.id} for _equipment_option in equipment_options]}"
+            )
             for _equipment_option in equipment_options:
                 user_equipment_options[_equipment_option.equipment_option.name] = _equipment_option.equipment_option.id
             if "2 weights" in user_equipment_options.keys():
@@ -546,7 +681,16 @@ class UserWorkoutProgramsView(APIView):
         logger.info(f"user_profile {user_profile.id} configurations with equipment_option data: {configurations}")
         reps_list = fetch_reps_list(configurations["goal"])
         reps_in_reserve = self.__get_RepsInReserve(configurations["goal"], user_profile.fitness_level)
-        user_weight_list = self.__user_weight_list(user_profile)
+        user_weight_list = self.__user_weight_list(equipment_options)
+        user_equipment_list = self.__user_equipment_list(equipment_options)
+        equipment_mask = catalog.equipment_mask(user_equipment_list)
+        user_injuries = set(user_profile.user_profile_injuries.values_list("injury", flat=True))
+        # injuries only exclude control programs from personalized programs
+        excluded_programs = (
+            catalog.excluded_control_programs(user_injuries) if configurations["is_personalized"] else frozenset()
+        )
+        standard_variables = self.__user_standard_variables(user_profile)
+        equipment_types = sorted({equipment.weight_type for equipment in equipment_options})
 
         logger.info(
             f"user_profile id: {user_profile.id} \n reps_list data: {reps_list} \n reps_in_reserve data: "
@@ -554,110 +698,80 @@ class UserWorkoutProgramsView(APIView):
         )
 
         message = {}
-        session_ = Session.objects.filter(id=configurations["session_per_week"])
-        if not session_.exists():
+        session_value = catalog.sessions.get(int(configurations["session_per_week"]))
+        if session_value is None:
             message = f"Session object against id {configurations['session_per_week']} doesn't exist!"
             logger.info(message)
             return Response(response_json(status=False, data=None, message=message))
-        session_value = session_[0].value
         for i in range(1, session_value + 1):
             data[i] = []
             message[i] = []
-        for session_length in SessionLength.objects.filter(
-            equipment_option=configurations["equipment_option"],
-            goal=configurations["goal"],
-            total_session_length=configurations["total_session_length"],
-        ).order_by("created_at"):
+        for session_length in catalog.session_lengths(
+            configurations["equipment_option"], configurations["goal"], configurations["total_session_length"]
+        ):
+            goal_name = catalog.goals[session_length["goal_id"]]
             logger.info(
-                f"Fetching session_length: {session_length.id} for user_profile {user_profile.id}"
+                f"Fetching session_length: {session_length['id']} for user_profile {user_profile.id}"
                 f" against equipment_option: {configurations['equipment_option']} goal: {configurations['goal']}"
                 f" session_length: {configurations['total_session_length']}"
             )
-            for workout in (
-                WorkoutFlow.objects.filter(session_length=session_length.id).exclude(value="").order_by("created_at")
-            ):
+            for workout in catalog.workout_flows(session_length["id"]):
                 logger.info(
-                    f"Fetching workout {workout.id} for user_profile {user_profile.id}"
-                    f" against session_length: {session_length.id}"
+                    f"Fetching workout {workout['id']} for user_profile {user_profile.id}"
+                    f" against session_length: {session_length['id']}"
                 )
-                for program_design in ProgramDesign.objects.filter(
-                    sequence_flow=workout.id, session_per_week=configurations["session_per_week"]
-                ).order_by("created_at"):
+                for program_design in catalog.program_designs(workout["id"], configurations["session_per_week"]):
                     logger.info(
-                        f"Fetching program_design {program_design.id} for user_profile {user_profile.id} "
-                        f"against workout: {workout.id}-{workout.value} session_per_week: "
+                        f"Fetching program_design {program_design['id']} for user_profile {user_profile.id} "
+                        f"against workout: {workout['id']}-{workout['value']} session_per_week: "
                         f"{configurations['session_per_week']}"
                     )
-                    control_programs = self.__filter_control_programs(
-                        program_design.variance,
-                        program_design.body_part,
-                        program_design.body_part_classification,
+                    control_programs = catalog.control_programs(
+                        program_design["variance_id"],
+                        program_design["body_part_id"],
+                        program_design["body_part_classification_id"],
                         equip_op_list,
                     )
-                    if not control_programs.exists():
-                        pd_data = ProgramDesignSerializer(program_design, many=False).data
-                        skipped_pd.append(pd_data)
-                        classification = (
-                            program_design.body_part_classification.id
-                            if program_design.body_part_classification is not None
-                            else None
-                        )
-                        message[self.__calculate_index(session_value, program_design.day)].append(
+                    if not control_programs:
+                        skipped_pd.append(program_design)
+                        message[self.__calculate_index(session_value, program_design["day"])].append(
                             f"Control Program not found against program design  parameters variance = "
-                            f"{program_design.variance.id if program_design.variance is not None else None}, "
-                            f"body part id = {program_design.body_part.id}, body_part_name = "
-                            f"{program_design.body_part.name}"
+                            f"{program_design['variance_id']}, "
+                            f"body part id = {program_design['body_part_id']}, body_part_name = "
+                            f"{program_design['body_part__name']}"
                             f"body_part_classification = "
-                            f"{classification} and equipment option = "
-                            f"{_equipment_options.keys()}, pd_id={program_design.id}, workflow_id= {workout.id}"
+                            f"{program_design['body_part_classification_id']} and equipment option = "
+                            f"{_equipment_options.keys()}, pd_id={program_design['id']}, workflow_id= {workout['id']}"
                         )
                         logger.info(f"Skipped Control Programs for user_profile {user_profile.id}: {len(message)}")
                     logging.info(
-                        f"Valid Control Programs for user_profile: {user_profile.id}: {control_programs.count()} "
-                        f"against program_design: {program_design.id}"
+                        f"Valid Control Programs for user_profile: {user_profile.id}: {len(control_programs)} "
+                        f"against program_design: {program_design['id']}"
                     )
-                    index = self.__calculate_index(program_design.session_per_week.value, program_design.day)
+                    index = self.__calculate_index(session_value, program_design["day"])
                     for control_program in control_programs:
-                        logger.info(
-                            f"Fetching control_program {control_program.id} for exercise: "
-                            f"{control_program.exercise.name}"
-                        )
-                        if control_program.exercise.name not in exercise_list:
-                            exercise_list.append(control_program.exercise.name)
+                        exercise_name = control_program["exercise__name"]
+                        logger.info(f"Fetching control_program {control_program['id']} for exercise: {exercise_name}")
+                        if exercise_name not in exercise_list:
+                            exercise_list.append(exercise_name)
                             # skip validation for equipment option None
-                            if _equipment_options["None"] == control_program.equipment_option.id:
+                            if _equipment_options["None"] == control_program["equipment_option_id"]:
                                 valid_eq, com_id = True, 0
 
                             else:
-                                valid_eq, com_id = self.__validate_equipment(control_program, user_profile)
+                                valid_eq, com_id = self.__validate_equipment(catalog, control_program, equipment_mask)
 
                             if not valid_eq:
-                                message[self.__calculate_index(session_value, program_design.day)].append(
-                                    f"Equipment {set(self.__user_equipment_list(user_profile))} combination against"
-                                    f" control_program id {control_program.id} does not exist!!"
-                                )
-                                logger.info(f"Invalid equipment for user_profile {user_profile.id}: {message}")
-                                continue
-                            valid_injuries = self.__validate_injuries(user_profile, control_program)
-                            if valid_injuries[0] and configurations["is_personalized"]:
-                                message[self.__calculate_index(session_value, program_design.day)].append(
-                                    f"Equipment {set(self.__user_equipment_list(user_profile))} Combination against"
-                                    f" control program id {control_program.id} does not exist"
+                                message[self.__calculate_index(session_value, program_design["day"])].append(
+                                    f"Equipment {set(user_equipment_list)} combination against"
+                                    f" control_program id {control_program['id']} does not exist!!"
                                 )
                                 logger.info(f"Invalid equipment for user_profile {user_profile.id}: {message}")
                                 continue
-                            valid_injuries = self.__validate_injuries(user_profile, control_program)
-                            if valid_injuries[0] and configurations["is_personalized"]:
-                                message[self.__calculate_index(session_value, program_design.day)].append(
-                                    f"Equipment {set(self.__user_equipment_list(user_profile))} Combination against"
-                                    f" control program id {control_program.id} does not exist"
-                                )
-                                logger.info(f"Invalid equipment for user_profile {user_profile.id}: {message}")
-                                continue
-                            valid_injuries = self.__validate_injuries(user_profile, control_program)
-                            if valid_injuries[0] and configurations["is_personalized"]:
-                                message[self.__calculate_index(session_value, program_design.day)].append(
-                                    f"{control_program.exercise.name} skipped due to {valid_injuries[1]}"
+                            if control_program["id"] in excluded_programs:
+                                injury_names = self.__injury_names(catalog, user_injuries, control_program)
+                                message[self.__calculate_index(session_value, program_design["day"])].append(
+                                    f"{exercise_name} skipped due to {injury_names}"
                                 )
                                 logger.info(f"Invalid injury for user_profile {user_profile.id}: {message}")
                                 continue
@@ -668,77 +782,74 @@ class UserWorkoutProgramsView(APIView):
                             system_calculated_reps = (0,)
                             system_calculated_weight = (0,)
                             logger.info(
-                                f"Before Calculation for control_program: {control_program.id} user_calculated_reps: "
-                                f"{user_calculated_reps}, user_calculated_weight: {user_calculated_weight}, "
-                                f"system_calculated_reps: {system_calculated_reps}, system_calculated_weight: "
-                                f"{system_calculated_weight}"
+                                f"Before Calculation for control_program: {control_program['id']} "
+                                f"user_calculated_reps: {user_calculated_reps}, user_calculated_weight: "
+                                f"{user_calculated_weight}, system_calculated_reps: {system_calculated_reps}, "
+                                f"system_calculated_weight: {system_calculated_weight}"
                             )
                             if configurations["is_personalized"]:
-                                first_ever = control_program.fec_control_programs.filter(type="Baseline")
-                                if not first_ever.exists():
+                                first_ever = catalog.first_ever_calc(control_program["id"], "Baseline")
+                                if first_ever is None:
                                     logger.info(
-                                        f"Baseline Formula against control program: {control_program.id}"
-                                        f" exercise: {control_program.exercise.name} doesn't exist"
+                                        f"Baseline Formula against control program: {control_program['id']}"
+                                        f" exercise: {exercise_name} doesn't exist"
                                     )
                                 else:
                                     try:
                                         # If equipment option is none weight calculation will be skipped
-                                        if _equipment_options["None"] != control_program.equipment_option.id:
+                                        if _equipment_options["None"] != control_program["equipment_option_id"]:
                                             calculated_weight = self.__calculate_weight_baseline(
-                                                first_ever[0], user_profile
+                                                first_ever, user_profile, standard_variables
                                             )
-                                        calculated_reps = self.__calculate_reps_baseline(first_ever[0], user_profile)
+                                        calculated_reps = self.__calculate_reps_baseline(
+                                            first_ever, user_profile, standard_variables
+                                        )
                                     except Exception as e:
                                         logger.exception(
                                             f"Error occurred due to invalid Baseline formula format : {e.args[0]} "
-                                            f"against control program: {control_program.id} exercise: "
-                                            f"{control_program.exercise.name}"
+                                            f"against control program: {control_program['id']} exercise: "
+                                            f"{exercise_name}"
                                         )
                             if (
                                 calculated_weight == 0
                                 and configurations["is_personalized"]
                                 # If equipment option is none weight calculation will be skipped
-                                and _equipment_options["None"] != control_program.equipment_option.id
+                                and _equipment_options["None"] != control_program["equipment_option_id"]
                             ) or (not configurations["is_personalized"]):
-                                first_ever = control_program.fec_control_programs.filter(type="FSC")
-                                if not first_ever.exists():
+                                first_ever = catalog.first_ever_calc(control_program["id"], "FSC")
+                                if first_ever is None:
                                     logger.info(
-                                        f"FSC Formula against control program: {control_program.id}"
-                                        f" exercise: {control_program.exercise.name} doesn't exist"
+                                        f"FSC Formula against control program: {control_program['id']}"
+                                        f" exercise: {exercise_name} doesn't exist"
                                     )
-                                    # if configurations["is_personalized"]:
-                                    #     message = f"Baseline and FSC Formulas against control program: {control_program.id}  \  # noqa: E501
-                                    #         exercise: {control_program.exercise.name} don't exist"
-                                    # else:
-                                    #     message = f"FSC Formulas against control program: {control_program.id} \
-                                    #         exercise: {control_program.exercise.name} don't exist"
-                                    # return Response(response_json(status=False, data=None, message=message))
                                 else:
                                     try:
                                         # If equipment option is none weight calculation will be skipped
-                                        if _equipment_options["None"] != control_program.equipment_option.id:
+                                        if _equipment_options["None"] != control_program["equipment_option_id"]:
                                             calculated_weight = self.__calculate_weight_fsc(
-                                                first_ever[0], user_profile
+                                                first_ever, user_profile, standard_variables
                                             )
-                                        calculated_reps = self.__calculate_reps_fsc(first_ever[0], user_profile)
+                                        calculated_reps = self.__calculate_reps_fsc(
+                                            first_ever, user_profile, standard_variables
+                                        )
                                     except Exception as e:
                                         logger.exception(
                                             f"Error Occur due to invalid FSC formula format : {e.args[0]} "
-                                            f" against control program: {control_program.id} exercise: "
-                                            f" {control_program.exercise.name}"
+                                            f" against control program: {control_program['id']} exercise: "
+                                            f" {exercise_name}"
                                         )
                             if (
                                 calculated_weight <= 0
                                 # If equipment option is none weight calculation will be skipped
-                                and _equipment_options["None"] != control_program.equipment_option.id
+                                and _equipment_options["None"] != control_program["equipment_option_id"]
                             ):
-                                message[self.__calculate_index(session_value, program_design.day)].append(
-                                    f"Calculated Weight against {control_program.exercise.name} is: \
+                                message[self.__calculate_index(session_value, program_design["day"])].append(
+                                    f"Calculated Weight against {exercise_name} is: \
                                         {calculated_weight}"
                                 )
                                 continue
                             logger.info(
-                                f"After Formula for control_program: {control_program.id}: user_calculated_reps: "
+                                f"After Formula for control_program: {control_program['id']}: user_calculated_reps: "
                                 f"{user_calculated_reps}, user_calculated_weight: {user_calculated_weight}, "
                                 f"system_calculated_reps: {system_calculated_reps}, system_calculated_weight: "
                                 f"{system_calculated_weight} calculated_weight: {calculated_weight} "
@@ -753,9 +864,9 @@ class UserWorkoutProgramsView(APIView):
                             )
                             if calculated_weight in user_weight_list:
                                 if not validate_reps_range(calculated_reps, reps_list):
-                                    message[self.__calculate_index(session_value, program_design.day)].append(
-                                        f"Calculated Rep {calculated_reps} for {control_program.exercise.name} against"
-                                        f" {session_length.goal.name} does not exist"
+                                    message[self.__calculate_index(session_value, program_design["day"])].append(
+                                        f"Calculated Rep {calculated_reps} for {exercise_name} against"
+                                        f" {goal_name} does not exist"
                                     )
                                     continue
                                 user_calculated_reps = calculated_reps
@@ -768,12 +879,12 @@ class UserWorkoutProgramsView(APIView):
                                     f"system_calculated_reps: {system_calculated_reps}, system_calculated_weight: "
                                     f"{system_calculated_weight}"
                                 )
-                            elif _equipment_options["None"] == control_program.equipment_option.id:
+                            elif _equipment_options["None"] == control_program["equipment_option_id"]:
 
                                 if not validate_reps_range(calculated_reps, reps_list):
-                                    message[self.__calculate_index(session_value, program_design.day)].append(
-                                        f"Calculated Rep {calculated_reps} for {control_program.exercise.name} against"
-                                        f" {session_length.goal.name} does not exist"
+                                    message[self.__calculate_index(session_value, program_design["day"])].append(
+                                        f"Calculated Rep {calculated_reps} for {exercise_name} against"
+                                        f" {goal_name} does not exist"
                                     )
                                     continue
                                 user_calculated_reps = calculated_reps
@@ -798,14 +909,14 @@ class UserWorkoutProgramsView(APIView):
                                 )
                                 logger.info(f"Closest weight: {closest_weight}, Adjusted Reps: {adjusted_reps}")
                                 if adjusted_reps <= 0:
-                                    message[self.__calculate_index(session_value, program_design.day)].append(
-                                        f"Adjusted Reps for {control_program.exercise.name}is: {adjusted_reps}"
+                                    message[self.__calculate_index(session_value, program_design["day"])].append(
+                                        f"Adjusted Reps for {exercise_name}is: {adjusted_reps}"
                                     )
                                     continue
                                 elif not validate_reps_range(adjusted_reps, reps_list):
-                                    message[self.__calculate_index(session_value, program_design.day)].append(
-                                        f"Calculated Reps {adjusted_reps} for {control_program.exercise.name} against "
-                                        f"{session_length.goal.name} does not exist!!!"
+                                    message[self.__calculate_index(session_value, program_design["day"])].append(
+                                        f"Calculated Reps {adjusted_reps} for {exercise_name} against "
+                                        f"{goal_name} does not exist!!!"
                                     )
                                     continue
 
@@ -813,54 +924,50 @@ class UserWorkoutProgramsView(APIView):
                                 user_calculated_weight = calculated_weight
                                 system_calculated_weight = closest_weight
                                 system_calculated_reps = adjusted_reps
-                            equipments = [
-                                (_eq.equipment)
-                                for _eq in EquipmentGroup.objects.filter(equipment_combination_id=com_id)
-                            ]
+                            equipments = catalog.combination_equipments(com_id)
                             eq_option = None
                             if equipments:
-                                eq_option = UserEquipment.objects.get(
-                                    equipment_id=equipments[0].id, user_profile_id=user_profile.id
-                                ).equipment_option.name
+                                eq_option = next(
+                                    user_equipment.equipment_option.name
+                                    for user_equipment in equipment_options
+                                    if user_equipment.equipment_id == equipments[0]["id"]
+                                )
                             record = {
-                                "pd_id": str(program_design.id),
-                                "workout_id": workout.id,
-                                "session_id": session_length.id,
+                                "pd_id": str(program_design["id"]),
+                                "workout_id": workout["id"],
+                                "session_id": session_length["id"],
                                 "checked": False,
-                                "goal": str(session_length.goal.name),
-                                "total_sets": session_length.total_sets,
-                                "workout_time": str(session_length.workout_time),
-                                "rest_time": str(session_length.rest_time),
-                                "warm_up_time": str(session_length.warm_up_time),
-                                "name": str(workout.name),
-                                "value": str(workout.value),
-                                "equipment_types": [
-                                    eq.weight_type
-                                    for eq in user_profile.user_profile_equipments.all().distinct("weight_type")
-                                ],
-                                "session_per_week": str(program_design.session_per_week.value),
+                                "goal": str(goal_name),
+                                "total_sets": session_length["total_sets"],
+                                "workout_time": str(session_length["workout_time"]),
+                                "rest_time": str(session_length["rest_time"]),
+                                "warm_up_time": str(session_length["warm_up_time"]),
+                                "name": str(workout["name"]),
+                                "value": str(workout["value"]),
+                                "equipment_types": list(equipment_types),
+                                "session_per_week": str(session_value),
                                 "equipment_option": eq_option,
-                                "exercise": str(control_program.exercise.name),
-                                "is_two_sided": control_program.is_two_sided,
-                                "reps": str(control_program.reps),
-                                "weight": str(control_program.weight),
-                                "equipments": [str(equipments[0].name)] if equipments else [],
-                                "total_session_length": str(session_length.total_session_length),
+                                "exercise": str(exercise_name),
+                                "is_two_sided": control_program["is_two_sided"],
+                                "reps": str(control_program["reps"]),
+                                "weight": str(control_program["weight"]),
+                                "equipments": [str(equipments[0]["name"])] if equipments else [],
+                                "total_session_length": str(session_length["total_session_length"]),
                                 "user_calculated_reps": str(user_calculated_reps),
                                 "user_calculated_weight": str(user_calculated_weight),
                                 "system_calculated_reps": system_calculated_reps,
                                 "system_calculated_weight": system_calculated_weight,
-                                "created_at": str(control_program.created_at),
-                                "updated_at": str(control_program.updated_at),
-                                "videos": [{"url": str(video.url)} for video in control_program.cp_videos.all()],
+                                "created_at": str(control_program["created_at"]),
+                                "updated_at": str(control_program["updated_at"]),
+                                "videos": [{"url": str(url)} for url in catalog.videos(control_program["id"])],
                             }
                             # handle index on runtime w.r.t sessions if session is 2 and 3 day comes then it will
                             # put at day one
-                            index = self.__calculate_index(program_design.session_per_week.value, program_design.day)
+                            index = self.__calculate_index(session_value, program_design["day"])
                             data[index].append(record)
                             break  # skip remaining cp against one pd
                         else:
-                            logging.info(f"Exercise: {control_program.exercise.name} already added")
+                            logging.info(f"Exercise: {exercise_name} already added")
         data = self.__repeat_sets(data, user_weight_list)
         # add skipped days in log
         for key in data.keys():
@@ -905,16 +1012,18 @@ class UserWorkoutProgramsView(APIView):
                 )
 
             # generate user programs
-            data, message, configurations = self.__generate_userprograms(request_data, user_profile)
+            with request_phase("generate"):
+                data, message, configurations = self.__generate_userprograms(request_data, user_profile)
 
             # save user programs in db
-            save_user_program_designs(
-                user_profile[0],
-                configurations["session_per_week"],
-                configurations["goal"],
-                configurations["is_personalized"],
-                data,
-            )
+            with request_phase("save"):
+                save_user_program_designs(
+                    user_profile[0],
+                    configurations["session_per_week"],
+                    configurations["goal"],
+                    configurations["is_personalized"],
+                    data,
+                )
 
             logger.info(f"User profile {user_profile[0].id}: \n \n data: {data} \n \n message: {message}")
 
@@ -1590,11 +1699,17 @@ class UserProgramDesignView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]
 
+    def __validate_query_params(self, query_params):
+        for parameter in ("week", "day"):
+            if parameter in query_params and not query_params[parameter].strip().isdigit():
+                raise ParseError(f"{parameter} must be a positive integer, got `{query_params[parameter]}`")
+
     def __get_user_programs(self, user_id, query_params):
         user_profile = UserProfile.objects.get(pk=user_id)
         is_personalized = user_profile.is_personalized
-        default_session_length = Config.objects.filter(key="total_session_length")[0].value
-        default_goal = Goal.objects.get(pk=Config.objects.filter(key="goal")[0].value).name
+        default_config = get_config()
+        default_session_length = default_config.total_session_length
+        default_goal = get_catalog().goals[default_config.goal_id]
         if is_personalized:
             default_session_length = int(user_profile.max_session_length)
             default_session_length = str(default_session_length) + ".00"
@@ -1603,6 +1718,7 @@ class UserProgramDesignView(APIView):
         kwargs = {}
         kwargs["goal"] = default_goal
         kwargs["total_session_length"] = default_session_length
+        column_filters = {}
         start_date = None
         end_date = None
 
@@ -1615,6 +1731,10 @@ class UserProgramDesignView(APIView):
                 end_date = query_params["endate"]
                 end_date = datetime.datetime.fromisoformat(end_date)
 
+            # week and day are UserProgramDesign columns, not keys of the program_design exercises
+            elif parameter in ("week", "day"):
+                column_filters[parameter] = int(query_params[parameter])
+
             else:
                 value = query_params[parameter]
                 if "[" in value:
@@ -1622,12 +1742,14 @@ class UserProgramDesignView(APIView):
                 else:
                     kwargs[parameter] = value
 
+        # containment is served by the jsonb_path_ops GIN index on program_design
         kwargs = [kwargs]
         user_programs = UserProgramDesign.objects.filter(
             user=user_id,
             program_design__contains=kwargs,
             workout_date__date__range=[start_date, end_date],
             is_personalized=is_personalized,
+            **column_filters,
         )
 
         return user_programs
@@ -1637,11 +1759,15 @@ class UserProgramDesignView(APIView):
         if user_profile.is_personalized:
             session_per_week = user_profile.session.value
         else:
-            session_per_week = Session.objects.get(pk=Config.objects.filter(key="session_per_week")[0].value).value
+            session_per_week = get_catalog().sessions[get_config().session_per_week_id]
 
         return session_per_week
 
     def __update_user_programs_dates(self, session, user_id):
+        with transaction.atomic():
+            self.__shift_user_programs_dates(session, user_id)
+
+    def __shift_user_programs_dates(self, session, user_id):
 
         current_date = datetime.datetime.now()
         is_end_date_updated = False
@@ -1658,12 +1784,10 @@ class UserProgramDesignView(APIView):
                 is_complete=False,
                 is_personalized=is_personalized,
             ).order_by("workout_date")
-            if user_programs.count() > 0:
-                # select next available userprogram
-                selected_pd = user_programs[0]
-                # assign current date to this userprogram
-                selected_pd.workout_date = current_date
-                selected_pd.save()
+            # assign current date to the next available userprogram
+            UserProgramDesign.objects.filter(pk=Subquery(user_programs.values("pk")[:1])).update(
+                workout_date=current_date, updated_at=Now()
+            )
 
         # scenario: no workout today,click on train today, prepone whole program
         elif session == UserSession.preponeall.name:
@@ -1677,37 +1801,33 @@ class UserProgramDesignView(APIView):
                 is_complete=False,
                 is_personalized=is_personalized,
             ).order_by("workout_date")
-            # initialize userprograms counter
-            user_programs_counter = 0
+            # select next available userprogram
+            selected_pd = user_programs.values("id", "start_date").first()
 
-            if user_programs.count() > 0:
+            if selected_pd is not None:
 
                 # define gaps for each session per week
                 gaps = {1: 6, 2: 3, 3: 1, 4: 1, 5: 1, 6: 1}
 
-                # select next available userprogram
-                selected_pd = user_programs[user_programs_counter]
-                # assign current date to this userprogram
-                selected_pd.workout_date = current_date
-                selected_pd.save()
-
                 # set start date (same for all records)
-                start_date = selected_pd.start_date
+                start_date = selected_pd["start_date"]
 
                 # get day difference for session
-                difference = gaps[session_per_week]
-
-                while user_programs_counter < user_programs.count():
-                    # select next  userprogram
-                    selected_pd = user_programs[user_programs_counter]
-                    # save end date
-                    updated_end_date = selected_pd.workout_date + datetime.timedelta(days=difference * -1)
-                    # prepone workout date by day difference
-                    selected_pd.workout_date = selected_pd.workout_date + datetime.timedelta(days=difference * -1)
-                    selected_pd.save()
-                    # increment counter to get next userprogram
-                    user_programs_counter = user_programs_counter + 1
+                difference = datetime.timedelta(days=gaps[session_per_week])
+
+                # prepone remaining userprograms by day difference
+                remaining_programs = user_programs.exclude(pk=selected_pd["id"])
+                last_workout_date = remaining_programs.aggregate(Max("workout_date"))["workout_date__max"]
+                remaining_programs.update(workout_date=F("workout_date") - difference, updated_at=Now())
+
+                # assign current date to selected userprogram
+                UserProgramDesign.objects.filter(pk=selected_pd["id"]).update(
+                    workout_date=current_date, updated_at=Now()
+                )
+
+                if last_workout_date is not None:
                     # update end date in the end
+                    updated_end_date = last_workout_date - difference
                     is_end_date_updated = True
 
         # scenario: all workouts will increment by 1 day
@@ -1720,14 +1840,13 @@ class UserProgramDesignView(APIView):
                 is_complete=False,
                 is_personalized=is_personalized,
             ).order_by("workout_date")
-            # loop all userprograms
-            for program in user_programs:
+            last_program = user_programs.values("workout_date", "start_date").last()
+            if last_program is not None:
                 # postpone workout date by 1 day
-                updated_end_date = program.workout_date + datetime.timedelta(days=1)
-                program.workout_date = updated_end_date
+                user_programs.update(workout_date=F("workout_date") + datetime.timedelta(days=1), updated_at=Now())
+                updated_end_date = last_program["workout_date"] + datetime.timedelta(days=1)
                 is_end_date_updated = True
-                start_date = program.start_date
-                program.save()
+                start_date = last_program["start_date"]
 
         # scenario: reschedule whole program upon missed sessions and delete previous one
         elif session == UserSession.rescheduleall.name:
@@ -1814,10 +1933,16 @@ class UserProgramDesignView(APIView):
                             is_personalized=is_personalized,
                         )
                         # update workout date according to calculated days gap
-                        for user_pd in all_user_programs:
-                            new_workout_date = user_pd.workout_date + datetime.timedelta(days=move_forward_gap)
-                            user_pd.workout_date = new_workout_date
-                            user_pd.save()
+                        all_user_programs.update(
+                            workout_date=F("workout_date") + datetime.timedelta(days=move_forward_gap),
+                            updated_at=Now(),
+                        )
+                        # the last workout moved as well, so move the program end date with it
+                        UserProgramDesign.objects.filter(
+                            user=user_id,
+                            start_date=starting_date,
+                            is_personalized=is_personalized,
+                        ).update(end_date=F("end_date") + datetime.timedelta(days=move_forward_gap))
                 else:
                     # get first week data and sessions from current user program to reset all workouts
                     user_programs = UserProgramDesign.objects.filter(
@@ -1918,7 +2043,7 @@ class UserProgramDesignView(APIView):
         if user_program_design.is_personalized:
             goal = user_profile.goal.id
         else:
-            goal = Goal.objects.get(pk=Config.objects.filter(key="goal")[0].value).id
+            goal = get_config().goal_id
 
         # get exercise reps and weights
         exercise_reps = float(user_program_design.program_design[exercise_id - 1]["reps"])
@@ -1973,9 +2098,7 @@ class UserProgramDesignView(APIView):
             # new closest weight
             final_weight = find_closest_weight(user_weight_list, new_weight)
             # adjust reps according to closest weight
-            final_reps = adjust_weights_reps_warm_up(
-                exercise_reps, exercise_weight, new_reps, new_weight, final_weight
-            )
+            final_reps = adjust_weights_reps_warm_up(exercise_reps, exercise_weight, new_reps, new_weight, final_weight)
             # get repsranges against goal
             reps_list = fetch_reps_list(goal)
             # validate if rep exists in reps_list
@@ -2028,6 +2151,7 @@ class UserProgramDesignView(APIView):
     @swagger_auto_schema(
         responses={
             200: "OK",
+            400: "Bad Request",
             500: "Internal Server Error",
         },
         manual_parameters=[
@@ -2059,6 +2183,7 @@ class UserProgramDesignView(APIView):
         """
 
         try:
+            self.__validate_query_params(request.query_params)
             user_profile_id = UserProfile.objects.get(user_id=request.user.id).id
             response_msg = ""
             optional_data = {}
@@ -2076,6 +2201,11 @@ class UserProgramDesignView(APIView):
                 status=status.HTTP_200_OK,
             )
 
+        except ParseError as e:
+            logger.exception(f"{str(e)}")
+            return Response(
+                response_json(status=False, data=None, message=e.detail), status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             message = "Error occurred while fetching the data from the database."
             logger.exception(f"{message}:  {str(e)}")
@@ -2087,6 +2217,7 @@ class UserProgramDesignView(APIView):
         request_body=UserProgramDesignSwaggerSerializer,
         responses={
             200: "OK",
+            400: "Bad Request",
             500: "Internal Server Error",
         },
         manual_parameters=[
@@ -2116,6 +2247,8 @@ class UserProgramDesignView(APIView):
         """
 
         try:
+            # the query parameters filter the returned programs, reject them before anything is edited
+            self.__validate_query_params(request.query_params)
             user_profile = UserProfile.objects.get(user_id=request.user.id)
             user_profile_id = user_profile.id
 
@@ -2129,9 +2262,101 @@ class UserProgramDesignView(APIView):
                 response_json(status=True, data=serializer.data, message=response_message), status=status.HTTP_200_OK
             )
 
+        except ParseError as e:
+            logger.exception(f"{str(e)}")
+            return Response(
+                response_json(status=False, data=None, message=e.detail), status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             message = "Error occurred while fetching the data from the database."
             logger.exception(f"{message}:  {str(e)}")
             return Response(
                 response_json(status=False, data=None, message=message), status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class UserProgramDesignExportView(APIView):
+    """UserProgramDesignExportView class
+
+    This view streams UserProgramDesign rows, one line per exercise set, as CSV or NDJSON
+
+    Parameters
+    ----------
+    APIView : rest_framework.views
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def __get_user_programs(self, query_params):
+        user_programs = UserProgramDesign.objects.all()
+        if "user_profile" in query_params:
+            user_programs = user_programs.filter(user=int(query_params["user_profile"]))
+        if "from_date" in query_params:
+            user_programs = user_programs.filter(
+                workout_date__date__gte=datetime.date.fromisoformat(query_params["from_date"])
+            )
+        if "to_date" in query_params:
+            user_programs = user_programs.filter(
+                workout_date__date__lte=datetime.date.fromisoformat(query_params["to_date"])
+            )
+        return user_programs
+
+    @swagger_auto_schema(
+        responses={
+            200: "OK",
+            400: "Bad Request",
+            500: "Internal Server Error",
+        },
+        manual_parameters=[
+            Parameter("export_format", IN_QUERY, type="string", enum=list(EXPORT_FORMATS)),
+            Parameter("user_profile", IN_QUERY, type="integer"),
+            Parameter("from_date", IN_QUERY, type="string", format="date"),
+            Parameter("to_date", IN_QUERY, type="string", format="date"),
+        ],
+    )
+    def get(self, request):
+        """HTTP GET request
+
+        A HTTP endpoint that streams every matching UserProgramDesign exercise set in id order, read through a
+        server-side cursor so the export runs in constant memory
+        Sample URL:
+        localhost:8000/api/user-programs-designs/export/?export_format=ndjson&from_date=2021-12-01
+
+        Parameters
+        ----------
+        request : django.http.request
+
+        Returns
+        -------
+        django.http.StreamingHttpResponse
+            returns the export stream, error message otherwise
+        """
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                response_json(
+                    status=False, data=None, message=f"export_format must be one of {', '.join(EXPORT_FORMATS)}"
+                ),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            user_programs = self.__get_user_programs(request.query_params)
+        except ValueError as e:
+            logger.exception(f"Invalid export filter: {str(e)}")
+            return Response(
+                response_json(status=False, data=None, message=f"Invalid export filter: {str(e)}"),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            render, content_type, extension = EXPORT_FORMATS[export_format]
+            response = StreamingHttpResponse(render(export_rows(user_programs)), content_type=content_type)
+            response["Content-Disposition"] = f'attachment; filename="user_programs.{extension}"'
+            return response
+
+        except Exception as e:
+            message = "Error occurred while exporting the data from the database."
+            logger.exception(f"{message}:  {str(e)}")
+            return Response(
+                response_json(status=False, data=None, message=message), status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,144 @@
+"""Notification dispatcher file."""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from apps.notification.models import UserNotification
+from apps.notification.transports import INVALID_TOKEN_ERRORS, TRANSIENT_ERRORS, TransientNotificationError
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """NotificationDispatcher class
+
+    Sends multicast messages concurrently on a bounded thread pool. Requests and tokens failing with a
+    transient error are sent again with exponential backoff, and tokens reported invalid are collected so
+    close() can delete their UserNotification rows.
+
+    Parameters
+    ----------
+    transport : apps.notification.transports.NotificationTransport
+    max_workers : integer
+        requests in flight at the same time
+    max_retries : integer
+        attempts after the first one before a message is given up
+    backoff : float
+        seconds to wait before the first retry, doubled on every further retry
+    """
+
+    def __init__(self, transport, max_workers=4, max_retries=3, backoff=0.5):
+        self.transport = transport
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notification")
+        # a full queue blocks submit(), so memory stays bounded while the pool catches up
+        self.slots = threading.BoundedSemaphore(max_workers * 2)
+        self.lock = threading.Lock()
+        self.futures = []
+        self.invalid_registration_ids = set()
+        self.stats = {"sent": 0, "failed": 0, "invalid": 0, "retried": 0}
+
+    def __delay(self, attempt, retry_after=None):
+        return max(retry_after or 0, self.backoff * (2 ** attempt))
+
+    def __send(self, message_key, registration_ids, message_title, message_body, extra_notification_kwargs):
+        attempt = 0
+        pending = list(registration_ids)
+        while pending:
+            try:
+                results = self.transport.send(pending, message_title, message_body, extra_notification_kwargs)
+            except TransientNotificationError as e:
+                if attempt >= self.max_retries:
+                    logger.exception(f"Giving up {message_key} for {len(pending)} devices: {e}")
+                    self.__count(failed=len(pending))
+                    return
+                delay = self.__delay(attempt, e.retry_after)
+                logger.info(f"Retrying {message_key} for {len(pending)} devices in {delay}s: {e}")
+                self.__count(retried=len(pending))
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            retry, invalid, sent, failed = [], [], 0, 0
+            for result in results:
+                if result["success"]:
+                    sent += 1
+                elif result["error"] in INVALID_TOKEN_ERRORS:
+                    invalid.append(result["registration_id"])
+                elif result["error"] in TRANSIENT_ERRORS and attempt < self.max_retries:
+                    retry.append(result["registration_id"])
+                else:
+                    failed += 1
+            self.__count(sent=sent, failed=failed, invalid=len(invalid), retried=len(retry))
+            with self.lock:
+                self.invalid_registration_ids.update(invalid)
+            logger.info(
+                f"Sent {message_key} to {len(pending)} devices: {sent} succeeded, {failed} failed, "
+                f"{len(invalid)} invalid, {len(retry)} to retry"
+            )
+            if retry:
+                time.sleep(self.__delay(attempt))
+                attempt += 1
+            pending = retry
+
+    def __count(self, **counts):
+        with self.lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    def __run(self, *args):
+        try:
+            self.__send(*args)
+        except Exception as e:
+            logger.exception(f"Error occurred while sending {args[0]}: {e}")
+            self.__count(failed=len(args[1]))
+        finally:
+            self.slots.release()
+
+    def submit(self, message_key, registration_ids, message_title, message_body, extra_notification_kwargs=None):
+        """Public Method
+
+        The method queues one multicast message, split into batches the transport accepts.
+
+        Parameters
+        ----------
+        message_key : str
+            name of the message, used in logs
+        registration_ids : list
+        message_title : str
+        message_body : str
+        extra_notification_kwargs : dict
+        """
+        batch_size = self.transport.max_multicast_size
+        for start in range(0, len(registration_ids), batch_size):
+            self.slots.acquire()
+            future = self.executor.submit(
+                self.__run,
+                message_key,
+                list(registration_ids[start : start + batch_size]),
+                message_title,
+                message_body,
+                extra_notification_kwargs,
+            )
+            self.futures.append(future)
+
+    def close(self):
+        """Public Method
+
+        The method waits for every queued message and deletes the UserNotification rows of invalid tokens.
+
+        Returns
+        -------
+        dict
+            returns the number of sent, failed, invalid and retried tokens and of deleted UserNotification rows
+        """
+        self.executor.shutdown(wait=True)
+        deleted = 0
+        if self.invalid_registration_ids:
+            deleted, _ = UserNotification.objects.filter(
+                registration_id__in=list(self.invalid_registration_ids)
+            ).delete()
+            logger.info(f"Deleted {deleted} User Notification objects with invalid tokens")
+        return {**self.stats, "deleted": deleted}
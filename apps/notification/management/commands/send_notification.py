@@ -1,116 +1,105 @@
+import datetime
 import logging
-
-from pyfcm import FCMNotification
+from collections import defaultdict
 
 from django.core.management.base import BaseCommand
 
 from apps.const import notification_messages
 from apps.mobile_api.v1.models import UserProfile
-from apps.mobile_api.v1.views import get_current_date_missed_sessions, get_missed_sessions
+from apps.mobile_api.v1.views import fetch_missed_sessions_summaries, summarize_missed_sessions
+from apps.notification.dispatcher import NotificationDispatcher
 from apps.notification.models import UserNotification
+from apps.notification.transports import MAX_MULTICAST_SIZE, get_transport
 
 logger = logging.getLogger(__name__)
 
-db_configs = {
-    "FIREBASE_API_KEY": "AAAA_wgJtr8:APA91bGXL1gPp88l78ZHItJ2ht7AYBHkpg7Jn2FSgHsKCA38O3JvvT1zCKygk-dvRlSpxNEJmkH"
-    "-oKwe54IWSWon78KPR6JGzeI6VG3Ahp3YVK2pf19E9Zs0AkHQPa219T7YLrCndUDj"
+MESSAGE_TITLE = "Joompa - AI Trainer"
+EXTRA_NOTIFICATION_KWARGS = {"android_channel_id": 2}
+
+DAILY_MESSAGE = "daily_message"
+# number of missed sessions to the message sent for it
+MISSED_SESSION_MESSAGES = {
+    1: "one_day_message",
+    2: "two_day_message",
+    4: "three_four_day_message",
+    7: "five_seven_days_message",
+    14: "eight_fourteen_days_message",
+    28: "more_then_fourteen_days_message",
 }
 
 
 class Command(BaseCommand):
     help = "Send Notifications to users with cronjob"
-    missed_session_dict = {
-        "one_day_missed_list": [],
-        "two_days_missed_list": [],
-        "four_days_missed_list": [],
-        "seven_days_missed_list": [],
-        "fourteen_days_missed_list": [],
-        "twenty_eight_days_missed_list": [],
-        "daily_missed_list": [],
-    }
-    push_service = FCMNotification(api_key=db_configs["FIREBASE_API_KEY"])
 
-    def send_notification(self):
-        message_title = "Joompa - AI Trainer"
-        extra_notification_kwargs = {"android_channel_id": 2}
-        daily_sent_notification = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["daily_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["daily_message"],
-        )
-        logger.info(daily_sent_notification)
-        one_day_sent_notifications = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["one_day_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["one_day_message"],
-        )
-        logger.info(one_day_sent_notifications)
-        two_days_sent_notifications = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["two_days_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["two_day_message"],
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="User profiles loaded per query")
+        parser.add_argument(
+            "--batch-size", type=int, default=MAX_MULTICAST_SIZE, help="Registration ids sent per multicast request"
         )
-        logger.info(two_days_sent_notifications)
-        four_days_sent_notifications = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["four_days_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["three_four_day_message"],
-        )
-        logger.info(four_days_sent_notifications)
-        seven_days_sent_notifications = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["seven_days_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["five_seven_days_message"],
-        )
-        logger.info(seven_days_sent_notifications)
-        fourteen_days_sent_notifications = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["fourteen_days_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["eight_fourteen_days_message"],
-        )
-        logger.info(fourteen_days_sent_notifications)
-        twenty_eight_days_sent_notifications = self.push_service.notify_multiple_devices(
-            registration_ids=self.missed_session_dict["twenty_eight_days_missed_list"],
-            message_title=message_title,
-            extra_notification_kwargs=extra_notification_kwargs,
-            message_body=notification_messages["more_then_fourteen_days_message"],
+        parser.add_argument("--transport", default=None, help="Dotted path overriding NOTIFICATION_TRANSPORT")
+        parser.add_argument("--workers", type=int, default=4, help="Multicast requests sent concurrently")
+        parser.add_argument("--max-retries", type=int, default=3, help="Retries of transient failures")
+
+    def __user_profile_chunks(self, chunk_size):
+        last_id = 0
+        while True:
+            user_profile_ids = list(
+                UserProfile.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size]
+            )
+            if not user_profile_ids:
+                return
+            yield user_profile_ids
+            last_id = user_profile_ids[-1]
+
+    def __send(self, message_key, registration_ids):
+        self.dispatcher.submit(
+            message_key,
+            registration_ids,
+            message_title=MESSAGE_TITLE,
+            message_body=notification_messages[message_key],
+            extra_notification_kwargs=EXTRA_NOTIFICATION_KWARGS,
         )
-        logger.info(twenty_eight_days_sent_notifications)
 
-    def get_message_from_missed_session(self, missed_sessions, registration_id):
-        if missed_sessions == 1:
-            self.missed_session_dict["one_day_missed_list"].append(registration_id)
-        elif missed_sessions == 2:
-            self.missed_session_dict["two_days_missed_list"].append(registration_id)
-        elif missed_sessions == 4:
-            self.missed_session_dict["four_days_missed_list"].append(registration_id)
-        elif missed_sessions == 7:
-            self.missed_session_dict["seven_days_missed_list"].append(registration_id)
-        elif missed_sessions == 14:
-            self.missed_session_dict["fourteen_days_missed_list"].append(registration_id)
-        elif missed_sessions == 28:
-            self.missed_session_dict["twenty_eight_days_missed_list"].append(registration_id)
+    def __flush(self, pending, batch_size, force=False):
+        for message_key, registration_ids in pending.items():
+            while len(registration_ids) >= batch_size or (force and registration_ids):
+                self.__send(message_key, registration_ids[:batch_size])
+                del registration_ids[:batch_size]
 
     def handle(self, *args, **options):
-        users = UserProfile.objects.all()
-        for user_profile in users:
-            try:
-                user_notification = UserNotification.objects.get(user_profile_id=user_profile.id)
-                user_today_missed_workout = get_current_date_missed_sessions(user_profile.id)
-                if user_today_missed_workout:
-                    logger.info(f"User today's missed session: {user_today_missed_workout}")
-                    self.missed_session_dict["daily_missed_list"].append(user_notification.registration_id)
-                missed_sessions, response = get_missed_sessions(user_profile.id)
-                if missed_sessions > 0:
-                    logger.info(f"Number of missed sessions for user {user_profile.id} are {missed_sessions} ")
-                    self.get_message_from_missed_session(missed_sessions, user_notification.registration_id)
-            except UserNotification.DoesNotExist:
-                logger.info(f"User Notification object with the id: {user_profile.id} doesn't exist.")
+        transport = get_transport(options["transport"])
+        self.dispatcher = NotificationDispatcher(
+            transport, max_workers=options["workers"], max_retries=options["max_retries"]
+        )
+        batch_size = max(1, min(options["batch_size"], transport.max_multicast_size))
+        pending = defaultdict(list)
+
+        for user_profile_ids in self.__user_profile_chunks(options["chunk_size"]):
+            registration_ids = defaultdict(list)
+            for user_profile_id, registration_id in UserNotification.objects.filter(
+                user_profile_id__in=user_profile_ids
+            ).values_list("user_profile_id", "registration_id"):
+                registration_ids[user_profile_id].append(registration_id)
+            logger.info(
+                f"{len(user_profile_ids) - len(registration_ids)} of {len(user_profile_ids)} user profiles "
+                f"don't have a User Notification object."
+            )
+            if not registration_ids:
                 continue
-        self.send_notification()
+
+            current_date = datetime.datetime.now()
+            summaries = fetch_missed_sessions_summaries(list(registration_ids), current_date)
+            for user_profile_id, user_registration_ids in registration_ids.items():
+                summary = summaries.get(user_profile_id)
+                if summary is not None and summary["today_incomplete_count"] > 0:
+                    logger.info(f"User {user_profile_id} has a session today")
+                    pending[DAILY_MESSAGE].extend(user_registration_ids)
+                missed_sessions, _ = summarize_missed_sessions(summary, current_date)
+                if missed_sessions > 0:
+                    logger.info(f"Number of missed sessions for user {user_profile_id} are {missed_sessions} ")
+                    if missed_sessions in MISSED_SESSION_MESSAGES:
+                        pending[MISSED_SESSION_MESSAGES[missed_sessions]].extend(user_registration_ids)
+
+            self.__flush(pending, batch_size)
+        self.__flush(pending, batch_size, force=True)
+        logger.info(f"Notifications dispatched: {self.dispatcher.close()}")
@@ -0,0 +1,78 @@
+from django.test import TestCase
+
+from apps.notification.dispatcher import NotificationDispatcher
+from apps.notification.models import UserNotification
+from apps.notification.transports import FakeTransport, NotificationTransport
+from apps.testing import create_user_profile
+
+
+class BrokenTransport(NotificationTransport):
+    def send(self, registration_ids, message_title, message_body, extra_notification_kwargs=None):
+        raise RuntimeError("Unexpected response")
+
+
+class NotificationDispatcherTest(TestCase):
+    def dispatch(self, transport, registration_ids, **options):
+        dispatcher = NotificationDispatcher(transport, backoff=0, **options)
+        dispatcher.submit("daily_message", registration_ids, "title", "body", {"android_channel_id": 2})
+        return dispatcher.close()
+
+    def sent_ids(self, transport):
+        return sorted(registration_id for request in transport.sent for registration_id in request["registration_ids"])
+
+    def test_splits_into_multicast_batches(self):
+        transport = FakeTransport(max_multicast_size=3)
+        registration_ids = [f"device-{index}" for index in range(7)]
+        stats = self.dispatch(transport, registration_ids)
+        self.assertEqual(sorted(len(request["registration_ids"]) for request in transport.sent), [1, 3, 3])
+        self.assertEqual(self.sent_ids(transport), sorted(registration_ids))
+        self.assertEqual(stats, {"sent": 7, "failed": 0, "invalid": 0, "retried": 0, "deleted": 0})
+
+    def test_deletes_invalid_tokens(self):
+        user_profile = create_user_profile("athlete@joompa.local")
+        UserNotification.objects.bulk_create(
+            UserNotification(user_profile_id=user_profile, registration_id=registration_id)
+            for registration_id in ("device-1", "stale-1", "stale-2")
+        )
+        stats = self.dispatch(
+            FakeTransport(invalid_registration_ids=["stale-1", "stale-2"]), ["device-1", "stale-1", "stale-2"]
+        )
+        self.assertEqual(stats, {"sent": 1, "failed": 0, "invalid": 2, "retried": 0, "deleted": 2})
+        self.assertEqual(list(UserNotification.objects.values_list("registration_id", flat=True)), ["device-1"])
+
+    def test_retries_only_tokens_with_transient_errors(self):
+        transport = FakeTransport(errors={"device-2": ["Unavailable", "InternalServerError"]})
+        stats = self.dispatch(transport, ["device-1", "device-2"])
+        self.assertEqual(
+            [request["registration_ids"] for request in transport.sent],
+            [["device-1", "device-2"], ["device-2"], ["device-2"]],
+        )
+        self.assertEqual(stats, {"sent": 2, "failed": 0, "invalid": 0, "retried": 2, "deleted": 0})
+
+    def test_gives_up_tokens_after_max_retries(self):
+        transport = FakeTransport(errors={"device-2": ["Unavailable"] * 5})
+        stats = self.dispatch(transport, ["device-1", "device-2"], max_retries=2)
+        self.assertEqual(len(transport.sent), 3)
+        self.assertEqual(stats, {"sent": 1, "failed": 1, "invalid": 0, "retried": 2, "deleted": 0})
+
+    def test_permanent_errors_are_not_retried(self):
+        transport = FakeTransport(errors={"device-1": ["MessageTooBig"]})
+        stats = self.dispatch(transport, ["device-1"])
+        self.assertEqual(len(transport.sent), 1)
+        self.assertEqual(stats, {"sent": 0, "failed": 1, "invalid": 0, "retried": 0, "deleted": 0})
+
+    def test_retries_failed_requests(self):
+        transport = FakeTransport(failing_requests=2)
+        stats = self.dispatch(transport, ["device-1", "device-2"])
+        self.assertEqual(self.sent_ids(transport), ["device-1", "device-2"])
+        self.assertEqual(stats, {"sent": 2, "failed": 0, "invalid": 0, "retried": 4, "deleted": 0})
+
+    def test_gives_up_requests_after_max_retries(self):
+        transport = FakeTransport(failing_requests=10)
+        stats = self.dispatch(transport, ["device-1", "device-2"], max_retries=2)
+        self.assertEqual(transport.sent, [])
+        self.assertEqual(stats, {"sent": 0, "failed": 2, "invalid": 0, "retried": 4, "deleted": 0})
+
+    def test_unexpected_errors_fail_the_batch_only(self):
+        stats = self.dispatch(BrokenTransport(), ["device-1", "device-2"])
+        self.assertEqual(stats, {"sent": 0, "failed": 2, "invalid": 0, "retried": 0, "deleted": 0})
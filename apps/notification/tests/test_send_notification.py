@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.const import notification_messages
+from apps.notification.management.commands.send_notification import MESSAGE_TITLE
+from apps.notification.models import UserNotification
+from apps.notification.transports import FakeTransport
+from apps.testing import create_user_profile, create_user_programs, days_from_now
+
+
+class SendNotificationCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # a session today, one missed session yesterday, a completed session only, and no registration id
+        cls.today = create_user_profile("today@joompa.local")
+        create_user_programs(cls.today, days_from_now(0, 2))
+        cls.missed = create_user_profile("missed@joompa.local")
+        create_user_programs(cls.missed, days_from_now(-1, 2))
+        cls.completed = create_user_profile("completed@joompa.local")
+        create_user_programs(cls.completed, days_from_now(-1), is_complete=True)
+        cls.silent = create_user_profile("silent@joompa.local")
+        create_user_programs(cls.silent, days_from_now(0))
+        for user_profile, registration_ids in (
+            (cls.today, ["today-1", "today-2", "today-3"]),
+            (cls.missed, ["missed-1"]),
+            (cls.completed, ["completed-1"]),
+        ):
+            UserNotification.objects.bulk_create(
+                UserNotification(user_profile_id=user_profile, registration_id=registration_id)
+                for registration_id in registration_ids
+            )
+
+    def send(self, transport, **options):
+        with mock.patch(
+            "apps.notification.management.commands.send_notification.get_transport", return_value=transport
+        ):
+            call_command("send_notification", **options)
+        messages = {}
+        for request in transport.sent:
+            self.assertEqual(request["message_title"], MESSAGE_TITLE)
+            messages.setdefault(request["message_body"], []).append(sorted(request["registration_ids"]))
+        return {message_body: sorted(batches) for message_body, batches in messages.items()}
+
+    def test_messages_per_missed_sessions(self):
+        messages = self.send(FakeTransport(), chunk_size=1)
+        self.assertEqual(
+            messages,
+            {
+                notification_messages["daily_message"]: [["today-1", "today-2", "today-3"]],
+                notification_messages["one_day_message"]: [["missed-1"]],
+            },
+        )
+
+    def test_batches_registration_ids(self):
+        batches = self.send(FakeTransport(), batch_size=2)[notification_messages["daily_message"]]
+        self.assertEqual(sorted(len(batch) for batch in batches), [1, 2])
+        self.assertEqual(sorted(sum(batches, [])), ["today-1", "today-2", "today-3"])
+
+    def test_deletes_invalid_registration_ids(self):
+        self.send(FakeTransport(invalid_registration_ids=["today-2"]))
+        self.assertEqual(
+            sorted(UserNotification.objects.values_list("registration_id", flat=True)),
+            ["completed-1", "missed-1", "today-1", "today-3"],
+        )
@@ -0,0 +1,70 @@
+import importlib.util
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from apps.notification.transports import FCMTransport, HTTPTransport, TransientNotificationError, get_transport
+
+
+def _load_stub():
+    path = Path(settings.BASE_DIR) / "scripts" / "fcm_stub_server.py"
+    spec = importlib.util.spec_from_file_location("fcm_stub_server", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class HTTPTransportTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = _load_stub()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), cls.stub.FCMStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_port}/fcm/send"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.stub.FCMStubHandler.fail_every = 0
+        self.transport = HTTPTransport(endpoint=self.endpoint, api_key="stub")
+
+    def test_reports_every_registration_id(self):
+        results = self.transport.send(["device-1", "invalid-1", "flaky-1"], "title", "body")
+        self.assertEqual(
+            [(result["registration_id"], result["success"], result["error"]) for result in results],
+            [("device-1", True, None), ("invalid-1", False, "NotRegistered"), ("flaky-1", False, "Unavailable")],
+        )
+        # the stub fails a flaky id only the first time
+        self.assertTrue(self.transport.send(["flaky-1"], "title", "body")[0]["success"])
+
+    def test_server_errors_are_transient(self):
+        self.stub.FCMStubHandler.fail_every = 1
+        with self.assertRaises(TransientNotificationError) as context:
+            self.transport.send(["device-1"], "title", "body")
+        self.assertEqual(context.exception.retry_after, 0)
+
+
+class TransportConfigurationTest(SimpleTestCase):
+    @override_settings(FIREBASE_API_KEY="")
+    def test_api_key_is_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            HTTPTransport(endpoint="http://127.0.0.1:1/fcm/send")
+        with self.assertRaises(ImproperlyConfigured):
+            FCMTransport()
+
+    @override_settings(
+        FIREBASE_API_KEY="from-env", NOTIFICATION_TRANSPORT="apps.notification.transports.HTTPTransport"
+    )
+    def test_get_transport_reads_the_settings(self):
+        transport = get_transport()
+        self.assertIsInstance(transport, HTTPTransport)
+        self.assertEqual(transport.api_key, "from-env")
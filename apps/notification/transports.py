@@ -0,0 +1,230 @@
+"""Notification transports file."""
+import logging
+import threading
+
+import requests
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# FCM legacy HTTP API accepts at most 1000 registration ids per multicast request
+MAX_MULTICAST_SIZE = 1000
+
+# per-token errors worth sending again, and errors meaning the token will never work
+TRANSIENT_ERRORS = {"Unavailable", "InternalServerError", "DeviceMessageRateExceeded"}
+INVALID_TOKEN_ERRORS = {"NotRegistered", "InvalidRegistration", "MismatchSenderId"}
+
+
+class TransientNotificationError(Exception):
+    """TransientNotificationError class
+
+    Raised by a transport when the whole request failed but may succeed if sent again.
+
+    Parameters
+    ----------
+    retry_after : float
+        seconds the provider asked to wait, if any
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _api_key(api_key):
+    api_key = api_key or settings.FIREBASE_API_KEY
+    if not api_key:
+        raise ImproperlyConfigured("FIREBASE_API_KEY must be set in the environment or .env to send notifications")
+    return api_key
+
+
+class NotificationTransport:
+    """NotificationTransport class
+
+    Base class of the push transports used by the send_notification command. A transport sends one
+    multicast message and reports the outcome of every registration id.
+    """
+
+    max_multicast_size = MAX_MULTICAST_SIZE
+
+    def send(self, registration_ids, message_title, message_body, extra_notification_kwargs=None):
+        """Public Method
+
+        The method sends one message to the given registration ids.
+
+        Parameters
+        ----------
+        registration_ids : list
+        message_title : str
+        message_body : str
+        extra_notification_kwargs : dict
+
+        Returns
+        -------
+        list
+            returns one {"registration_id", "success", "error"} dict per registration id, in the same order
+        """
+        raise NotImplementedError
+
+
+class FCMTransport(NotificationTransport):
+    """FCMTransport class
+
+    Sends notifications through Firebase Cloud Messaging with pyfcm.
+
+    Parameters
+    ----------
+    api_key : str
+        defaults to settings.FIREBASE_API_KEY
+    """
+
+    def __init__(self, api_key=None):
+        from pyfcm import FCMNotification
+
+        self.push_service = FCMNotification(api_key=_api_key(api_key))
+
+    def send(self, registration_ids, message_title, message_body, extra_notification_kwargs=None):
+        from pyfcm.errors import FCMServerError, RetryAfterException
+
+        try:
+            response = self.push_service.notify_multiple_devices(
+                registration_ids=registration_ids,
+                message_title=message_title,
+                message_body=message_body,
+                extra_notification_kwargs=extra_notification_kwargs,
+            )
+        except RetryAfterException as e:
+            raise TransientNotificationError(str(e), retry_after=e.delay)
+        except (FCMServerError, requests.RequestException) as e:
+            raise TransientNotificationError(str(e))
+        logger.info(response)
+        results = response.get("results") or [{} for _ in registration_ids]
+        return [
+            {"registration_id": registration_id, "success": "error" not in result, "error": result.get("error")}
+            for registration_id, result in zip(registration_ids, results)
+        ]
+
+
+class HTTPTransport(NotificationTransport):
+    """HTTPTransport class
+
+    Posts FCM legacy HTTP API requests to a configurable endpoint, so the provider can be replaced by a
+    local stub such as scripts/fcm_stub_server.py.
+
+    Parameters
+    ----------
+    endpoint : str
+        defaults to settings.FCM_ENDPOINT
+    api_key : str
+        defaults to settings.FIREBASE_API_KEY
+    timeout : float
+        seconds to wait for the provider
+    """
+
+    def __init__(self, endpoint=None, api_key=None, timeout=10):
+        self.endpoint = endpoint or settings.FCM_ENDPOINT
+        self.api_key = _api_key(api_key)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def __session(self):
+        # requests sessions are not safe to share between the dispatcher threads
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+            self._local.session.headers.update(
+                {"Authorization": f"key={self.api_key}", "Content-Type": "application/json"}
+            )
+        return self._local.session
+
+    def send(self, registration_ids, message_title, message_body, extra_notification_kwargs=None):
+        payload = {
+            "registration_ids": registration_ids,
+            "notification": {"title": message_title, "body": message_body, **(extra_notification_kwargs or {})},
+        }
+        try:
+            response = self.__session().post(self.endpoint, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise TransientNotificationError(str(e))
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            raise TransientNotificationError(
+                f"FCM responded with {response.status_code}",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        response.raise_for_status()
+        results = response.json().get("results") or [{} for _ in registration_ids]
+        return [
+            {"registration_id": registration_id, "success": "error" not in result, "error": result.get("error")}
+            for registration_id, result in zip(registration_ids, results)
+        ]
+
+
+class FakeTransport(NotificationTransport):
+    """FakeTransport class
+
+    Keeps every message in memory instead of sending it, for local runs and tests.
+
+    Parameters
+    ----------
+    invalid_registration_ids : iterable
+        registration ids reported back with a NotRegistered error
+    errors : dict
+        registration id to the errors reported back for it on its first sends, it succeeds afterwards
+    failing_requests : integer
+        number of first requests failing as a whole with TransientNotificationError
+    max_multicast_size : integer
+    """
+
+    def __init__(self, invalid_registration_ids=(), errors=None, failing_requests=0, max_multicast_size=None):
+        self.invalid_registration_ids = set(invalid_registration_ids)
+        self.errors = {registration_id: list(errors) for registration_id, errors in (errors or {}).items()}
+        self.failing_requests = failing_requests
+        self.max_multicast_size = max_multicast_size or self.max_multicast_size
+        self.lock = threading.Lock()
+        self.sent = []
+
+    def __error(self, registration_id):
+        if registration_id in self.invalid_registration_ids:
+            return "NotRegistered"
+        errors = self.errors.get(registration_id)
+        return errors.pop(0) if errors else None
+
+    def send(self, registration_ids, message_title, message_body, extra_notification_kwargs=None):
+        # the dispatcher calls send from several threads
+        with self.lock:
+            if self.failing_requests > 0:
+                self.failing_requests -= 1
+                raise TransientNotificationError("Fake request failure", retry_after=0)
+            self.sent.append(
+                {
+                    "registration_ids": list(registration_ids),
+                    "message_title": message_title,
+                    "message_body": message_body,
+                    "extra_notification_kwargs": extra_notification_kwargs,
+                }
+            )
+            errors = [self.__error(registration_id) for registration_id in registration_ids]
+        return [
+            {"registration_id": registration_id, "success": error is None, "error": error}
+            for registration_id, error in zip(registration_ids, errors)
+        ]
+
+
+def get_transport(path=None):
+    """Public Method
+
+    The method instantiates the notification transport configured in settings.NOTIFICATION_TRANSPORT.
+
+    Parameters
+    ----------
+    path : str
+        dotted path of a NotificationTransport subclass overriding the setting
+
+    Returns
+    -------
+    apps.notification.transports.NotificationTransport
+    """
+    return import_string(path or settings.NOTIFICATION_TRANSPORT)()
@@ -1,5 +1,14 @@
+import base64
+import binascii
+import json
+
 from rest_framework import pagination
 from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 
 from joompa.settings import db_config
 
@@ -7,6 +16,11 @@ from joompa.settings import db_config
 class CustomPagination(pagination.PageNumberPagination):
     page_size = db_config.get("PAGE_SIZE", 25)
     page_size_query_param = db_config.get("PAGE_SIZE_QUERY_PARAM", "page_size")
+    # sending ?cursor= (empty for the first page) switches to keyset pagination on (created_at, id)
+    cursor_query_param = "cursor"
+    # exact, estimated or none, only used in keyset mode
+    count_query_param = "count"
+    keyset = False
 
     def paginate_queryset(self, queryset, request, view=None):
         """
@@ -17,6 +31,9 @@ class CustomPagination(pagination.PageNumberPagination):
         if not page_size:
             return None
 
+        if self.cursor_query_param in request.query_params:
+            return self.paginate_keyset(queryset, request, int(page_size))
+
         paginator = self.django_paginator_class(queryset, page_size)
         page_number = request.query_params.get(self.page_query_param, 1)
         if page_number in self.last_page_strings:
@@ -34,7 +51,95 @@ class CustomPagination(pagination.PageNumberPagination):
         self.request = request
         return list(self.page)
 
+    def paginate_keyset(self, queryset, request, page_size):
+        """
+        Return the page after (or before) the cursor, newest rows first, without COUNT(*) or OFFSET.
+        Works on model instances and values() rows as long as created_at and id are selected.
+        """
+        self.keyset = True
+        self.request = request
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        reverse = bool(position and position["reverse"])
+
+        rows = queryset
+        if position:
+            if reverse:
+                rows = rows.filter(
+                    Q(created_at__gt=position["created_at"])
+                    | Q(created_at=position["created_at"], id__gt=position["id"])
+                )
+            else:
+                rows = rows.filter(
+                    Q(created_at__lt=position["created_at"])
+                    | Q(created_at=position["created_at"], id__lt=position["id"])
+                )
+        ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+        rows = list(rows.order_by(*ordering)[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = None
+        self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self.row_position(rows[-1], reverse=False)
+            if (has_more and reverse) or (position and not reverse):
+                self.previous_position = self.row_position(rows[0], reverse=True)
+        self.count = self.get_keyset_count(queryset, request)
+        return rows
+
+    def get_keyset_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, "estimated")
+        if mode == "none":
+            return None
+        if mode == "estimated" and connection.vendor == "postgresql":
+            # planner row estimate, constant time however large the table is
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        return queryset.count()
+
+    def row_position(self, row, reverse):
+        if isinstance(row, dict):
+            return {"created_at": row["created_at"], "id": row["id"], "reverse": reverse}
+        return {"created_at": row.created_at, "id": row.pk, "reverse": reverse}
+
+    def encode_cursor(self, position):
+        payload = json.dumps([position["created_at"].isoformat(), position["id"], int(position["reverse"])])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            created_at, id, reverse = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = parse_datetime(created_at)
+            if created_at is None:
+                raise ValueError(created_at)
+            return {"created_at": created_at, "id": int(id), "reverse": bool(reverse)}
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise NotFound(f"Invalid cursor : {e}")
+
+    def get_cursor_link(self, position):
+        if position is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position))
+
     def get_paginated_response(self, data):
+        if self.keyset:
+            return {
+                "data": data,
+                "count": self.count,
+                "next": self.get_cursor_link(self.next_position),
+                "previous": self.get_cursor_link(self.previous_position),
+            }
         response = {
             "data": data,
             "count": self.page.paginator.count,
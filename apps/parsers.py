@@ -0,0 +1,32 @@
+"""JSON parsers file."""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from django.conf import settings
+
+from apps.renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    """ORJSONParser class
+
+    Parses UTF-8 request bodies with orjson when it is installed, every other case goes through DRF's
+    JSONParser.
+
+    Parameters
+    ----------
+    JSONParser : rest_framework.parsers
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
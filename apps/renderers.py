@@ -0,0 +1,39 @@
+"""JSON renderers file."""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# dicts keyed by ints (user workout programs keyed by day) are rendered like the stdlib does, and UTC datetimes end
+# in Z like DRF's JSONEncoder writes them
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+
+class ORJSONRenderer(JSONRenderer):
+    """ORJSONRenderer class
+
+    Renders with orjson when it is installed and falls back to DRF's JSONRenderer otherwise, or when an
+    indent is requested, which orjson can't honour. Decimal and every other type orjson can't serialize are
+    handed to DRF's JSONEncoder.default, so both renderers produce the same document.
+
+    Parameters
+    ----------
+    JSONRenderer : rest_framework.renderers
+    """
+
+    encoder_default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_default, option=ORJSON_OPTIONS)
+        # same escaping JSONRenderer applies, the two separators are valid JSON but not valid JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -12,3 +12,6 @@ class RepsInReserveConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.reps_in_reserve"
+
+    def ready(self):
+        import apps.reps_in_reserve.signals  # noqa: F401
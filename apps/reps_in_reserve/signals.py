@@ -0,0 +1,5 @@
+"""Reps in Reserve signals file."""
+from apps.etag import track_table_versions
+from apps.reps_in_reserve.models import RepsRange
+
+track_table_versions(RepsRange)
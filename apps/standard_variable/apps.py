@@ -12,3 +12,6 @@ class VariableModuleConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.standard_variable"
+
+    def ready(self):
+        import apps.standard_variable.signals  # noqa: F401
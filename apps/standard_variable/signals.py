@@ -0,0 +1,5 @@
+"""StandardVariable signals file."""
+from apps.etag import track_table_versions
+from apps.standard_variable.models import StandardVariable
+
+track_table_versions(StandardVariable)
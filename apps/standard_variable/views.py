@@ -6,6 +6,7 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.etag import ConditionalGetMixin
 from apps.mobile_api.v1.models import UserStandardVariable
 from apps.standard_variable.models import StandardVariable
 from apps.standard_variable.serializers import StandaradVariableSerializer
@@ -198,7 +199,7 @@ class StandardVariableView(APIView):
             return None
 
 
-class StandardVariablesView(APIView):
+class StandardVariablesView(ConditionalGetMixin, APIView):
     """StandardVariablesView class
 
     This view performs POST and FETCHALL operations for StandardVariable
@@ -210,6 +211,7 @@ class StandardVariablesView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (StandardVariable,)
 
     @swagger_auto_schema(
         responses={
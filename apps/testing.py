@@ -0,0 +1,134 @@
+"""Test helpers file."""
+import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.config.models import Config
+from apps.config.registry import bump_config_version
+from apps.controlled.catalog import bump_catalog_version
+from apps.fitness_level.models import FitnessLevel
+from apps.goal.models import Goal
+from apps.mobile_api.v1.models import UserProfile, UserProgramDesign
+from apps.session.models import Session
+
+
+class CacheVersionsMixin:
+    """CacheVersionsMixin class
+
+    Test cases roll their writes back, so the on_commit hooks that bump the catalog and config versions never
+    run. Bumping both before every test makes the process-wide catalog snapshot and config registry reload
+    from the test's own rows.
+    """
+
+    def setUp(self):
+        super().setUp()
+        bump_catalog_version()
+        bump_config_version()
+
+
+def create_lookups(goal_name="Strength", session_value=3, total_session_length="30.00"):
+    """Public Method
+
+    The method creates a goal, the sessions of 1 to 6 days a week, a fitness level and the Config defaults
+    pointing at them.
+
+    Returns
+    -------
+    dict
+        returns the goal, the sessions keyed by value and the fitness level
+    """
+    goal = Goal.objects.create(name=goal_name)
+    sessions = {value: Session.objects.create(description=f"{value} days a week", value=value) for value in range(1, 7)}
+    fitness_level = FitnessLevel.objects.create(fitness_name="Beginner", fitness_number=1, fitness_level=Decimal(20))
+    Config.objects.create(key="goal", value=str(goal.id))
+    Config.objects.create(key="session_per_week", value=str(sessions[session_value].id))
+    Config.objects.create(key="total_session_length", value=total_session_length)
+    return {"goal": goal, "sessions": sessions, "fitness_level": fitness_level}
+
+
+def create_user_profile(email, goal=None, session=None, fitness_level=None, is_personalized=True, **fields):
+    """Public Method
+
+    The method creates a user and its profile.
+
+    Returns
+    -------
+    apps.mobile_api.v1.models.UserProfile
+    """
+    user = User.objects.create(email=email, first_name=email.split("@")[0], last_name="Test", password="!")
+    return UserProfile.objects.create(
+        user_id=user,
+        goal=goal,
+        session=session,
+        fitness_level=fitness_level,
+        is_personalized=is_personalized,
+        max_session_length=fields.pop("max_session_length", "30"),
+        baseline_assessment=fields.pop("baseline_assessment", []),
+        is_pd_exist=True,
+        **fields,
+    )
+
+
+def program_design(goal_name="Strength", total_session_length="30.00", exercises=("Squat",)):
+    """Return the program_design of one workout, a working set per exercise."""
+    return [
+        {
+            "id": index + 1,
+            "set": "1",
+            "goal": goal_name,
+            "total_session_length": total_session_length,
+            "exercise": exercise,
+            "value": f"A{index + 1}",
+            "system_calculated_reps": 10,
+            "system_calculated_weight": 20,
+        }
+        for index, exercise in enumerate(exercises)
+    ]
+
+
+def create_user_programs(user_profile, workout_dates, goal_name="Strength", days_per_week=None, **fields):
+    """Public Method
+
+    The method creates one UserProgramDesign per workout date, numbering weeks and days in date order.
+
+    Parameters
+    ----------
+    user_profile : apps.mobile_api.v1.models.UserProfile
+    workout_dates : list
+        aware datetimes
+    goal_name : str
+    days_per_week : integer
+        workouts per week, defaults to the profile's session value
+    fields : dict
+        UserProgramDesign fields shared by every row, e.g. is_complete
+
+    Returns
+    -------
+    list
+        returns the created rows in date order
+    """
+    days_per_week = days_per_week or (user_profile.session.value if user_profile.session else 3)
+    workout_dates = sorted(workout_dates)
+    fields.setdefault("is_personalized", user_profile.is_personalized)
+    fields.setdefault("start_date", workout_dates[0])
+    fields.setdefault("end_date", workout_dates[-1])
+    return UserProgramDesign.objects.bulk_create(
+        UserProgramDesign(
+            user=user_profile,
+            week=index // days_per_week + 1,
+            day=index % days_per_week + 1,
+            workout_date=workout_date,
+            program_design=program_design(goal_name),
+            system_rir=2,
+            **fields,
+        )
+        for index, workout_date in enumerate(workout_dates)
+    )
+
+
+def days_from_now(*days, hour=9):
+    """Return aware datetimes at the given hour, the given numbers of days from today."""
+    today = timezone.localtime().replace(hour=hour, minute=0, second=0, microsecond=0)
+    return [today + datetime.timedelta(days=day) for day in days]
@@ -0,0 +1,270 @@
+import copy
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from apps.database import base
+from apps.database import pool as pool_module
+from apps.database.pool import ConnectionPool, PoolTimeout, get_pool, pool_stats
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise Exception("server closed the connection unexpectedly")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.rolled_back = False
+        self.info = mock.Mock(transaction_status=TRANSACTION_STATUS_IDLE)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rolled_back = True
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.created = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.created.append(connection)
+        return connection
+
+    def test_released_connection_is_reused(self):
+        pool = ConnectionPool(2)
+        first = pool.acquire(self.connect)
+        pool.release(first)
+        self.assertIs(pool.acquire(self.connect), first)
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["reused"]), (1, 1))
+        self.assertEqual((stats["size"], stats["idle"], stats["in_use"]), (1, 0, 1))
+
+    def test_most_recently_used_connection_is_handed_out_first(self):
+        pool = ConnectionPool(2)
+        first, second = pool.acquire(self.connect), pool.acquire(self.connect)
+        pool.release(first)
+        pool.release(second)
+        self.assertIs(pool.acquire(self.connect), second)
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        pool = ConnectionPool(1)
+        first = pool.acquire(self.connect)
+        first.info.transaction_status = TRANSACTION_STATUS_INTRANS
+        pool.release(first)
+        self.assertTrue(first.rolled_back)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_closed_connection_is_discarded_on_release(self):
+        pool = ConnectionPool(1)
+        first = pool.acquire(self.connect)
+        first.closed = 2
+        pool.release(first)
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["idle"], stats["closed_broken"]), (0, 0, 1))
+
+    def test_broken_idle_connection_is_replaced(self):
+        pool = ConnectionPool(1)
+        first = pool.acquire(self.connect)
+        pool.release(first)
+        first.broken = True
+        second = pool.acquire(self.connect)
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["closed_broken"], stats["size"]), (2, 1, 1))
+
+    def test_health_check_can_be_turned_off(self):
+        pool = ConnectionPool(1, health_check=False)
+        first = pool.acquire(self.connect)
+        pool.release(first)
+        first.broken = True
+        self.assertIs(pool.acquire(self.connect), first)
+
+    def test_idle_connections_are_closed_after_the_idle_timeout(self):
+        pool = ConnectionPool(2, idle_timeout=60)
+        with mock.patch.object(pool_module.time, "monotonic", return_value=1000):
+            first = pool.acquire(self.connect)
+            pool.release(first)
+        with mock.patch.object(pool_module.time, "monotonic", return_value=1061):
+            stats = pool.stats()
+        self.assertTrue(first.closed)
+        self.assertEqual((stats["size"], stats["idle"], stats["closed_idle"]), (0, 0, 1))
+
+    def test_acquire_times_out_when_the_pool_is_exhausted(self):
+        pool = ConnectionPool(1, timeout=0.05)
+        pool.acquire(self.connect)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(self.connect)
+        stats = pool.stats()
+        self.assertEqual((stats["waits"], stats["timeouts"], len(self.created)), (1, 1, 1))
+
+    def test_waiting_acquire_gets_the_released_connection(self):
+        pool = ConnectionPool(1, timeout=5)
+        first = pool.acquire(self.connect)
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(self.connect)))
+        waiter.start()
+        while not pool.stats()["waits"]:
+            threading.Event().wait(0.01)
+        pool.release(first)
+        waiter.join(5)
+        self.assertEqual(acquired, [first])
+        self.assertEqual(pool.stats()["timeouts"], 0)
+
+    def test_failed_connect_frees_its_slot(self):
+        pool = ConnectionPool(1, timeout=0.05)
+
+        def connect():
+            raise pool_module.OperationalError("could not connect to server")
+
+        with self.assertRaises(pool_module.OperationalError):
+            pool.acquire(connect)
+        self.assertEqual(pool.stats()["size"], 0)
+        self.assertIsNotNone(pool.acquire(self.connect))
+
+    def test_close_idle(self):
+        pool = ConnectionPool(2)
+        first, second = pool.acquire(self.connect), pool.acquire(self.connect)
+        pool.release(first)
+        pool.close_idle()
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+        self.assertEqual((pool.stats()["size"], pool.stats()["in_use"]), (1, 1))
+
+
+class PoolRegistryTest(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(pool_module._pools, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_pool_returns_one_pool_per_alias(self):
+        options = {"MAX_SIZE": 3, "IDLE_TIMEOUT": 30, "TIMEOUT": 2}
+        pool = get_pool("pool_test", options, True)
+        self.assertIs(get_pool("pool_test", {"MAX_SIZE": 9}, False), pool)
+        self.assertEqual((pool.max_size, pool.idle_timeout, pool.timeout, pool.health_check), (3, 30, 2, True))
+        self.assertIsNot(get_pool("other", options, True), pool)
+
+    def test_pool_stats_are_keyed_by_alias(self):
+        get_pool("pool_test", {"MAX_SIZE": 3}, True)
+        stats = pool_stats()
+        self.assertEqual(list(stats), ["pool_test"])
+        self.assertEqual(stats["pool_test"]["max_size"], 3)
+        self.assertEqual(stats["pool_test"]["size"], 0)
+
+    def test_forked_child_forgets_the_pools(self):
+        pool = get_pool("pool_test", {"MAX_SIZE": 1}, True)
+        idle = FakeConnection()
+        pool.release(pool.acquire(lambda: idle))
+        pool_module._close_idle_before_fork()
+        self.assertTrue(idle.closed)
+        pool_module._forget_pools_in_child()
+        self.assertEqual(pool_stats(), {})
+
+
+class PooledDatabaseWrapperTest(TestCase):
+    """A second wrapper of the test database, with a pool, next to the default connection."""
+
+    def setUp(self):
+        patcher = mock.patch.dict(pool_module._pools, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict.update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=True, POOL={"MAX_SIZE": 2, "TIMEOUT": 1})
+        self.wrapper = base.DatabaseWrapper(settings_dict, alias="pool_test")
+        self.addCleanup(self.close)
+
+    def close(self):
+        self.wrapper.close()
+        get_pool("pool_test", self.wrapper.settings_dict["POOL"], True).close_idle()
+
+    def backend_pid(self):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def test_closed_connection_is_returned_to_the_pool(self):
+        pid = self.backend_pid()
+        self.wrapper.close()
+        self.assertIsNone(self.wrapper.connection)
+        self.assertEqual(pool_stats()["pool_test"]["idle"], 1)
+        self.assertEqual(self.backend_pid(), pid)
+        stats = pool_stats()["pool_test"]
+        self.assertEqual((stats["created"], stats["reused"], stats["in_use"]), (1, 1, 1))
+
+    def test_connection_closed_inside_an_atomic_block_is_discarded(self):
+        self.backend_pid()
+        self.wrapper.set_autocommit(False)
+        self.wrapper.in_atomic_block = True
+        try:
+            self.wrapper.close()
+        finally:
+            self.wrapper.in_atomic_block = False
+        stats = pool_stats()["pool_test"]
+        self.assertEqual((stats["size"], stats["closed_broken"]), (0, 1))
+
+    def test_health_check_replaces_a_terminated_connection(self):
+        pid = self.backend_pid()
+        self.wrapper.close()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+            for _ in range(100):
+                cursor.execute("SELECT 1 FROM pg_stat_activity WHERE pid = %s", [pid])
+                if cursor.fetchone() is None:
+                    break
+                threading.Event().wait(0.01)
+        self.assertNotEqual(self.backend_pid(), pid)
+        stats = pool_stats()["pool_test"]
+        self.assertEqual((stats["created"], stats["closed_broken"], stats["size"]), (2, 1, 1))
+
+
+class HealthCheckTest(TestCase):
+    """The health check of a persistent connection without a pool."""
+
+    def setUp(self):
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict.update(CONN_MAX_AGE=None, CONN_HEALTH_CHECKS=True, POOL=None)
+        self.wrapper = base.DatabaseWrapper(settings_dict, alias="health_check_test")
+        self.addCleanup(self.wrapper.close)
+
+    def test_connection_is_checked_once_per_request(self):
+        self.wrapper.ensure_connection()
+        with mock.patch.object(self.wrapper, "is_usable", wraps=self.wrapper.is_usable) as is_usable:
+            self.wrapper.ensure_connection()
+            self.assertEqual(is_usable.call_count, 0)
+            self.wrapper.close_if_unusable_or_obsolete()
+            self.wrapper.ensure_connection()
+            self.wrapper.ensure_connection()
+        self.assertEqual(is_usable.call_count, 1)
+
+    def test_dead_connection_is_reopened(self):
+        self.wrapper.ensure_connection()
+        dead = self.wrapper.connection
+        self.wrapper.close_if_unusable_or_obsolete()
+        dead.close()
+        self.wrapper.ensure_connection()
+        self.assertIsNot(self.wrapper.connection, dead)
+        self.assertFalse(self.wrapper.connection.closed)
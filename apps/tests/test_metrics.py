@@ -0,0 +1,62 @@
+import json
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.accounts.models import User
+from apps.metrics import RequestMetricsMiddleware, record_cache_access, request_phase
+
+
+def view(request):
+    with request_phase("generate"):
+        User.objects.count()
+        User.objects.exists()
+    with request_phase("generate"):
+        record_cache_access(True)
+    record_cache_access(False)
+    return HttpResponse("ok")
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_METRICS_SAMPLE_RATE=1.0)
+class RequestMetricsMiddlewareTest(TestCase):
+    def get(self, middleware=None):
+        middleware = middleware or RequestMetricsMiddleware(view)
+        with self.assertLogs("apps.metrics", "INFO") as logs:
+            response = middleware(RequestFactory().get("/api/goals/"))
+        return response, json.loads(logs.records[-1].getMessage())
+
+    def test_headers_report_queries_cache_and_phases(self):
+        response, _ = self.get()
+        self.assertEqual(response["X-DB-Queries"], "2")
+        entries = [entry.strip() for entry in response["Server-Timing"].split(",")]
+        self.assertRegex(entries[0], r'^db;dur=\d+\.\d;desc="2 queries"$')
+        self.assertEqual(entries[1], 'cache;desc="1 hits 1 misses"')
+        self.assertRegex(entries[2], r"^generate;dur=\d+\.\d$")
+        self.assertRegex(entries[3], r"^total;dur=\d+\.\d$")
+
+    def test_logs_one_json_line(self):
+        _, line = self.get()
+        self.assertEqual(
+            {key: line[key] for key in ("method", "path", "status", "queries", "cache_hits", "cache_misses")},
+            {"method": "GET", "path": "/api/goals/", "status": 200, "queries": 2, "cache_hits": 1, "cache_misses": 1},
+        )
+        self.assertEqual(list(line["phases_ms"]), ["generate"])
+        self.assertGreaterEqual(line["total_ms"], line["db_ms"])
+
+    def test_unsampled_requests_are_not_measured(self):
+        with override_settings(REQUEST_METRICS_SAMPLE_RATE=0.0):
+            middleware = RequestMetricsMiddleware(view)
+        response = middleware(RequestFactory().get("/api/goals/"))
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertFalse(response.has_header("X-DB-Queries"))
+
+    def test_disabled_middleware_is_not_loaded(self):
+        with override_settings(REQUEST_METRICS_ENABLED=False), self.assertRaises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(view)
+
+    def test_recording_outside_a_sampled_request_is_a_no_op(self):
+        with request_phase("generate"):
+            record_cache_access(True)
+        _, line = self.get()
+        self.assertEqual((line["cache_hits"], line["cache_misses"]), (1, 1))
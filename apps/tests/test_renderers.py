@@ -0,0 +1,65 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from apps.parsers import ORJSONParser
+from apps.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def assertRendersLikeJSONRenderer(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type), JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def test_documents_match_the_drf_renderer(self):
+        documents = {
+            "envelope": {"status": True, "data": [{"id": 1, "name": "Squat"}], "message": None, "optional_data": {}},
+            "decimals": {"weight": Decimal("2.500"), "reps": [Decimal("10"), Decimal("-0.25")]},
+            "datetimes": {
+                "aware": datetime.datetime(2021, 12, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+                "offset": timezone.make_aware(
+                    datetime.datetime(2021, 12, 1, 9), datetime.timezone(datetime.timedelta(hours=5))
+                ),
+                "date": datetime.date(2021, 12, 1),
+                "time": datetime.time(9, 30),
+            },
+            "day_keys": {1: [{"set": "0"}], 2: []},
+            "scalars": [0, -1, 1.5, True, False, None, "", uuid.UUID(int=1)],
+            "unicode": {"name": "Übung \u2028 line \u2029 paragraph </script>"},
+            "lazy": {"message": gettext_lazy("This field is required.")},
+        }
+        for name, data in documents.items():
+            with self.subTest(name):
+                self.assertRendersLikeJSONRenderer(data)
+
+    def test_indented_output_falls_back_to_the_drf_renderer(self):
+        self.assertRendersLikeJSONRenderer({"data": [1, 2]}, "application/json; indent=2")
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def parse(self, body, encoding="utf-8"):
+        return ORJSONParser().parse(io.BytesIO(body), "application/json", {"encoding": encoding})
+
+    def test_parses_like_the_drf_parser(self):
+        body = '{"session": "preponeall", "ids": [1, 2.5, null], "name": "Übung"}'.encode()
+        self.assertEqual(self.parse(body), JSONParser().parse(io.BytesIO(body), "application/json", {}))
+
+    def test_invalid_json_is_a_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"session": ')
+
+    def test_other_encodings_use_the_drf_parser(self):
+        self.assertEqual(self.parse('{"name": "Übung"}'.encode("latin-1"), encoding="latin-1"), {"name": "Übung"})
@@ -0,0 +1,93 @@
+import importlib.util
+import os
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.config.registry import get_config
+from apps.controlled.catalog import get_catalog
+from apps.etag import table_version_key
+from apps.testing import CacheVersionsMixin, create_lookups
+from apps.warmup import ETAG_MODELS, warm_up
+
+
+def load_gunicorn_config():
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", os.path.join(settings.BASE_DIR, "gunicorn.conf.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class WarmUpTest(CacheVersionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_lookups()
+
+    def setUp(self):
+        super().setUp()
+        cache.delete_many([table_version_key(model) for model in ETAG_MODELS])
+        # the test case's connection stays open, only check that warm_up closes them
+        patcher = mock.patch("apps.warmup.connections")
+        self.connections = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_builds_the_caches_and_closes_the_connections(self):
+        self.assertGreaterEqual(warm_up(), 0)
+        self.connections.close_all.assert_called_once_with()
+        with self.assertNumQueries(0):
+            catalog = get_catalog()
+            registry = get_config()
+        self.assertIs(get_catalog(), catalog)
+        self.assertIs(get_config(), registry)
+        self.assertEqual(
+            set(cache.get_many([table_version_key(model) for model in ETAG_MODELS])),
+            {table_version_key(model) for model in ETAG_MODELS},
+        )
+
+    def test_closes_the_connections_when_a_step_fails(self):
+        with mock.patch("apps.warmup.get_config", side_effect=RuntimeError("config table missing")):
+            with self.assertRaises(RuntimeError):
+                warm_up()
+        self.connections.close_all.assert_called_once_with()
+
+
+class GunicornWorkersTest(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("WEB_CONCURRENCY", None)
+        self.config = load_gunicorn_config()
+
+    def test_one_worker_with_a_per_process_cache(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertEqual(self.config._workers(), 1)
+            os.environ["WEB_CONCURRENCY"] = "1"
+            self.assertEqual(self.config._workers(), 1)
+
+    def test_several_workers_need_a_shared_cache(self):
+        os.environ["WEB_CONCURRENCY"] = "4"
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            with self.assertRaisesMessage(RuntimeError, "WEB_CONCURRENCY is 4"):
+                self.config._workers()
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache"}}):
+            self.assertEqual(self.config._workers(), 4)
+
+    def test_shared_cache_defaults_to_two_workers_per_cpu(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache"}}):
+            with mock.patch("multiprocessing.cpu_count", return_value=3):
+                self.assertEqual(self.config._workers(), 7)
+
+    def test_failed_warm_up_is_logged(self):
+        server = mock.Mock()
+        server.cfg.preload_app = True
+        with mock.patch("apps.warmup.warm_up", side_effect=RuntimeError("database is down")) as warm_up:
+            with self.assertLogs("gunicorn.error", "ERROR"):
+                self.config.on_starting(server)
+        warm_up.assert_called_once_with()
+        server.cfg.preload_app = False
+        with mock.patch("apps.warmup.warm_up") as warm_up:
+            self.config.on_starting(server)
+        warm_up.assert_not_called()
@@ -1,7 +1,50 @@
+import time
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from django.core.cache import cache
+
+
 def response_json(status, data, message=None, optional_data=None):
     return {"data": data, "status": status, "message": message, "optional_data": optional_data}
 
 
+def stream_response_json(rows, status=True, message=None, optional_data=None, batch_size=500):
+    """Public Method
+
+    The method yields the response_json envelope with rows as its data list, a batch of encoded rows at a
+    time, so a StreamingHttpResponse can send large results without building the whole body in memory.
+    Values are encoded like DRF's JSONRenderer encodes them.
+
+    Parameters
+    ----------
+    rows : iterable
+    status : boolean
+    message : str
+    optional_data : dict
+    batch_size : integer
+        rows encoded into each yielded chunk
+
+    Returns
+    -------
+    generator
+        returns the chunks of the JSON document
+    """
+    encoder = JSONEncoder()
+    envelope = encoder.encode({"status": status, "message": message, "optional_data": optional_data})
+    batch = []
+    separator = ""
+    yield '{"data": ['
+    for row in rows:
+        batch.append(encoder.encode(row))
+        if len(batch) >= batch_size:
+            yield separator + ",".join(batch)
+            batch, separator = [], ","
+    if batch:
+        yield separator + ",".join(batch)
+    yield "], " + envelope[1:]
+
+
 def user_profile_data_exists(attribute_name, fk, model_name):
     """Public Method
 
@@ -31,3 +74,47 @@ def user_profile_data_exists(attribute_name, fk, model_name):
         return True
 
     return False
+
+
+def get_cache_version(key):
+    """Public Method
+
+    The method returns the current value of a version counter stored in the shared cache. A missing counter
+    is seeded with a timestamp so that a version evicted from the cache never repeats an older value.
+
+    Parameters
+    ----------
+    key : str
+
+    Returns
+    -------
+    integer
+        returns the current version for the given key
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    """Public Method
+
+    The method increments a version counter stored in the shared cache, invalidating every in-process
+    copy that was built against the previous version.
+
+    Parameters
+    ----------
+    key : str
+
+    Returns
+    -------
+    integer
+        returns the new version for the given key
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        get_cache_version(key)
+        return cache.incr(key)
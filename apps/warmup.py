@@ -0,0 +1,63 @@
+"""Application warm-up file."""
+import logging
+import time
+
+from django.db import connections
+from django.urls import get_resolver
+
+from apps.baseline_assessment.models import BaselineAssessment
+from apps.body_part.models import BodyPart
+from apps.config.registry import get_config
+from apps.controlled.catalog import get_catalog
+from apps.controlled.models import SessionLength
+from apps.equipment.models import Equipment
+from apps.etag import get_table_versions
+from apps.feedback.models import Feedback, FeedbackRange, FeedbackValue
+from apps.goal.models import Goal
+from apps.injury.models import Injury, InjuryType
+from apps.reps_in_reserve.models import RepsRange
+from apps.standard_variable.models import StandardVariable
+
+logger = logging.getLogger(__name__)
+
+# tables behind the conditional GET listings, see apps.etag.ConditionalGetMixin
+ETAG_MODELS = (
+    BaselineAssessment,
+    BodyPart,
+    Equipment,
+    Feedback,
+    FeedbackRange,
+    FeedbackValue,
+    Goal,
+    Injury,
+    InjuryType,
+    RepsRange,
+    SessionLength,
+    StandardVariable,
+)
+
+
+def warm_up():
+    """Public Method
+
+    The method loads everything the first requests would otherwise build on demand: the URL resolver with
+    every view module, the controlled catalog snapshot, the config registry and the ETag table versions. The
+    database connections it opened are closed afterwards, so a server that forks workers after warming up
+    never shares a connection between processes.
+
+    Returns
+    -------
+    float
+        returns the warm-up time in seconds
+    """
+    started = time.perf_counter()
+    try:
+        get_resolver().url_patterns
+        catalog = get_catalog()
+        get_config()
+        get_table_versions(ETAG_MODELS)
+    finally:
+        connections.close_all()
+    elapsed = time.perf_counter() - started
+    logger.info(f"Warm-up finished in {elapsed:.2f}s, catalog version {catalog.version}")
+    return elapsed
@@ -3,6 +3,11 @@
 python manage.py migrate
 python manage.py superuser
 
-python manage.py runserver 0.0.0.0:8000
+# SERVER_MODE=development keeps the autoreloading runserver for local work
+if [ "${SERVER_MODE:-production}" = "development" ]; then
+    python manage.py runserver 0.0.0.0:8000
+else
+    exec gunicorn joompa.wsgi:application
+fi
 
 exec "$@"
@@ -0,0 +1,81 @@
+"""Gunicorn config file, picked up from the working directory by ``gunicorn joompa.wsgi``.
+
+Every setting can be overridden from the environment:
+
+    GUNICORN_BIND             address to listen on, 0.0.0.0:8000
+    WEB_CONCURRENCY           worker processes, 2 * CPUs + 1 with a shared cache, otherwise 1
+    GUNICORN_THREADS          threads per worker, more than 1 switches to the gthread worker
+    GUNICORN_TIMEOUT          seconds before a silent worker is killed and restarted
+    GUNICORN_MAX_REQUESTS     requests a worker serves before it is recycled, 0 disables recycling
+    GUNICORN_PRELOAD          load the app in the master before forking, True or False
+
+With the app preloaded, workers share the master's imported code and warmed caches copy-on-write and start
+instantly. SIGHUP restarts the workers gracefully but keeps the preloaded code, so a deploy restarts the
+master, or replaces it with SIGUSR2 followed by SIGQUIT to the old master.
+
+The version counters that invalidate the catalog snapshot, the config registry and the listing ETags live in
+the Django cache. With the default per-process LocMemCache a write is only seen by the worker that handled it,
+so several workers need a shared cache, set with CACHE_BACKEND and CACHE_LOCATION in .env, e.g.
+django.core.cache.backends.memcached.PyMemcacheCache or django.core.cache.backends.db.DatabaseCache. Without
+one the default is a single worker, and starting more than one fails.
+"""
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger("gunicorn.error")
+
+# cache backends whose entries only the process that wrote them can read
+PER_PROCESS_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def _workers():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "joompa.settings")
+    from django.conf import settings
+
+    cache_backend = settings.CACHES["default"]["BACKEND"]
+    shared_cache = cache_backend not in PER_PROCESS_CACHE_BACKENDS
+    workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1 if shared_cache else 1))
+    if workers > 1 and not shared_cache:
+        raise RuntimeError(
+            f"WEB_CONCURRENCY is {workers} but the cache backend {cache_backend} keeps a copy per process, so the "
+            "workers would serve a stale catalog, config and ETags after a write. Set CACHE_BACKEND to a shared "
+            "backend or run a single worker."
+        )
+    return workers
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = _workers()
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True") == "True"
+accesslog = "-"
+errorlog = "-"
+
+
+def _warm_up():
+    from apps.warmup import warm_up
+
+    try:
+        warm_up()
+    except Exception as e:
+        # the caches are built lazily by the first requests instead
+        logger.exception(f"Warm-up failed: {str(e)}")
+
+
+def on_starting(server):
+    # runs in the master after the app is preloaded and before the listening socket is opened, so the
+    # forked workers inherit the warmed caches
+    if server.cfg.preload_app:
+        _warm_up()
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _warm_up()
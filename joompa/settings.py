@@ -82,11 +82,13 @@ LOCAL_APPS = [
     "apps.mobile_api.v1",
     "apps.config",
     "apps.notification",
+    "apps.benchmarks",
 ]
 
 INSTALLED_APPS = DEFAULT_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "apps.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -122,14 +124,42 @@ WSGI_APPLICATION = "joompa.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Connections are kept open for CONN_MAX_AGE seconds and checked with SELECT 1 before their first use in a request.
+# DB_POOL_MAX_SIZE above 0 shares a pool of at most that many connections between the threads of each worker
+# instead, see apps.database.
+DB_POOL_MAX_SIZE = int(db_config.get("DB_POOL_MAX_SIZE", 0))
+
 DATABASES = {
     "default": {
-        "ENGINE": db_config["ENGINE"],
+        # apps.database adds the health checks and the pool to the PostgreSQL backend
+        "ENGINE": "apps.database" if "postgresql" in db_config["ENGINE"] else db_config["ENGINE"],
         "NAME": db_config["NAME"],
         "USER": db_config["USER"],
         "PASSWORD": db_config["PASSWORD"],
         "HOST": db_config["HOST"],
         "PORT": db_config["PORT"],
+        "CONN_MAX_AGE": 0 if DB_POOL_MAX_SIZE else int(db_config.get("CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "POOL": {
+            "MAX_SIZE": DB_POOL_MAX_SIZE,
+            "IDLE_TIMEOUT": int(db_config.get("DB_POOL_IDLE_TIMEOUT", 300)),
+            "TIMEOUT": int(db_config.get("DB_POOL_TIMEOUT", 10)),
+        }
+        if DB_POOL_MAX_SIZE
+        else None,
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Version counters of the in-process caches live here. LocMemCache only suits a single worker process,
+# gunicorn.conf.py refuses to start several without a shared backend such as Memcached, Redis or the database.
+
+CACHES = {
+    "default": {
+        "BACKEND": db_config.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": db_config.get("CACHE_LOCATION", ""),
     }
 }
 
@@ -219,11 +249,11 @@ STATICFILES_FINDERS = (
 
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "apps.renderers.ORJSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "apps.parsers.ORJSONParser",
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
     ],
@@ -242,6 +272,17 @@ AUTH_USER_MODEL = "accounts.User"
 # swagger settings
 SWAGGER_SETTINGS = {"SECURITY_DEFINITIONS": {"api_key": {"type": "apiKey", "in": "header", "name": "Authorization"}}}
 
+# Per request query count, DB time, cache hits and phase timings in the Server-Timing and X-DB-Queries headers,
+# for a sampled share of the requests
+REQUEST_METRICS_ENABLED = db_config.get("REQUEST_METRICS_ENABLED", "False") == "True"
+REQUEST_METRICS_SAMPLE_RATE = float(db_config.get("REQUEST_METRICS_SAMPLE_RATE", 1.0))
+
+# Push notifications
+NOTIFICATION_TRANSPORT = db_config.get("NOTIFICATION_TRANSPORT", "apps.notification.transports.FCMTransport")
+FCM_ENDPOINT = db_config.get("FCM_ENDPOINT", "https://fcm.googleapis.com/fcm/send")
+# secret, only read from the environment or .env, the FCM transports refuse to start without it
+FIREBASE_API_KEY = os.environ.get("FIREBASE_API_KEY") or db_config.get("FIREBASE_API_KEY") or ""
+
 if db_config["USE_S3"]:
     AWS_ACCESS_KEY_ID = db_config["AWS_ACCESS_KEY_ID"]
     AWS_SECRET_ACCESS_KEY = db_config["AWS_SECRET_ACCESS_KEY"]
@@ -0,0 +1,82 @@
+"""Local stand-in for the FCM legacy HTTP API.
+
+Run it:
+
+    python scripts/fcm_stub_server.py --port 8765
+
+and point the send_notification command at it with these .env entries:
+
+    FCM_ENDPOINT=http://127.0.0.1:8765/fcm/send
+    NOTIFICATION_TRANSPORT=apps.notification.transports.HTTPTransport
+    FIREBASE_API_KEY=stub
+
+Registration ids starting with ``invalid`` are answered with NotRegistered, ids starting with ``flaky`` fail
+with Unavailable the first time they are seen, and ``--fail-every N`` answers every Nth request with a 503.
+"""
+import argparse
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+lock = threading.Lock()
+seen_flaky = set()
+request_counter = itertools.count(1)
+
+
+class FCMStubHandler(BaseHTTPRequestHandler):
+    fail_every = 0
+
+    def __result(self, registration_id, index):
+        if registration_id.startswith("invalid"):
+            return {"error": "NotRegistered"}
+        if registration_id.startswith("flaky"):
+            with lock:
+                if registration_id not in seen_flaky:
+                    seen_flaky.add(registration_id)
+                    return {"error": "Unavailable"}
+        return {"message_id": f"0:{index}%stub"}
+
+    def do_POST(self):
+        request_number = next(request_counter)
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.fail_every and request_number % self.fail_every == 0:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        registration_ids = payload.get("registration_ids", [])
+        results = [self.__result(registration_id, index) for index, registration_id in enumerate(registration_ids)]
+        failure = sum(1 for result in results if "error" in result)
+        body = json.dumps(
+            {
+                "multicast_id": request_number,
+                "success": len(results) - failure,
+                "failure": failure,
+                "canonical_ids": 0,
+                "results": results,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        print(f"request {request_number}: {len(registration_ids)} devices, {failure} failed", flush=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with a 503")
+    arguments = parser.parse_args()
+
+    FCMStubHandler.fail_every = arguments.fail_every
+    server = ThreadingHTTPServer((arguments.host, arguments.port), FCMStubHandler)
+    print(f"FCM stub listening on http://{arguments.host}:{arguments.port}/fcm/send", flush=True)
+    server.serve_forever()
@@ -0,0 +1,174 @@
+"""Local load test comparing runserver, the old container command, with the gunicorn production server.
+
+Each server is started in turn on its own port, warmed until it answers, then hit by --concurrency keep-alive
+clients for --duration seconds each, cycling through the given paths:
+
+    python scripts/load_test.py --user-id 1 --servers runserver gunicorn --concurrency 16 --duration 20
+    WEB_CONCURRENCY=4 GUNICORN_THREADS=4 python scripts/load_test.py --user-id 1 --servers gunicorn
+
+--url skips starting a server and measures one that is already running. Requests are authenticated with a
+JWT minted for --user-id, or with --token.
+"""
+import argparse
+import http.client
+import itertools
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PATHS = [
+    "/api/equipments/",
+    "/api/goals/",
+    "/api/injuries/",
+    "/api/feedbacks/",
+    "/api/standard-variables/",
+    "/api/baseline/assessments/",
+]
+
+SERVERS = {
+    "runserver": lambda port: [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}"],
+    "gunicorn": lambda port: [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "joompa.wsgi"],
+}
+
+
+def mint_token(user_id):
+    sys.path.insert(0, base_path)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "joompa.settings")
+    import django
+
+    django.setup()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from apps.accounts.models import User
+
+    return str(AccessToken.for_user(User.objects.get(id=user_id)))
+
+
+def wait_until_ready(url, timeout=60):
+    parsed = urllib.parse.urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=5)
+            connection.request("GET", "/api/goals/")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} didn't answer within {timeout}s")
+
+
+def run_load(url, paths, token, concurrency, duration):
+    parsed = urllib.parse.urlsplit(url)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies, statuses, errors = [], {}, []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(offset):
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+        for path in itertools.islice(itertools.cycle(paths), offset, None):
+            if time.monotonic() >= deadline:
+                break
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                if response.getheader("Connection", "").lower() == "close":
+                    connection.close()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                with lock:
+                    errors.append(str(e))
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+        connection.close()
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(share):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * share))] if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / wall,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "statuses": statuses,
+        "errors": len(errors),
+    }
+
+
+def start_server(name, port):
+    return subprocess.Popen(
+        SERVERS[name](port), cwd=base_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+
+def stop_server(process):
+    # runserver's autoreloader runs the server in a child process, stop the whole group
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def report(name, result):
+    print(
+        f"{name:<12}{result['requests']:>9}{result['rps']:>10.1f}{result['p50']:>10.1f}{result['p95']:>10.1f}"
+        f"{result['p99']:>10.1f}{result['errors']:>8}  {result['statuses']}",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--url", help="measure an already running server instead of starting --servers")
+    parser.add_argument("--port", type=int, default=8765, help="first port used for the started servers")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    parser.add_argument("--user-id", type=int, help="mint a JWT for this user")
+    parser.add_argument("--token", help="JWT sent as the Bearer token")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of load per server")
+    arguments = parser.parse_args()
+
+    token = arguments.token or (mint_token(arguments.user_id) if arguments.user_id else None)
+    print(f"{'server':<12}{'requests':>9}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    if arguments.url:
+        report(
+            arguments.url, run_load(arguments.url, arguments.paths, token, arguments.concurrency, arguments.duration)
+        )
+        sys.exit(0)
+
+    for offset, name in enumerate(arguments.servers):
+        url = f"http://127.0.0.1:{arguments.port + offset}"
+        process = start_server(name, arguments.port + offset)
+        try:
+            wait_until_ready(url)
+            report(name, run_load(url, arguments.paths, token, arguments.concurrency, arguments.duration))
+        finally:
+            stop_server(process)